@@ -0,0 +1,198 @@
+"""Assembly of decoded partitions into preallocated arrays.
+
+Collecting every partition in a list and concatenating them with ``xr.concat``
+holds the forecast in memory twice, and stacking GRIB partitions along
+``step`` adds a copy per partition. ``PartitionAssembler`` instead allocates
+each output array once for all lead times and copies every partition into its
+slot as soon as it is decoded, so the partition can be released right away.
+"""
+
+import logging
+from typing import Any, Dict, List, Set, Tuple
+
+import numpy as np
+import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+
+class PartitionAssembler:
+    """Stack partitions along ``time`` or ``step`` into preallocated arrays.
+
+    Parameters
+    ----------
+    template : xarray.Dataset
+        A decoded partition defining the variables, shapes and dtypes. Its
+        data is copied into its slot by ``add()`` like any other partition.
+    nslots : int
+        Number of partitions (lead times) of the output.
+
+    Raises
+    ------
+    ValueError
+        If the partitions cannot be stacked, i.e. ``template`` has neither a
+        ``time`` dimension of size 1 nor a scalar ``step`` coordinate, or has
+        a data variable that does not depend on the stacked dimension.
+    """
+
+    def __init__(self, template: xr.Dataset, nslots: int):
+        if "time" in template.dims and template.sizes["time"] == 1:
+            self.dim, self.expand = "time", False
+        elif "step" in template.coords and template.step.ndim == 0:
+            self.dim, self.expand = "step", True
+        else:
+            raise ValueError("Partitions have no time or step to stack along")
+        template = self._stacked(template)
+
+        self.nslots = nslots
+        self.filled: Set[int] = set()
+        self._first = None
+        self._attrs: Dict[str, Any] = {}
+        self._data: Dict[str, Tuple[Tuple[str, ...], np.ndarray, Dict]] = {}
+        for name, var in template.data_vars.items():
+            if self.dim not in var.dims:
+                raise ValueError(f"Variable {name} does not depend on {self.dim}")
+            shape = tuple(
+                nslots if d == self.dim else n for d, n in zip(var.dims, var.shape)
+            )
+            self._data[name] = (var.dims, np.empty(shape, dtype=var.dtype), var.attrs)
+
+        # Coordinates along the stacked dimension get one value per slot;
+        # scalar coordinates become stacked ones if their values differ
+        self._fixed: Dict[str, xr.Variable] = {}
+        self._stacked_coords: Dict[str, Tuple[np.ndarray, Dict]] = {}
+        self._scalars: Dict[str, Tuple[List[Any], Dict]] = {}
+        for name, coord in template.coords.items():
+            if self.dim in coord.dims:
+                if coord.dims != (self.dim,):
+                    raise ValueError(f"Coordinate {name} cannot be stacked")
+                values = np.empty(nslots, dtype=coord.dtype)
+                self._stacked_coords[name] = (values, coord.attrs)
+            elif coord.ndim == 0:
+                self._scalars[name] = ([None] * nslots, coord.attrs)
+            else:
+                self._fixed[name] = coord.variable
+
+    def _stacked(self, ds: xr.Dataset) -> xr.Dataset:
+        """Give a partition a stacked dimension of size 1 (without copying)."""
+        return ds.expand_dims(self.dim) if self.expand else ds
+
+    def _fits(self, ds: xr.Dataset) -> bool:
+        """Whether a stacked partition can be written into the arrays."""
+        if set(ds.data_vars) - set(self._data):
+            return False
+        for name, (dims, array, _) in self._data.items():
+            if name not in ds:
+                if array.dtype.kind != "f":
+                    return False
+                continue
+            var = ds[name]
+            if set(var.dims) != set(dims) or var.sizes[self.dim] != 1:
+                return False
+            if any(
+                var.sizes[d] != n for d, n in zip(dims, array.shape) if d != self.dim
+            ):
+                return False
+        if set(self._stacked_coords) - set(ds.coords):
+            return False
+        for name, variable in self._fixed.items():
+            if name in ds.coords and not ds[name].variable.equals(variable):
+                return False
+        return True
+
+    def add(self, slot: int, ds: xr.Dataset) -> bool:
+        """Copy a partition into its slot.
+
+        Returns False, without writing anything, if the partition does not
+        match the layout of the template; it then has to be combined
+        separately.
+        """
+        ds = self._stacked(ds)
+        if not self._fits(ds):
+            return False
+
+        for name, (dims, array, _) in self._data.items():
+            index = tuple(slot if d == self.dim else slice(None) for d in dims)
+            if name in ds:
+                other_dims = [d for d in dims if d != self.dim]
+                array[index] = (
+                    ds[name].isel({self.dim: 0}).transpose(*other_dims).values
+                )
+            else:
+                # Variables missing from a lead time (e.g. accumulations at f000)
+                array[index] = np.nan
+        for name, (values, _) in self._stacked_coords.items():
+            values[slot] = ds[name].values[0]
+        for name, (values, _) in self._scalars.items():
+            if name in ds.coords and ds[name].ndim == 0:
+                values[slot] = ds[name].values
+
+        if self._first is None or slot < self._first:
+            # Like xr.concat, keep the attributes of the first partition
+            self._first = slot
+            self._attrs = dict(ds.attrs)
+        self.filled.add(slot)
+        return True
+
+    def _dataset(self) -> xr.Dataset:
+        """Dataset over all slots, whether they were filled or not."""
+        slots = sorted(self.filled)
+        data_vars = {
+            name: xr.Variable(dims, array, attrs)
+            for name, (dims, array, attrs) in self._data.items()
+        }
+        coords: Dict[str, Any] = dict(self._fixed)
+        for name, (values, attrs) in self._stacked_coords.items():
+            coords[name] = xr.Variable((self.dim,), values, attrs)
+        for name, (values, attrs) in self._scalars.items():
+            present = [values[slot] for slot in slots if values[slot] is not None]
+            if not present:
+                continue
+            if len(present) == len(slots) and all(
+                np.array_equal(v, present[0]) for v in present
+            ):
+                coords[name] = xr.Variable((), present[0], attrs)
+            else:
+                filled = np.asarray(present[0])
+                stacked = np.empty(self.nslots, dtype=filled.dtype)
+                if filled.dtype.kind in "fMm":
+                    stacked[:] = np.array(np.nan).astype(filled.dtype)
+                for slot in slots:
+                    if values[slot] is not None:
+                        stacked[slot] = values[slot]
+                coords[name] = xr.Variable((self.dim,), stacked, attrs)
+        return xr.Dataset(data_vars, coords=coords, attrs=self._attrs)
+
+    def result(self) -> xr.Dataset:
+        """Return the stacked dataset of the filled slots.
+
+        Slots that were never filled (failed or not yet published partitions)
+        are dropped. The arrays are used without copying unless the filled
+        slots have gaps, so slots can be added and the result taken again
+        at the cost of the new partitions only.
+        """
+        ds = self._dataset()
+        if len(self.filled) < self.nslots:
+            logger.info(
+                f"Dropping {self.nslots - len(self.filled)} partitions that "
+                f"were not read"
+            )
+            slots = sorted(self.filled)
+            if slots[-1] - slots[0] + 1 == len(slots):
+                # A contiguous range of slots is selected as a view
+                ds = ds.isel({self.dim: slice(slots[0], slots[-1] + 1)})
+            else:
+                ds = ds.isel({self.dim: slots})
+        return ds
+
+    def partitions(self) -> List[Tuple[int, xr.Dataset]]:
+        """Split the filled slots back into partitions (as views).
+
+        Used to combine the assembled partitions with partitions that did not
+        fit the template.
+        """
+        ds = self._dataset()
+        return [
+            (slot, ds.isel({self.dim: slot if self.expand else slice(slot, slot + 1)}))
+            for slot in sorted(self.filled)
+        ]
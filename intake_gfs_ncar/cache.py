@@ -0,0 +1,369 @@
+"""Caches for files downloaded from, and data decoded from, NCAR THREDDS.
+
+Forecast files of past GFS cycles on NCAR RDA never change, so a downloaded
+NetcdfSubset response or GRIB2 file can be reused by every later read of the
+same URL, including reads from other catalog entries and other processes.
+Entries are content-addressed by a hash of the normalized request (URL, query
+parameters and byte ranges), written atomically and evicted in least recently
+used order when the cache exceeds its size or age limits.
+
+Decoded partitions are additionally kept in a process-wide, memory-bounded LRU
+cache, because intake catalogs create a new source on every call and so cannot
+rely on per-instance memoization. Their arrays are shared with the datasets
+handed out, so they are made read-only; ``writeable()`` copies them where a
+result may be modified in place.
+
+Discovered schemas, which are stable from cycle to cycle for a given catalog
+entry, are persisted as small JSON files so that ``discover()`` can skip the
+network entirely.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Environment variables used when no cache settings are passed explicitly
+CACHE_DIR_ENV = "INTAKE_GFS_NCAR_CACHE_DIR"
+CACHE_MAX_AGE_ENV = "INTAKE_GFS_NCAR_CACHE_TTL"
+SCHEMA_CACHE_DIR_ENV = "INTAKE_GFS_NCAR_SCHEMA_CACHE_DIR"
+
+# Suffix of partially written cache entries
+PARTIAL_SUFFIX = ".part"
+
+# Default memory budget of the decoded-partition cache in bytes
+DEFAULT_PARTITION_CACHE_SIZE = 1024**3
+
+# Default lifetime of persisted schemas in seconds
+DEFAULT_SCHEMA_MAX_AGE = 24 * 3600
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL so that equivalent requests map to the same cache key.
+
+    The scheme and host are lower-cased and query parameters are sorted.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path, query, "")
+    )
+
+
+def cache_key(url: str, *extra: Any) -> str:
+    """Return the content address of a request.
+
+    Parameters
+    ----------
+    url : str
+        Request URL, including any query string.
+    *extra
+        Additional request properties that change the response body, such as
+        the byte ranges of a partial download.
+    """
+    text = normalize_url(url)
+    if extra:
+        text += "|" + "|".join(repr(e) for e in extra)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DownloadCache:
+    """Content-addressed download cache with LRU eviction.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding the cache. Created if it does not exist.
+    max_size : int, optional
+        Maximum total size of the cache in bytes. Least recently used entries
+        are removed once it is exceeded. Default: unlimited
+    max_age : float, optional
+        Entries not used for this many seconds are removed. Default: unlimited
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_size = int(max_size) if max_size is not None else None
+        self.max_age = float(max_age) if max_age is not None else None
+        self._evict_lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def __repr__(self) -> str:
+        return (
+            f"DownloadCache({self.cache_dir!r}, max_size={self.max_size}, "
+            f"max_age={self.max_age})"
+        )
+
+    def path(self, key: str, suffix: str = "") -> str:
+        """Return the location of a cache entry, whether it exists or not."""
+        return os.path.join(self.cache_dir, key[:2], key + suffix)
+
+    def get(self, key: str, suffix: str = "") -> Optional[str]:
+        """Return the path of a cached entry, or None on a cache miss.
+
+        A hit refreshes the entry's modification time, which is used as the
+        last-access time for LRU eviction.
+        """
+        path = self.path(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        logger.debug(f"Download cache hit: {path}")
+        return path
+
+    def temp_path(self, key: str, suffix: str = "") -> str:
+        """Return a unique temporary path to write a new entry to.
+
+        The file should be moved into place with ``commit()``, which makes the
+        entry visible atomically.
+        """
+        path = self.path(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return f"{path}.{uuid.uuid4().hex}{PARTIAL_SUFFIX}"
+
+    def commit(self, temp_path: str, key: str, suffix: str = "") -> str:
+        """Atomically move a fully written temporary file into the cache."""
+        path = self.path(key, suffix)
+        os.replace(temp_path, path)
+        logger.debug(f"Added to download cache: {path}")
+        self.evict(keep=path)
+        return path
+
+    def entries(self) -> List[Tuple[str, float, int]]:
+        """List committed entries as ``(path, last_access_time, size)``."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if name.endswith(PARTIAL_SUFFIX):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def size(self) -> int:
+        """Total size in bytes of the committed entries."""
+        return sum(size for _, _, size in self.entries())
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove expired entries, then the least recently used ones.
+
+        Parameters
+        ----------
+        keep : str, optional
+            Path of an entry that must not be evicted (e.g. the entry that
+            was just written and is about to be read).
+
+        Returns
+        -------
+        int
+            Number of bytes freed.
+        """
+        if self.max_size is None and self.max_age is None:
+            return 0
+
+        with self._evict_lock:
+            entries = sorted(self.entries(), key=lambda e: e[1])
+            total = sum(size for _, _, size in entries)
+            now = time.time()
+            freed = 0
+            for path, last_access, size in entries:
+                if path == keep:
+                    continue
+                expired = self.max_age is not None and now - last_access > self.max_age
+                too_big = self.max_size is not None and total > self.max_size
+                if not (expired or too_big):
+                    # Entries are sorted oldest first, so the rest are kept too
+                    break
+                try:
+                    os.unlink(path)
+                except OSError as e:
+                    logger.warning(f"Could not evict cache entry {path}: {e}")
+                    continue
+                total -= size
+                freed += size
+                logger.debug(f"Evicted cache entry: {path}")
+
+        if freed:
+            logger.info(f"Evicted {freed} bytes from download cache {self.cache_dir}")
+        return freed
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for path, _, _ in self.entries():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+class PartitionCache:
+    """Thread-safe, memory-bounded LRU cache of decoded partitions.
+
+    Parameters
+    ----------
+    max_bytes : int
+        Memory budget in bytes, measured with ``xarray.Dataset.nbytes``.
+        Datasets larger than the whole budget are not cached. The NumPy arrays
+        of cached datasets, which are shared with the dataset that was added
+        and with every copy returned by ``get()``, are made read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_PARTITION_CACHE_SIZE):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self._datasets: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._datasets)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a shallow copy of a cached dataset, or None on a miss."""
+        with self._lock:
+            ds = self._datasets.get(key)
+            if ds is None:
+                return None
+            self._datasets.move_to_end(key)
+        return ds.copy(deep=False)
+
+    def put(self, key: Hashable, ds: Any) -> None:
+        """Add a dataset, evicting least recently used ones to stay in budget."""
+        size = ds.nbytes
+        if size > self.max_bytes:
+            logger.debug(f"Not caching partition of {size} bytes: exceeds budget")
+            return
+        with self._lock:
+            old = self._datasets.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._datasets[key] = ds.copy(deep=False)
+            for name, var in ds.variables.items():
+                if name not in ds.indexes and isinstance(var.data, np.ndarray):
+                    var.data.flags.writeable = False
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._datasets.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the memory budget, evicting entries if necessary."""
+        with self._lock:
+            self.max_bytes = int(max_bytes)
+            while self._datasets and self.nbytes > self.max_bytes:
+                _, evicted = self._datasets.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        """Remove every cached dataset."""
+        with self._lock:
+            self._datasets.clear()
+            self.nbytes = 0
+
+
+class SchemaCache:
+    """Persistent store of discovered schemas with a time to live.
+
+    Parameters
+    ----------
+    cache_dir : str
+        Directory holding one JSON file per schema. Created on first write.
+    max_age : float, optional
+        Schemas older than this many seconds are ignored and rediscovered.
+        Default: one day
+    """
+
+    def __init__(self, cache_dir: str, max_age: float = DEFAULT_SCHEMA_MAX_AGE):
+        self.cache_dir = os.path.abspath(os.path.expanduser(cache_dir))
+        self.max_age = float(max_age)
+
+    def __repr__(self) -> str:
+        return f"SchemaCache({self.cache_dir!r}, max_age={self.max_age})"
+
+    def path(self, key: str) -> str:
+        """Return the location of a schema, whether it exists or not."""
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a stored schema, or None if it is missing or expired."""
+        path = self.path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime > self.max_age:
+                logger.debug(f"Schema cache entry expired: {path}")
+                return None
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key: str, schema: Dict[str, Any]) -> None:
+        """Atomically store a schema, logging rather than raising on failure."""
+        path = self.path(key)
+        tmp_path = f"{path}.{uuid.uuid4().hex}{PARTIAL_SUFFIX}"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(schema, f)
+            os.replace(tmp_path, path)
+            logger.debug(f"Added to schema cache: {path}")
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Could not write schema cache entry {path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def default_schema_cache_dir() -> str:
+    """Directory of the schema cache unless configured otherwise.
+
+    Uses ``INTAKE_GFS_NCAR_SCHEMA_CACHE_DIR`` if set, otherwise
+    ``$XDG_CACHE_HOME/intake_gfs_ncar/schemas`` (``~/.cache`` by default).
+    """
+    if os.environ.get(SCHEMA_CACHE_DIR_ENV):
+        return os.environ[SCHEMA_CACHE_DIR_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+    return os.path.join(base, "intake_gfs_ncar", "schemas")
+
+
+def writeable(ds: Any) -> Any:
+    """Return a dataset without read-only arrays shared with cached partitions.
+
+    Only the read-only arrays are copied, so results assembled into new
+    arrays are returned as they are.
+    """
+    shared = {
+        name: var.copy(deep=True)
+        for name, var in ds.variables.items()
+        if name not in ds.indexes
+        and isinstance(var.data, np.ndarray)
+        and not var.data.flags.writeable
+    }
+    if not shared:
+        return ds
+    coords = {k: v for k, v in shared.items() if k in ds.coords}
+    data_vars = {k: v for k, v in shared.items() if k not in ds.coords}
+    return ds.assign_coords(coords).assign(data_vars)
+
+
+# Decoded partitions shared by all sources in the process
+partitions = PartitionCache()
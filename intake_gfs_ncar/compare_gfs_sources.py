@@ -57,11 +57,8 @@ def download_gfs_intake_data(
 
     cat = intake.open_catalog(catalog_path)
 
-    # Calculate max_lead_time to include the requested forecast hour
-    max_lead_time = max(forecast_hour, 3)
-
-    # Get the gfs_surface_winds source
-    source = cat.gfs_surface_winds(cycle=cycle, max_lead_time=max_lead_time)
+    # Get the gfs_surface_winds source for the requested forecast hour only
+    source = cat.gfs_surface_winds(cycle=cycle, lead_times=[forecast_hour])
 
     # Read the data
     ds = source.read()
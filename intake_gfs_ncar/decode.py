@@ -0,0 +1,111 @@
+"""Process pools for decoding GRIB2 files outside the reading process.
+
+cfgrib and ecCodes hold the GIL for much of the decoding work, so decoding
+many full GRIB2 files in threads does not scale with the number of cores.
+This module keeps a process-wide registry of process pools, shared by every
+source configured with the same number of processes, and the worker function
+that decodes a local file into plain NumPy arrays. Only the arrays cross the
+process boundary; the parent assembles the ``xr.Dataset``. A pool whose
+worker died (e.g. killed when running out of memory) is replaced.
+"""
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict
+
+import xarray as xr
+
+logger = logging.getLogger(__name__)
+
+_pools: Dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(processes: int) -> ProcessPoolExecutor:
+    """Return a shared process pool with the given number of processes.
+
+    Workers are started with the ``spawn`` method, as forking a process that
+    runs download threads can deadlock in ecCodes or the HTTP stack.
+    """
+    processes = int(processes)
+    with _pools_lock:
+        pool = _pools.get(processes)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=processes,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _pools[processes] = pool
+            logger.debug(f"Started GRIB decode pool with {processes} processes")
+        return pool
+
+
+def discard_pool(processes: int, pool: ProcessPoolExecutor) -> None:
+    """Remove a broken pool from the registry so a new one gets started."""
+    with _pools_lock:
+        if _pools.get(processes) is pool:
+            del _pools[processes]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pools() -> None:
+    """Shut down all shared process pools."""
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.shutdown(wait=True, cancel_futures=True)
+        _pools.clear()
+
+
+def decode_grib(path: str, backend_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Decode a local GRIB2 file with cfgrib and return its data as arrays.
+
+    Runs in a worker process. The result is the ``xr.Dataset.to_dict()``
+    representation with NumPy arrays as data, which pickles without copying
+    the arrays through Python lists.
+    """
+    with xr.open_dataset(path, engine="cfgrib", backend_kwargs=backend_kwargs) as ds:
+        ds.load()
+        # Same layout as to_dict(data="array"), which older xarray lacks
+        return {
+            "coords": {k: _variable_dict(v) for k, v in ds.coords.items()},
+            "attrs": dict(ds.attrs),
+            "dims": dict(ds.sizes),
+            "data_vars": {k: _variable_dict(v) for k, v in ds.data_vars.items()},
+        }
+
+
+def _variable_dict(var: xr.DataArray) -> Dict[str, Any]:
+    return {"dims": var.dims, "attrs": dict(var.attrs), "data": var.values}
+
+
+def decode_grib_in_pool(
+    processes: int, path: str, backend_kwargs: Dict[str, Any]
+) -> xr.Dataset:
+    """Decode a local GRIB2 file in a shared process pool.
+
+    Parameters
+    ----------
+    processes : int
+        Number of processes of the shared pool to use.
+    path : str
+        Path of the GRIB2 file, readable by the worker processes.
+    backend_kwargs : dict
+        cfgrib backend arguments (``filter_by_keys``, ``indexpath``, ...).
+
+    Returns
+    -------
+    xarray.Dataset
+        The decoded dataset, held in memory.
+    """
+    pool = get_pool(processes)
+    try:
+        data = pool.submit(decode_grib, path, backend_kwargs).result()
+    except BrokenProcessPool:
+        # A dead worker breaks the pool for good, so retry once on a new one
+        logger.warning("GRIB decode pool is broken, restarting it")
+        discard_pool(processes, pool)
+        data = get_pool(processes).submit(decode_grib, path, backend_kwargs).result()
+    return xr.Dataset.from_dict(data)
@@ -4,15 +4,39 @@ This module provides an Intake driver for accessing Global Forecast System (GFS)
 forecast data from the NCAR THREDDS server.
 """
 
+import asyncio
+import copy
+import glob
+import json
 import logging
+import os
+import tempfile
+import threading
 import traceback
-from datetime import datetime, time, timezone
-from typing import Any, Dict, List, Optional
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, time, timedelta, timezone
+from time import monotonic, sleep
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
+import requests
 import xarray as xr
 from intake.source.base import DataSource, Schema
 
+from . import assemble, cache, decode, grib_index, http_session
+
 logger = logging.getLogger(__name__)
 
 # Default GFS data URL (NCAR THREDDS)
@@ -24,6 +48,51 @@ DEFAULT_FILE_PATTERN = (
     "gfs.0p25.{date:%Y%m%d}{model_run_time:02d}.f{lead_time:03d}.grib2"
 )
 
+# Number of cycles (6 hours apart) probed when resolving cycle='latest'
+LATEST_CYCLE_LOOKBACK = 8
+
+# Seconds for which a resolved 'latest' cycle is reused by new sources
+LATEST_CYCLE_CACHE_TTL = 300
+
+# Resolved 'latest' cycles by (base_url, last lead time), with resolution time
+_latest_cycles: Dict[Tuple[str, int], Tuple[float, datetime]] = {}
+_latest_cycles_lock = threading.Lock()
+
+# Serializes opening NetCDF files: xarray reads their metadata outside of its
+# netCDF4 lock, which netCDF-C/HDF5 does not support from concurrent threads
+_netcdf_open_lock = threading.Lock()
+
+# Mapping from NetCDF names (NetcdfSubset) to GRIB-style names
+NCSS_VARIABLE_NAMES = {
+    "Temperature_height_above_ground": "t2m",  # 2m temperature
+    "u-component_of_wind_height_above_ground": "u10",  # 10m u-wind
+    "v-component_of_wind_height_above_ground": "v10",  # 10m v-wind
+    "Pressure_reduced_to_MSL_msl": "msl",  # Mean sea level pressure
+    "Surface_pressure_surface": "sp",  # Surface pressure
+    "Relative_humidity_height_above_ground": "r2",  # 2m relative humidity
+    "Specific_humidity_height_above_ground": "q2",  # 2m specific humidity
+    "Dewpoint_temperature_height_above_ground": "d2m",  # 2m dewpoint
+    "Total_precipitation_surface": "tp",  # Total precipitation
+    "Convective_precipitation_surface": "cp",  # Convective precipitation
+    "Snowfall_rate_water_equivalent_surface": "sf",  # Snowfall
+    "Geopotential_height_isobaric": "gh",  # Geopotential height
+    "Temperature_isobaric": "t",  # Temperature on pressure levels
+    "u-component_of_wind_isobaric": "u",  # U-wind on pressure levels
+    "v-component_of_wind_isobaric": "v",  # V-wind on pressure levels
+    "Relative_humidity_isobaric": "r",  # Relative humidity on pressure levels
+    "Ice_cover_surface": "ci",  # Sea ice concentration
+}
+
+# Mapping from GRIB-style names back to NetCDF names (NetcdfSubset)
+STANDARD_TO_NCSS_NAMES = {v: k for k, v in NCSS_VARIABLE_NAMES.items()}
+
+# Largest NetcdfSubset response decoded in memory without a temporary file
+DEFAULT_NCSS_MEMORY_THRESHOLD = 256 * 1024**2
+
+# NetcdfSubset path of the GFS 0.25 degree forecast collection, in which each
+# cycle is addressed by its reference time
+DEFAULT_COLLECTION_PATH = "aggregations/g/d084001/1/TwoD"
+
 
 class GFSForecastSource(DataSource):
     """Intake driver for GFS forecast data from NCAR THREDDS.
@@ -39,15 +108,128 @@ class GFSForecastSource(DataSource):
         ISO format datetime string, or datetime object. Default: 'latest'
     max_lead_time : int, optional
         Maximum forecast lead time in hours. Default: 24
+    min_lead_time : int, optional
+        Minimum forecast lead time in hours. Default: 0
+    lead_time_step : int, optional
+        Only read every lead time that is a multiple of this many hours after
+        ``min_lead_time``, e.g. 24 for daily fields. Lead times are taken from
+        the published GFS schedule (3-hourly up to 240 hours, then 6-hourly),
+        so steps that are not a multiple of that schedule skip the hours
+        without files. Default: every published lead time
+    lead_times : list of int, optional
+        Explicit forecast lead times in hours to read, e.g. ``[24, 48, 72]``.
+        Overrides ``max_lead_time``, ``min_lead_time`` and ``lead_time_step``.
+        A comma-separated string is accepted for use in catalog templates.
     base_url : str, optional
         Base URL for the NCAR THREDDS server
     cfgrib_filter_by_keys : dict, optional
         Dictionary of GRIB filter parameters (e.g., {'typeOfLevel': 'surface'})
     access_method : str, optional
         Data access method: 'ncss' (NetcdfSubset), 'fileServer' (HTTP download),
-        or 'auto' (try ncss first, fallback to fileServer). Default: 'auto'
+        'auto' (try ncss first, fallback to fileServer) or 'ncss_collection'
+        (NetcdfSubset on the forecast collection, returning many lead times per
+        request). Default: 'auto'
     ncss_params : dict, optional
         Additional NetcdfSubset parameters (e.g., {'north': 60, 'south': 30})
+    max_workers : int, optional
+        Maximum number of partitions downloaded and decoded concurrently by
+        ``read()``. Use 1 for serial reads. Default: 4
+    http_pool_size : int, optional
+        Number of keep-alive connections pooled per host. Defaults to the
+        larger of 10 and ``max_workers``.
+    http_timeout : float, optional
+        Connect and read timeout for HTTP requests in seconds. Default: 30
+    http_retries : int, optional
+        Number of retries for connection errors and transient HTTP errors
+        (429/5xx), with exponential backoff. Default: 3
+    session : requests.Session, optional
+        HTTP session to use for all requests. By default a pooled session is
+        shared by every source with the same pool size and retry settings.
+    use_grib_index : bool, optional
+        In fileServer mode, use a GRIB inventory (the ``.idx`` sidecar file, or
+        an inventory built from an earlier full download of the same file) to
+        download only the messages matching ``cfgrib_filter_by_keys`` with
+        HTTP Range requests. Default: True
+    cache_dir : str, optional
+        Directory of a persistent download cache. Downloaded files are stored
+        under a hash of their normalized URL, query and byte ranges and are
+        reused by later reads without contacting the server. Defaults to the
+        ``INTAKE_GFS_NCAR_CACHE_DIR`` environment variable; caching is
+        disabled if neither is set.
+    cache_max_size : int, optional
+        Maximum size of the download cache in bytes. Least recently used
+        files are evicted beyond it. Default: unlimited
+    cache_max_age : float, optional
+        Cached files not used for this many seconds are evicted. Defaults to
+        the ``INTAKE_GFS_NCAR_CACHE_TTL`` environment variable, else unlimited
+    memory_cache : bool, optional
+        Keep decoded partitions in a process-wide, memory-bounded LRU cache
+        shared by all sources, so that new sources for the same files (for
+        example catalog entries called with a larger ``max_lead_time``) only
+        fetch partitions that have not been read yet. The budget is set with
+        ``intake_gfs_ncar.cache.partitions.resize(nbytes)``. Default: True
+    collection_path : str, optional
+        Path of the forecast collection below ``{base_url}/ncss/grid/`` used by
+        the 'ncss_collection' access method. Default: ``DEFAULT_COLLECTION_PATH``
+    collection_batch_size : int, optional
+        Maximum number of lead times requested at once in 'ncss_collection'
+        mode. Each batch is one partition. Default: all lead times in a single
+        request
+    bbox : tuple of float, optional
+        Bounding box ``(west, south, east, north)`` in degrees. Sent to
+        NetcdfSubset as ``west``/``south``/``east``/``north`` and applied to
+        decoded GRIB2 data before it is loaded. Boxes crossing the antimeridian
+        (``west > east``) are supported.
+    horiz_stride : int, optional
+        Keep every n-th grid point along latitude and longitude (NetcdfSubset
+        ``horizStride``). Default: 1
+    pressure_levels : list of float, optional
+        Pressure levels to keep, in hPa. A single level is sent to NetcdfSubset
+        as ``vertCoord``; otherwise levels are selected after decoding.
+    variables : list of str, optional
+        Variables to keep, using the standardized names of the output dataset
+        (e.g. ``['u10', 'v10']``) or NetcdfSubset names. Sent to NetcdfSubset as
+        ``var`` and applied to decoded GRIB2 data before it is loaded.
+    points : list of (float, float) or dict, optional
+        Extract time series at these ``(latitude, longitude)`` locations, given
+        as a list or as a dict mapping station names to locations. Only the
+        region enclosing all points is requested (one request per partition),
+        then the nearest grid point to each location is selected, giving a
+        ``(time, station)`` dataset.
+    ncss_memory_threshold : int, optional
+        NetcdfSubset responses up to this many bytes are streamed into memory
+        and decoded from there, without a temporary file. Larger responses
+        are spilled to disk. Use 0 to always write to disk. Responses are
+        always written to the download cache when one is configured.
+        Default: 256 MiB
+    schema_cache_ttl : float, optional
+        Discovered schemas are persisted per catalog entry (base URL, access
+        method, filter keys and subsetting arguments) and reused by new
+        sources for this many seconds, so ``discover()`` skips the network.
+        Use 0 to disable. The directory defaults to
+        ``~/.cache/intake_gfs_ncar/schemas`` and can be changed with the
+        ``INTAKE_GFS_NCAR_SCHEMA_CACHE_DIR`` environment variable.
+        Default: one day
+    decode_processes : int, optional
+        Decode GRIB2 files in a shared pool of this many worker processes
+        instead of the reading threads. cfgrib holds the GIL for much of its
+        work, so this lets full-file reads scale with the number of cores.
+        Workers return NumPy arrays and the dataset is assembled in this
+        process. Default: 0 (decode in the reading threads)
+    lazy : bool, optional
+        Keep partitions as lazily opened, dask-backed datasets over the files
+        in the download cache instead of loading them into memory. Reading
+        then only downloads the files; values are decoded when they are
+        computed, so selecting a slice of the result decodes only that slice.
+        Requires a download cache (``cache_dir``), which must keep the files
+        while the dataset is in use. Disables ``memory_cache`` and
+        ``decode_processes``. Default: False
+    dtype : str, optional
+        Floating point type (e.g. ``'float32'``) the floating point data
+        variables are cast to as each partition is decoded, one variable at a
+        time, so that memory use and the cost of combining partitions scale
+        with the type kept. Coordinates keep their type. Use ``variables`` to
+        keep only some data variables. Default: None (keep the decoded types)
     metadata : dict, optional
         Additional metadata to include in the source
     """
@@ -68,6 +250,23 @@ class GFSForecastSource(DataSource):
             "type": "int",
             "default": 24,
         },
+        "min_lead_time": {
+            "description": "Minimum lead time to retrieve (hours)",
+            "type": "int",
+            "default": 0,
+        },
+        "lead_time_step": {
+            "description": "Interval between retrieved lead times (hours), "
+            "0 for every published lead time",
+            "type": "int",
+            "default": 0,
+        },
+        "lead_times": {
+            "description": "Explicit lead times to retrieve (hours), overriding "
+            "the lead time range",
+            "type": "list",
+            "default": [],
+        },
     }
 
     def __init__(
@@ -79,6 +278,31 @@ class GFSForecastSource(DataSource):
         metadata: Optional[Dict[str, Any]] = None,
         cycle: str = "latest",
         max_lead_time: int = 24,
+        min_lead_time: int = 0,
+        lead_time_step: Optional[int] = None,
+        lead_times: Optional[List[int]] = None,
+        max_workers: int = 4,
+        http_pool_size: Optional[int] = None,
+        http_timeout: float = http_session.DEFAULT_TIMEOUT,
+        http_retries: int = http_session.DEFAULT_RETRIES,
+        session: Optional[requests.Session] = None,
+        use_grib_index: bool = True,
+        cache_dir: Optional[str] = None,
+        cache_max_size: Optional[int] = None,
+        cache_max_age: Optional[float] = None,
+        memory_cache: bool = True,
+        collection_path: str = DEFAULT_COLLECTION_PATH,
+        collection_batch_size: Optional[int] = None,
+        bbox: Optional[Tuple[float, float, float, float]] = None,
+        horiz_stride: Optional[int] = None,
+        pressure_levels: Optional[List[float]] = None,
+        variables: Optional[List[str]] = None,
+        points: Optional[Any] = None,
+        ncss_memory_threshold: int = DEFAULT_NCSS_MEMORY_THRESHOLD,
+        schema_cache_ttl: Optional[float] = cache.DEFAULT_SCHEMA_MAX_AGE,
+        decode_processes: int = 0,
+        lazy: bool = False,
+        dtype: Optional[str] = None,
         **kwargs,
     ):
         super().__init__(metadata=metadata or {})
@@ -86,12 +310,15 @@ class GFSForecastSource(DataSource):
         # Handle "today" default for cycle parameter
         if cycle == "today":
             cycle = "latest"
+        # The newest cycle is resolved against the server when URLs are built
+        self._latest = isinstance(cycle, str) and cycle.lower() == "latest"
 
         # Parse and validate cycle (date and model run time)
         try:
             if isinstance(cycle, str):
                 if cycle.lower() == "latest":
-                    # Use current time if 'latest' is specified
+                    # Start from the current time if 'latest' is specified;
+                    # the cycle is stepped back to a published one later
                     cycle_dt = datetime.now(timezone.utc)
                     # Round down to the nearest 6-hour cycle (00, 06, 12, 18Z)
                     hour = (cycle_dt.hour // 6) * 6
@@ -157,12 +384,216 @@ class GFSForecastSource(DataSource):
                 f"Invalid max_lead_time: {max_lead_time}. Expected positive " f"integer"
             ) from e
 
+        # Validate the lead time selection
+        try:
+            self.min_lead_time = int(min_lead_time or 0)
+            if not 0 <= self.min_lead_time <= self.max_lead_time:
+                raise ValueError("min_lead_time must be between 0 and max_lead_time")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid min_lead_time: {min_lead_time}. Expected integer between "
+                f"0 and max_lead_time"
+            ) from e
+        try:
+            self.lead_time_step = int(lead_time_step or 0) or None
+            if self.lead_time_step is not None and self.lead_time_step < 0:
+                raise ValueError("lead_time_step must be a positive integer")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid lead_time_step: {lead_time_step}. Expected positive integer"
+            ) from e
+        try:
+            if isinstance(lead_times, str):
+                # Catalog templates render lists as strings
+                lead_times = [
+                    v for v in lead_times.strip("[]() ").split(",") if v.strip()
+                ]
+            elif isinstance(lead_times, (int, float)):
+                lead_times = [lead_times]
+            self.lead_times = (
+                sorted({int(v) for v in lead_times}) if lead_times else None
+            )
+            if self.lead_times and self.lead_times[0] < 0:
+                raise ValueError("lead_times must not be negative")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid lead_times: {lead_times}. Expected list of non-negative "
+                f"integers"
+            ) from e
+        if self.lead_times:
+            # Explicit lead times define the range of the forecast
+            self.min_lead_time = self.lead_times[0]
+            self.max_lead_time = self.lead_times[-1]
+            self.lead_time_step = None
+        elif not self._select_lead_times():
+            raise ValueError(
+                f"Invalid lead time range: no GFS lead times between "
+                f"{self.min_lead_time} and {self.max_lead_time} hours with "
+                f"lead_time_step={self.lead_time_step}"
+            )
+
+        # Validate max_workers
+        try:
+            self.max_workers = int(max_workers)
+            if self.max_workers <= 0:
+                raise ValueError("max_workers must be a positive integer")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid max_workers: {max_workers}. Expected positive integer"
+            ) from e
+
+        self.http_pool_size = int(
+            http_pool_size or max(http_session.DEFAULT_POOL_SIZE, self.max_workers)
+        )
+        self.http_timeout = http_timeout
+        self.http_retries = int(http_retries)
+        self._session = session
+        self.use_grib_index = bool(use_grib_index)
+
+        cache_dir = cache_dir or os.environ.get(cache.CACHE_DIR_ENV)
+        if cache_max_age is None:
+            cache_max_age = os.environ.get(cache.CACHE_MAX_AGE_ENV)
+        self.cache = (
+            cache.DownloadCache(
+                cache_dir, max_size=cache_max_size, max_age=cache_max_age
+            )
+            if cache_dir
+            else None
+        )
+        self.memory_cache = bool(memory_cache)
+        # Called with (url, nbytes) after every completed download
+        self._on_download: Optional[Callable[[str, int], None]] = None
+        self.schema_cache = (
+            cache.SchemaCache(cache.default_schema_cache_dir(), schema_cache_ttl)
+            if schema_cache_ttl
+            else None
+        )
+
+        # Validate decode_processes
+        try:
+            self.decode_processes = int(decode_processes or 0)
+            if self.decode_processes < 0:
+                raise ValueError("decode_processes must not be negative")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid decode_processes: {decode_processes}. Expected "
+                f"non-negative integer"
+            ) from e
+
+        # Lazy partitions read their values from the cached files on demand
+        self.lazy = bool(lazy)
+        if self.lazy:
+            if self.cache is None:
+                raise ValueError("lazy=True requires a download cache (cache_dir)")
+            # Lazy partitions are cheap to reopen and the in-memory cache
+            # budget counts the full (unloaded) size of their variables
+            self.memory_cache = False
+            self.decode_processes = 0
+
+        # Validate collection_batch_size
+        try:
+            self.collection_batch_size = (
+                int(collection_batch_size)
+                if collection_batch_size is not None
+                else None
+            )
+            if (
+                self.collection_batch_size is not None
+                and self.collection_batch_size <= 0
+            ):
+                raise ValueError("collection_batch_size must be a positive integer")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid collection_batch_size: {collection_batch_size}. "
+                f"Expected positive integer"
+            ) from e
+        self.collection_path = collection_path.strip("/")
+
+        # Validate spatial and variable subsetting
+        if bbox is not None:
+            try:
+                west, south, east, north = (float(v) for v in bbox)
+                if not -90 <= south <= north <= 90:
+                    raise ValueError("bbox south must not exceed north")
+            except (ValueError, TypeError) as e:
+                raise ValueError(
+                    f"Invalid bbox: {bbox}. Expected (west, south, east, north) "
+                    f"in degrees"
+                ) from e
+            bbox = (west, south, east, north)
+        self.bbox = bbox
+
+        try:
+            self.horiz_stride = int(horiz_stride) if horiz_stride is not None else 1
+            if self.horiz_stride <= 0:
+                raise ValueError("horiz_stride must be a positive integer")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid horiz_stride: {horiz_stride}. Expected positive integer"
+            ) from e
+
+        if isinstance(pressure_levels, (int, float)):
+            pressure_levels = [pressure_levels]
+        self.pressure_levels = (
+            [float(level) for level in pressure_levels] if pressure_levels else None
+        )
+        if isinstance(variables, str):
+            variables = [variables]
+        self.variables = list(variables) if variables else None
+
+        try:
+            self.decode_dtype = np.dtype(dtype).name if dtype is not None else None
+            if (
+                self.decode_dtype is not None
+                and np.dtype(self.decode_dtype).kind != "f"
+            ):
+                raise ValueError("dtype must be a floating point type")
+        except (ValueError, TypeError) as e:
+            raise ValueError(
+                f"Invalid dtype: {dtype}. Expected a floating point type such as "
+                f"'float32'"
+            ) from e
+
+        # Validate points and request only the region that encloses them
+        self.stations, self.points = None, None
+        if points:
+            if isinstance(points, dict):
+                names, locations = list(points.keys()), list(points.values())
+            else:
+                locations = list(points)
+                names = list(range(len(locations)))
+            try:
+                self.points = [(float(lat), float(lon)) for lat, lon in locations]
+                if not all(-90 <= lat <= 90 for lat, _ in self.points):
+                    raise ValueError("point latitudes must be between -90 and 90")
+            except (ValueError, TypeError) as e:
+                raise ValueError(
+                    f"Invalid points: {points}. Expected (latitude, longitude) pairs"
+                ) from e
+            self.stations = names
+            if self.bbox is None:
+                self.bbox = self._points_bbox(self.points)
+
+        self.ncss_memory_threshold = int(ncss_memory_threshold or 0)
+
         self.base_url = base_url.rstrip("/")
         self.cfgrib_filter_by_keys = cfgrib_filter_by_keys or {}
         self.access_method = access_method
         self.ncss_params = ncss_params or {}
         self._ds = None
         self._urls = None
+        self._lead_times = None
+        # Lead times held by each partition
+        self._partition_lead_times: Optional[List[List[int]]] = None
+        # Indices of the partitions held by self._ds
+        self._loaded = set()
+        # Preallocated arrays of self._ds, filled further by refresh()
+        self._assembler: Optional[assemble.PartitionAssembler] = None
+        # Partition 0 decoded by discover(), kept for the next read when the
+        # in-memory partition cache is disabled
+        self._schema_partition: Optional[xr.Dataset] = None
+        # Variable standardization plans by partition layout
+        self._standardize_plans: Dict[Tuple, Tuple] = {}
 
         # Create the cycle datetime for metadata
         cycle_datetime = datetime.combine(self.date, time(hour=self.model_run_time))
@@ -173,11 +604,26 @@ class GFSForecastSource(DataSource):
                 "cycle": cycle_datetime.isoformat(),
                 "date": self.date.isoformat(),
                 "max_lead_time": self.max_lead_time,
+                "min_lead_time": self.min_lead_time,
+                "lead_time_step": self.lead_time_step,
+                "lead_times": self.lead_times,
                 "model_run_time": f"{self.model_run_time:02d}Z",
                 "base_url": self.base_url,
                 "cfgrib_filter_by_keys": self.cfgrib_filter_by_keys,
                 "access_method": self.access_method,
                 "ncss_params": self.ncss_params,
+                "max_workers": self.max_workers,
+                "decode_processes": self.decode_processes,
+                "lazy": self.lazy,
+                "cache_dir": self.cache.cache_dir if self.cache else None,
+                "collection_path": self.collection_path,
+                "collection_batch_size": self.collection_batch_size,
+                "bbox": self.bbox,
+                "horiz_stride": self.horiz_stride,
+                "pressure_levels": self.pressure_levels,
+                "variables": self.variables,
+                "points": self.points,
+                "dtype": self.decode_dtype,
                 **kwargs,
             }
         )
@@ -187,38 +633,212 @@ class GFSForecastSource(DataSource):
             f"with max_lead_time: {self.max_lead_time}"
         )
 
+    @property
+    def session(self) -> requests.Session:
+        """Pooled HTTP session used for all requests made by this source."""
+        if self._session is None:
+            self._session = http_session.get_session(
+                pool_size=self.http_pool_size, retries=self.http_retries
+            )
+        return self._session
+
+    def _download(
+        self,
+        url: str,
+        suffix: str,
+        ranges: Optional[List[Tuple[int, Optional[int]]]] = None,
+    ) -> str:
+        """Download a URL, or byte ranges of it, to a local file.
+
+        If a download cache is configured, the file is stored in (and on later
+        calls served from) the cache without contacting the server. Otherwise
+        a temporary file is created. Either way the returned path should be
+        handed to ``_release_file()`` once it has been decoded.
+        """
+        cached = self._cached_download(url, suffix, ranges)
+        if cached is not None:
+            return cached
+
+        tmp_path = self._download_target(url, suffix, ranges)
+        logger.info(f"Downloading {url} to {tmp_path}")
+        try:
+            if ranges:
+                nbytes = http_session.download_ranges(
+                    self.session, url, tmp_path, ranges, timeout=self.http_timeout
+                )
+            else:
+                nbytes = http_session.download(
+                    self.session, url, tmp_path, timeout=self.http_timeout
+                )
+        except Exception:
+            self._remove_file(tmp_path)
+            raise
+
+        return self._finish_download(url, suffix, ranges, tmp_path, nbytes)
+
+    def _fetch(self, url: str, suffix: str) -> Union[bytes, str]:
+        """Download a URL into memory, or to a file if it is too large.
+
+        Responses no larger than ``ncss_memory_threshold`` are returned as
+        bytes. Larger responses, and all responses when a download cache is
+        configured, are written to a file as by ``_download()`` and its path
+        is returned; it should be handed to ``_release_file()`` once decoded.
+        """
+        if self.cache is not None or self.ncss_memory_threshold <= 0:
+            return self._download(url, suffix)
+
+        logger.info(f"Downloading {url} into memory")
+        data, path, nbytes = http_session.download_to_memory(
+            self.session,
+            url,
+            self.ncss_memory_threshold,
+            spill_path=lambda: self._download_target(url, suffix),
+            timeout=self.http_timeout,
+        )
+        if path is not None:
+            logger.info(f"Response exceeded memory threshold, spilled to {path}")
+            return self._finish_download(url, suffix, None, path, nbytes)
+        if nbytes == 0:
+            raise IOError(f"Failed to download file from {url}")
+        logger.info(f"Successfully downloaded {nbytes} bytes into memory")
+        if self._on_download is not None:
+            self._on_download(url, nbytes)
+        return data
+
+    def _cached_download(
+        self,
+        url: str,
+        suffix: str,
+        ranges: Optional[List[Tuple[int, Optional[int]]]] = None,
+    ) -> Optional[str]:
+        """Return the cached copy of a download, or None on a cache miss."""
+        if self.cache is None:
+            return None
+        path = self.cache.get(
+            cache.cache_key(url, *([ranges] if ranges else [])), suffix
+        )
+        if path is not None:
+            logger.info(f"Using cached download of {url}: {path}")
+        return path
+
+    def _download_target(
+        self,
+        url: str,
+        suffix: str,
+        ranges: Optional[List[Tuple[int, Optional[int]]]] = None,
+    ) -> str:
+        """Return a new temporary path to download a URL to."""
+        if self.cache is not None:
+            key = cache.cache_key(url, *([ranges] if ranges else []))
+            return self.cache.temp_path(key, suffix)
+
+        with tempfile.NamedTemporaryFile(
+            prefix="gfs_intake_", suffix=suffix, delete=False
+        ) as tmp_file:
+            return tmp_file.name
+
+    def _finish_download(
+        self,
+        url: str,
+        suffix: str,
+        ranges: Optional[List[Tuple[int, Optional[int]]]],
+        tmp_path: str,
+        nbytes: int,
+    ) -> str:
+        """Validate a completed download and commit it to the cache."""
+        if nbytes == 0:
+            self._remove_file(tmp_path)
+            raise IOError(f"Failed to download file from {url}")
+
+        logger.info(f"Successfully downloaded file, size: {nbytes} bytes")
+        if self._on_download is not None:
+            self._on_download(url, nbytes)
+        if self.cache is None:
+            return tmp_path
+        key = cache.cache_key(url, *([ranges] if ranges else []))
+        return self.cache.commit(tmp_path, key, suffix)
+
+    def _release_file(self, path: Union[bytes, str]) -> None:
+        """Remove a downloaded file after decoding unless it is a cache entry.
+
+        In-memory downloads returned by ``_fetch()`` need no cleanup. cfgrib
+        index files written next to a temporary file are removed with it.
+        """
+        if not isinstance(path, str) or self._is_cache_entry(path):
+            return
+        self._remove_file(path)
+        for index_file in glob.glob(glob.escape(path) + ".*.idx"):
+            self._remove_file(index_file)
+
+    def _is_cache_entry(self, path: str) -> bool:
+        """Whether a local file lives in the download cache."""
+        return self.cache is not None and path.startswith(self.cache.cache_dir + os.sep)
+
+    def _grib_indexpath(self, path: str) -> str:
+        """Return the cfgrib ``indexpath`` to use when opening a GRIB file.
+
+        Cache entries are content-addressed and never change, so their cfgrib
+        index is kept next to them and later decodes skip the full message
+        scan. cfgrib adds the filter key names to the indexed keys, so one
+        index is written per set of key names and shared by every filter using
+        those names with any values. Temporary files are scanned without
+        writing an index.
+        """
+        if not self._is_cache_entry(path):
+            return ""
+        # Cache hits refresh the GRIB file's mtime for LRU eviction, which
+        # would make cfgrib discard its (older) index as out of date
+        for index_file in glob.glob(glob.escape(path) + ".*.idx"):
+            try:
+                os.utime(index_file)
+            except OSError:
+                pass
+        return path + ".{short_hash}.idx"
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        """Remove a temporary file, logging rather than raising on failure."""
+        try:
+            if os.path.exists(path):
+                os.unlink(path)
+                logger.debug(f"Removed temporary file: {path}")
+        except Exception as e:
+            logger.warning(f"Could not remove temporary file {path}: {e}")
+
     def _build_urls(self) -> List[str]:
-        """Build URLs for all forecast lead times up to max_lead_time."""
+        """Build URLs for the selected forecast lead times."""
         if self._urls is not None:
             return self._urls
 
         urls = []
-        date_str = self.date.strftime("%Y%m%d")
-        model_run_time_str = f"{self.model_run_time:02d}"
-
         logger.info(
-            f"Building URLs for max_lead_time={self.max_lead_time} (f{self.max_lead_time:03d})"
+            f"Building URLs for lead times f{self.min_lead_time:03d} to "
+            f"f{self.max_lead_time:03d}"
         )
 
-        # GFS files are available in 3-hour increments up to 120 hours,
-        # then 6-hour increments up to 240 hours, and 12-hour increments beyond that
-        for lead_time in range(0, min(self.max_lead_time, 120) + 1, 3):
-            url = self._build_file_url(date_str, model_run_time_str, lead_time)
-            urls.append(url)
-            logger.debug(f"Added URL for lead_time={lead_time}: {url}")
+        partition_lead_times = self._select_partition_lead_times()
+        lead_times = [
+            lead_time for batch in partition_lead_times for lead_time in batch
+        ]
 
-        if self.max_lead_time > 120:
-            for lead_time in range(123, min(self.max_lead_time, 240) + 1, 3):
-                url = self._build_file_url(date_str, model_run_time_str, lead_time)
-                urls.append(url)
-                logger.debug(f"Added URL for lead_time={lead_time}: {url}")
+        if self._latest:
+            self._resolve_latest_cycle(lead_times[-1])
+        date_str = self.date.strftime("%Y%m%d")
+        model_run_time_str = f"{self.model_run_time:02d}"
 
-        if self.max_lead_time > 240:
-            for lead_time in range(246, self.max_lead_time + 1, 6):
+        if self.access_method == "ncss_collection":
+            for batch in partition_lead_times:
+                url = self._build_collection_url(batch)
+                urls.append(url)
+                logger.debug(f"Added URL for lead_times={batch}: {url}")
+        else:
+            for lead_time in lead_times:
                 url = self._build_file_url(date_str, model_run_time_str, lead_time)
                 urls.append(url)
                 logger.debug(f"Added URL for lead_time={lead_time}: {url}")
 
+        self._lead_times = lead_times
+        self._partition_lead_times = partition_lead_times
         self._urls = urls
         logger.info(
             f"Generated {len(urls)} URLs for GFS data from {date_str} {model_run_time_str}Z"
@@ -233,6 +853,146 @@ class GFSForecastSource(DataSource):
 
         return urls
 
+    @staticmethod
+    def _published_lead_times(max_lead_time: int) -> List[int]:
+        """Lead times of the published GFS files up to ``max_lead_time``."""
+        # GFS files are available in 3-hour increments up to 240 hours, then
+        # in 6-hour increments
+        lead_times = list(range(0, min(max_lead_time, 240) + 1, 3))
+        if max_lead_time > 240:
+            lead_times.extend(range(246, max_lead_time + 1, 6))
+        return lead_times
+
+    def _select_lead_times(self) -> List[int]:
+        """Lead times to read, from ``lead_times`` or the lead time range."""
+        if self.lead_times:
+            published = set(self._published_lead_times(self.max_lead_time))
+            unpublished = [lt for lt in self.lead_times if lt not in published]
+            if unpublished:
+                logger.warning(
+                    f"Lead times {unpublished} are not on the GFS output schedule "
+                    f"and may not be available"
+                )
+            return list(self.lead_times)
+
+        lead_times = [
+            lead_time
+            for lead_time in self._published_lead_times(self.max_lead_time)
+            if lead_time >= self.min_lead_time
+        ]
+        if self.lead_time_step:
+            lead_times = [
+                lead_time
+                for lead_time in lead_times
+                if (lead_time - self.min_lead_time) % self.lead_time_step == 0
+            ]
+        return lead_times
+
+    def _select_partition_lead_times(self) -> List[List[int]]:
+        """Lead times held by each partition, without resolving the cycle."""
+        if self._partition_lead_times is not None:
+            return self._partition_lead_times
+        lead_times = self._select_lead_times()
+        if self.access_method == "ncss_collection":
+            # One request per batch of lead times instead of one per file
+            return self._collection_batches(lead_times)
+        return [[lead_time] for lead_time in lead_times]
+
+    def _collection_batches(self, lead_times: List[int]) -> List[List[int]]:
+        """Split lead times into batches requested from the collection at once.
+
+        A collection request returns every lead time between its first and
+        last one, so batches only hold lead times that follow each other on
+        the output schedule, and at most ``collection_batch_size`` of them.
+        """
+        position = {
+            lead_time: i
+            for i, lead_time in enumerate(self._published_lead_times(lead_times[-1]))
+        }
+        runs: List[List[int]] = []
+        for lead_time in lead_times:
+            previous = runs[-1][-1] if runs else None
+            if (
+                previous in position
+                and lead_time in position
+                and position[lead_time] == position[previous] + 1
+            ):
+                runs[-1].append(lead_time)
+            else:
+                runs.append([lead_time])
+
+        batch_size = self.collection_batch_size or len(lead_times)
+        return [
+            run[start : start + batch_size]
+            for run in runs
+            for start in range(0, len(run), batch_size)
+        ]
+
+    def _resolve_latest_cycle(self, last_lead_time: int) -> None:
+        """Step the provisional 'latest' cycle back to the newest published one.
+
+        Cycles are probed newest first with HEAD requests on the fileServer
+        copy of their last lead time, then of their analysis (f000) file. The
+        first cycle with a complete or partial set of files is used. Results
+        are shared by all sources with the same base URL and last lead time
+        for ``LATEST_CYCLE_CACHE_TTL`` seconds.
+        """
+        key = (self.base_url, last_lead_time)
+        with _latest_cycles_lock:
+            resolved = _latest_cycles.get(key)
+        if resolved is not None and monotonic() - resolved[0] < LATEST_CYCLE_CACHE_TTL:
+            cycle = resolved[1]
+            logger.info(f"Using recently resolved latest cycle: {cycle.isoformat()}")
+        else:
+            cycle = self._probe_latest_cycle(last_lead_time)
+            with _latest_cycles_lock:
+                _latest_cycles[key] = (monotonic(), cycle)
+
+        # Only cleared once resolved, so a failed probe is retried by the next
+        # read instead of falling back to the provisional cycle
+        self._latest = False
+        self.date = cycle.date()
+        self.model_run_time = cycle.hour
+        self.metadata.update(
+            {
+                "cycle": cycle.isoformat(),
+                "date": self.date.isoformat(),
+                "model_run_time": f"{self.model_run_time:02d}Z",
+            }
+        )
+
+    def _probe_latest_cycle(self, last_lead_time: int) -> datetime:
+        """Return the newest cycle whose files are available on the server."""
+        newest = datetime.combine(self.date, time(hour=self.model_run_time))
+        for n in range(LATEST_CYCLE_LOOKBACK):
+            cycle = newest - timedelta(hours=6 * n)
+            if self._cycle_file_exists(cycle, last_lead_time):
+                logger.info(f"Latest available cycle: {cycle.isoformat()}")
+                return cycle
+            if last_lead_time > 0 and self._cycle_file_exists(cycle, 0):
+                logger.warning(
+                    f"Latest cycle {cycle.isoformat()} is only partially "
+                    f"available, lead times up to f{last_lead_time:03d} may "
+                    f"be missing"
+                )
+                return cycle
+            logger.info(f"Cycle {cycle.isoformat()} is not available yet")
+
+        raise IOError(
+            f"No GFS cycle available on {self.base_url} in the last "
+            f"{LATEST_CYCLE_LOOKBACK} cycles before {newest.isoformat()}"
+        )
+
+    def _cycle_file_exists(self, cycle: datetime, lead_time: int) -> bool:
+        """Check whether the GRIB2 file of a cycle and lead time is published."""
+        url = DEFAULT_FILE_PATTERN.format(
+            base_url=f"{self.base_url}/fileServer/files/g/d084001",
+            date=cycle,
+            model_run_time=cycle.hour,
+            lead_time=lead_time,
+        )
+        return http_session.exists(self.session, url, timeout=self.http_timeout)
+
     def _build_file_url(
         self, date_str: str, model_run_time_str: str, lead_time: int
     ) -> str:
@@ -242,7 +1002,7 @@ class GFSForecastSource(DataSource):
         if self.access_method == "ncss" or self.access_method == "auto":
             # Use NetcdfSubset service
             url = f"{self.base_url}/ncss/grid/{file_path}"
-            if self.cfgrib_filter_by_keys or self.ncss_params:
+            if self.cfgrib_filter_by_keys or self.ncss_params or self._has_subset():
                 url += self._build_ncss_query()
         else:
             # Use HTTP fileServer
@@ -250,9 +1010,29 @@ class GFSForecastSource(DataSource):
 
         return url
 
-    def _build_ncss_query(self) -> str:
+    def _build_collection_url(self, lead_times: List[int]) -> str:
+        """Build a NetcdfSubset URL returning a range of lead times at once.
+
+        The forecast collection is subset to this source's cycle with
+        ``reftime`` and to the valid times of the first and last lead time with
+        ``time_start`` and ``time_end``.
+        """
+        cycle = datetime.combine(self.date, time(hour=self.model_run_time))
+        fmt = "%Y-%m-%dT%H:%M:%SZ"
+        start = cycle + timedelta(hours=lead_times[0])
+        end = cycle + timedelta(hours=lead_times[-1])
+        query = self._build_ncss_query(
+            {
+                "reftime": cycle.strftime(fmt),
+                "time_start": start.strftime(fmt),
+                "time_end": end.strftime(fmt),
+            }
+        )
+        return f"{self.base_url}/ncss/grid/{self.collection_path}{query}"
+
+    def _build_ncss_query(self, extra_params: Optional[Dict[str, Any]] = None) -> str:
         """Build NetcdfSubset query parameters from cfgrib filters and ncss params."""
-        params = {}
+        params = dict(extra_params or {})
 
         # Add NetcdfSubset-specific parameters
         params.update(self.ncss_params)
@@ -292,6 +1072,20 @@ class GFSForecastSource(DataSource):
                     if level_type == "heightAboveGround":
                         params["vertCoord"] = f"{level}"
 
+        # Typed subsetting arguments take precedence over the cfgrib mapping
+        if self.variables:
+            params["var"] = ",".join(
+                STANDARD_TO_NCSS_NAMES.get(name, name) for name in self.variables
+            )
+        if self.bbox is not None:
+            west, south, east, north = self.bbox
+            params.update(west=west, south=south, east=east, north=north)
+        if self.horiz_stride > 1:
+            params["horizStride"] = self.horiz_stride
+        if self.pressure_levels and len(self.pressure_levels) == 1:
+            # The GFS isobaric coordinates of NetcdfSubset are in Pa
+            params["vertCoord"] = f"{self.pressure_levels[0] * 100:g}"
+
         # Set default format to netcdf if not specified
         if "format" not in params:
             params["format"] = "netcdf"
@@ -305,159 +1099,228 @@ class GFSForecastSource(DataSource):
         else:
             return "?format=netcdf"
 
-    def _get_schema(self) -> Schema:
-        """Get schema for the data source."""
-        if self._schema is not None:
-            return self._schema
+    @staticmethod
+    def _points_bbox(
+        points: List[Tuple[float, float]], margin: float = 0.5
+    ) -> Tuple[float, float, float, float]:
+        """Smallest ``(west, south, east, north)`` box enclosing all points.
 
-        self._build_urls()
+        The margin keeps the nearest grid point of every location inside the
+        box. Longitudes are compared in both the -180-180 and 0-360
+        conventions so that groups of points near the antimeridian give a
+        narrow box crossing it rather than one spanning the globe.
+        """
+        lats = [lat for lat, _ in points]
+        south = max(min(lats) - margin, -90.0)
+        north = min(max(lats) + margin, 90.0)
+
+        boxes = []
+        for origin in (-180.0, 0.0):
+            lons = [(lon - origin) % 360 + origin for _, lon in points]
+            boxes.append((min(lons) - margin, max(lons) + margin))
+        west, east = min(boxes, key=lambda box: box[1] - box[0])
+        if east - west >= 360:
+            return (-180.0, south, 180.0, north)
+        # Boxes crossing the antimeridian are expressed with west > east
+        return ((west + 180) % 360 - 180, south, (east + 180) % 360 - 180, north)
+
+    def _select_points(self, ds: xr.Dataset) -> xr.Dataset:
+        """Select the grid points nearest to ``points`` along a station dim."""
+        lon_grid = ds["longitude"].values
+        origin = 0.0 if lon_grid.max() > 180 else -180.0
+        lats = [lat for lat, _ in self.points]
+        lons = [(lon - origin) % 360 + origin for _, lon in self.points]
+        ds = ds.sel(
+            latitude=xr.DataArray(lats, dims="station"),
+            longitude=xr.DataArray(lons, dims="station"),
+            method="nearest",
+        )
+        return ds.assign_coords(
+            station=self.stations,
+            station_latitude=("station", lats),
+            station_longitude=("station", [lon for _, lon in self.points]),
+        )
 
-        if not self._urls:
-            raise ValueError("No valid URLs found for the specified parameters")
+    def _has_subset(self) -> bool:
+        """Whether any of the typed subsetting arguments is set."""
+        return bool(
+            self.bbox is not None
+            or self.horiz_stride > 1
+            or self.pressure_levels
+            or self.variables
+        )
 
-        # Try to open the first file to get the schema
-        try:
-            url = self._urls[0]
-            logger.info(f"Getting schema from: {url}")
+    def _subset_decoded(self, ds: xr.Dataset, ncss: bool = False) -> xr.Dataset:
+        """Apply the typed subsetting arguments to a lazily decoded dataset.
 
-            # Check if this is a NetcdfSubset URL
-            is_ncss = "/ncss/" in url
+        This runs before ``.load()`` so that only the selected values are read
+        into memory. NetcdfSubset responses (``ncss=True``) have already been
+        subset by the server, so only selections the server cannot make, such
+        as several pressure levels, are applied to them.
+        """
+        if not self._has_subset():
+            return ds
 
-            if is_ncss:
-                # Try NetcdfSubset approach first
-                try:
-                    logger.info("Attempting schema discovery with NetcdfSubset")
-                    ds = xr.open_dataset(url, engine="netcdf4")
-
-                    logger.info("NetcdfSubset schema discovery successful")
-                    logger.info(f"Variables: {list(ds.variables.keys())}")
-                    logger.info(f"Dimensions: {dict(ds.sizes)}")
-                    logger.info(f"Coordinates: {list(ds.coords.keys())}")
-
-                    # Convert to schema
-                    shape = {k: v for k, v in ds.sizes.items()}
-                    dtype = {k: str(v.dtype) for k, v in ds.variables.items()}
-
-                    self._schema = Schema(
-                        datashape=None,
-                        shape=tuple(shape.values()) if shape else None,
-                        dtype=dtype,
-                        npartitions=len(self._urls),
-                        extra_metadata={
-                            "variables": list(ds.data_vars.keys()),
-                            "coords": list(ds.coords.keys()),
-                            "dims": dict(ds.sizes),
-                            "access_method": "ncss",
-                        },
-                    )
+        if self.variables and not ncss:
+            wanted = set(self.variables)
+            wanted.update(
+                STANDARD_TO_NCSS_NAMES.get(name, name) for name in self.variables
+            )
+            keep = [name for name in ds.data_vars if name in wanted]
+            if keep:
+                ds = ds[keep]
+            else:
+                logger.warning(
+                    f"None of the variables {self.variables} found in "
+                    f"{list(ds.data_vars)}, keeping all variables"
+                )
 
-                    # Store the dataset if it's small enough
-                    if sum(shape.values()) < 1e6:  # Arbitrary threshold
-                        self._ds = ds
+        if self.pressure_levels:
+            for name in list(ds.dims):
+                if name == "isobaricInhPa":
+                    levels = self.pressure_levels
+                elif (
+                    str(name).startswith("isobaric")
+                    and ds[name].attrs.get("units") == "Pa"
+                ):
+                    levels = [level * 100 for level in self.pressure_levels]
+                else:
+                    continue
+                present = [level for level in levels if level in ds[name].values]
+                if len(present) < len(levels):
+                    logger.warning(
+                        f"Pressure levels {self.pressure_levels} not all found in "
+                        f"coordinate {name}"
+                    )
+                ds = ds.sel({name: present})
 
-                    return self._schema
+        if not ("latitude" in ds.dims and "longitude" in ds.dims):
+            return ds
+        if self.points:
+            # The nearest grid points may lie just outside a coarse grid's box
+            return self._select_points(ds)
+        if ncss:
+            return ds
 
-                except Exception as e:
-                    logger.warning(f"NetcdfSubset schema discovery failed: {e}")
-                    if self.access_method != "auto":
-                        raise
+        lat_index = np.arange(ds.sizes["latitude"])
+        lon_index = np.arange(ds.sizes["longitude"])
+        if self.bbox is not None:
+            west, south, east, north = self.bbox
+            lat = ds["latitude"].values
+            lat_index = np.flatnonzero((lat >= south) & (lat <= north))
+            lon_index = self._longitude_index(ds["longitude"].values, west, east)
+        return ds.isel(
+            latitude=lat_index[:: self.horiz_stride],
+            longitude=lon_index[:: self.horiz_stride],
+        )
 
-                    # Fall back to fileServer approach
-                    logger.info("Falling back to fileServer for schema discovery")
-                    url = url.replace("/ncss/grid/", "/fileServer/").split("?")[0]
+    def _cast_decoded(self, ds: xr.Dataset) -> xr.Dataset:
+        """Cast the floating point data variables of a decoded dataset to ``dtype``.
 
-            # GRIB2 fileServer approach
-            import os
-            import shutil
-            import tempfile
-            import urllib.request
+        This runs after ``_subset_decoded()`` and before ``.load()``: each
+        variable is read and converted on its own, so a partition is never
+        held in memory in its decoded type as a whole. Lazy (dask-backed)
+        variables are cast when they are computed.
+        """
+        if self.decode_dtype is None:
+            return ds
+        cast = {
+            name: var.astype(self.decode_dtype)
+            for name, var in ds.data_vars.items()
+            if var.dtype.kind == "f" and var.dtype != self.decode_dtype
+        }
+        return ds.assign(cast) if cast else ds
 
-            logger.info(f"Downloading file for schema: {url}")
+    @staticmethod
+    def _longitude_index(lon: np.ndarray, west: float, east: float) -> np.ndarray:
+        """Indices of the longitudes between ``west`` and ``east``, in order.
 
-            # Create a temporary directory for the download
-            temp_dir = tempfile.mkdtemp(prefix="gfs_intake_")
-            try:
-                # Download the file with a .grib2 extension
-                temp_file = os.path.join(temp_dir, "temp.grib2")
-                logger.info(f"Downloading to temporary file: {temp_file}")
+        The box is converted to the convention of the grid (0-360 or -180-180)
+        and may cross the grid's seam, in which case the indices wrap around.
+        """
+        if east - west >= 360:
+            return np.arange(lon.size)
+        origin = 0.0 if lon.max() > 180 else -180.0
+        west = (west - origin) % 360 + origin
+        east = (east - origin) % 360 + origin
+        if west <= east:
+            return np.flatnonzero((lon >= west) & (lon <= east))
+        return np.concatenate(
+            [np.flatnonzero(lon >= west), np.flatnonzero(lon <= east)]
+        )
 
-                # Download with a timeout
-                try:
-                    with (
-                        urllib.request.urlopen(url, timeout=30) as response,
-                        open(temp_file, "wb") as out_file,
-                    ):
-                        shutil.copyfileobj(response, out_file)
-                except Exception as e:
-                    raise IOError(f"Failed to download {url}: {e}")
+    def _get_schema(self) -> Schema:
+        """Get schema for the data source.
+
+        The schema is read from the first partition, fetched exactly as
+        ``read()`` would fetch it: NetcdfSubset, or in fileServer mode only the
+        GRIB messages matching the filter keys when an inventory is available.
+        The decoded partition goes into the in-memory partition cache (or is
+        kept by the source if that is disabled), so a following ``read()`` or
+        ``to_dask()`` does not download it again. Without an inventory or
+        filter keys, fileServer discovery therefore downloads the full GRIB2
+        file of the first lead time. A 'latest' cycle is only resolved when the partition is fetched, so a
+        schema cache hit does not touch the network.
+        """
+        if self._schema is not None:
+            return self._schema
 
-                # Check if the file was downloaded successfully
-                if not os.path.exists(temp_file) or os.path.getsize(temp_file) == 0:
-                    raise IOError(
-                        f"Downloaded file is empty or does not exist: {temp_file}"
-                    )
+        npartitions = len(self._select_partition_lead_times())
+        if not npartitions:
+            raise ValueError("No valid URLs found for the specified parameters")
 
-                logger.info(
-                    f"Successfully downloaded file, size: {os.path.getsize(temp_file)} bytes"
+        key = self._schema_cache_key()
+        if self.schema_cache is not None:
+            stored = self.schema_cache.get(key)
+            if stored is not None:
+                logger.info(f"Using cached schema: {self.schema_cache.path(key)}")
+                self._schema = Schema(
+                    datashape=None,
+                    shape=tuple(stored["shape"]) if stored["shape"] else None,
+                    dtype=stored["dtype"],
+                    npartitions=npartitions,
+                    extra_metadata=stored["extra_metadata"],
                 )
+                return self._schema
 
-                # Open the dataset with cfgrib
-                backend_kwargs = {
-                    "indexpath": "",
-                    "errors": "raise",  # Raise exceptions to see actual errors
-                    "filter_by_keys": self.cfgrib_filter_by_keys or {},
-                }
-
-                logger.info(f"Opening with cfgrib, filter_by_keys: {backend_kwargs}")
-
-                try:
-                    ds = xr.open_dataset(
-                        temp_file, engine="cfgrib", backend_kwargs=backend_kwargs
-                    )
-
-                    logger.info("GRIB schema discovery successful")
-                    logger.info(f"Variables: {list(ds.variables.keys())}")
-                    logger.info(f"Dimensions: {dict(ds.sizes)}")
-                    logger.info(f"Coordinates: {list(ds.coords.keys())}")
-
-                    # Convert to schema
-                    shape = {k: v for k, v in ds.sizes.items()}
-                    dtype = {k: str(v.dtype) for k, v in ds.variables.items()}
-
-                    self._schema = Schema(
-                        datashape=None,
-                        shape=tuple(shape.values()) if shape else None,
-                        dtype=dtype,
-                        npartitions=len(self._urls),
-                        extra_metadata={
-                            "variables": list(ds.data_vars.keys()),
-                            "coords": list(ds.coords.keys()),
-                            "dims": dict(ds.sizes),
-                            "access_method": "fileServer",
-                        },
-                    )
-
-                    # Store the dataset if it's small enough
-                    if sum(shape.values()) < 1e6:  # Arbitrary threshold
-                        self._ds = ds
+        try:
+            self._build_urls()
+            logger.info(f"Getting schema from: {self._urls[0]}")
+            ds = self._get_partition(0)
+            if not self.memory_cache:
+                self._schema_partition = ds
+            ds = self._standardize_variable_names(ds)
 
-                    return self._schema
+            logger.info("Schema discovery successful")
+            logger.info(f"Variables: {list(ds.variables.keys())}")
+            logger.info(f"Dimensions: {dict(ds.sizes)}")
+            logger.info(f"Coordinates: {list(ds.coords.keys())}")
 
-                except Exception as e:
-                    logger.error(f"Error opening GRIB file with cfgrib: {e}")
-                    logger.debug(f"Traceback: {traceback.format_exc()}")
-                    raise
+            # Convert to schema
+            shape = {k: v for k, v in ds.sizes.items()}
+            dtype = {k: str(v.dtype) for k, v in ds.variables.items()}
 
-            finally:
-                # Clean up the temporary directory
-                try:
-                    if os.path.exists(temp_dir):
-                        shutil.rmtree(temp_dir)
-                        logger.debug(f"Removed temporary directory: {temp_dir}")
-                except Exception as e:
-                    logger.warning(
-                        f"Could not remove temporary directory {temp_dir}: {e}"
-                    )
+            self._schema = Schema(
+                datashape=None,
+                shape=tuple(shape.values()) if shape else None,
+                dtype=dtype,
+                npartitions=len(self._urls),
+                extra_metadata={
+                    "variables": list(ds.data_vars.keys()),
+                    "coords": list(ds.coords.keys()),
+                    "dims": dict(ds.sizes),
+                    "access_method": ds.attrs.get("access_method"),
+                },
+            )
+            if self.schema_cache is not None:
+                self.schema_cache.put(
+                    key,
+                    {
+                        "shape": list(self._schema["shape"] or []),
+                        "dtype": dtype,
+                        "extra_metadata": self._schema["extra_metadata"],
+                    },
+                )
 
         except Exception as e:
             logger.error(f"Error getting schema: {e}")
@@ -467,9 +1330,8 @@ class GFSForecastSource(DataSource):
             self._schema = Schema(
                 datashape=None,
                 shape=None,
-                npartitions=(
-                    len(self._urls) if hasattr(self, "_urls") and self._urls else 0
-                ),
+                dtype=None,
+                npartitions=npartitions,
                 extra_metadata={
                     "error": str(e),
                     "urls": (
@@ -480,6 +1342,32 @@ class GFSForecastSource(DataSource):
 
         return self._schema
 
+    def _schema_cache_key(self) -> str:
+        """Key of this source's schema in the persistent schema cache.
+
+        Schemas do not depend on the cycle, so the key only covers the
+        settings that change the variables and dims of a partition.
+        """
+        settings = {
+            "access_method": self.access_method,
+            "cfgrib_filter_by_keys": self.cfgrib_filter_by_keys,
+            "ncss_params": self.ncss_params,
+            "bbox": self.bbox,
+            "horiz_stride": self.horiz_stride,
+            "pressure_levels": self.pressure_levels,
+            "variables": self.variables,
+            "points": self.points,
+            "stations": self.stations,
+            "dtype": self.decode_dtype,
+        }
+        if self.access_method == "ncss_collection":
+            # Partitions hold several lead times, so their size depends on these
+            settings["collection_path"] = self.collection_path
+            settings["lead_times"] = len(self._select_partition_lead_times()[0])
+        return cache.cache_key(
+            self.base_url, json.dumps(settings, sort_keys=True, default=str)
+        )
+
     def _get_partition(self, i: int) -> xr.Dataset:
         """Get one partition from the dataset.
 
@@ -500,6 +1388,19 @@ class GFSForecastSource(DataSource):
             raise IndexError(f"Partition {i} is out of range")
 
         url = self._urls[i]
+
+        if i == 0 and self._schema_partition is not None:
+            logger.info(f"Using partition 0 read by discover() for {url}")
+            ds, self._schema_partition = self._schema_partition, None
+            return ds
+
+        key = self._partition_cache_key(i)
+        if self.memory_cache:
+            ds = cache.partitions.get(key)
+            if ds is not None:
+                logger.info(f"Using in-memory cached partition {i} for {url}")
+                return ds
+
         logger.info(f"Reading data from {url}")
 
         # Check if this is a NetcdfSubset URL (contains ncss)
@@ -507,9 +1408,9 @@ class GFSForecastSource(DataSource):
 
         try:
             if is_ncss:
-                return self._read_ncss_data(url, i)
+                ds = self._read_ncss_data(url, i)
             else:
-                return self._read_grib_data(url, i)
+                ds = self._read_grib_data(url, i)
         except Exception as e:
             # Enhance error message with partition context
             error_msg = f"Failed to read partition {i} from {url}: {e}"
@@ -527,170 +1428,343 @@ class GFSForecastSource(DataSource):
 
             raise type(e)(error_msg) from e
 
-    def _read_ncss_data(self, url: str, partition_idx: int) -> xr.Dataset:
-        """Read data from NetcdfSubset service."""
-        try:
-            # Create a temporary file to download the NetCDF file
-            import os
-            import tempfile
-            import urllib.error
-            import urllib.request
-
-            logger.info(f"Downloading NetCDF data from NetcdfSubset: {url}")
+        if self.memory_cache:
+            cache.partitions.put(key, ds)
+        return ds
 
-            with tempfile.NamedTemporaryFile(suffix=".nc", delete=False) as tmp_file:
-                tmp_path = tmp_file.name
+    def _download_partition(self, i: int) -> str:
+        """Download the file of one partition without decoding it.
 
-            # Download the file with better error handling
-            logger.info(f"Downloading NetCDF file to temporary location: {tmp_path}")
+        The file is fetched exactly as ``_get_partition()`` would fetch it
+        (NetcdfSubset, or only the GRIB messages matching the filter keys when
+        an inventory is available), including the fallback to fileServer in
+        'auto' mode. Returns the local path, which should be handed to
+        ``_release_file()``.
+        """
+        if self._urls is None:
+            self._build_urls()
+        url = self._urls[i]
+        if "/ncss/" in url:
             try:
-                urllib.request.urlretrieve(url, tmp_path)
-            except urllib.error.HTTPError as e:
-                if e.code == 404:
-                    raise IOError(
-                        f"Data not found (HTTP 404): {url}. This forecast time may not be available yet or may have been archived."
-                    )
-                elif e.code == 400:
-                    raise IOError(
-                        f"Bad request (HTTP 400): {url}. Check variable names and query parameters."
-                    )
-                else:
-                    raise IOError(f"HTTP Error {e.code}: {e.reason} for URL: {url}")
-            except urllib.error.URLError as e:
-                raise IOError(f"Network error accessing {url}: {e.reason}")
-
-            # Check if file was downloaded successfully
-            if not os.path.exists(tmp_path) or os.path.getsize(tmp_path) == 0:
-                raise IOError(f"Failed to download NetCDF file from {url}")
-
-            logger.info(
-                "Successfully downloaded NetCDF file, size: %d bytes",
-                os.path.getsize(tmp_path),
-            )
-
-            # Open with xarray netcdf4 engine
-            ds = xr.open_dataset(tmp_path, engine="netcdf4")
-
-            logger.info(
-                f"Successfully opened NetCDF dataset with variables: {list(ds.variables.keys())}"
-            )
-            logger.info(f"Dataset dimensions: {dict(ds.sizes)}")
+                return self._download(url, suffix=".nc")
+            except Exception as e:
+                if self.access_method != "auto":
+                    raise
+                logger.warning(f"NetcdfSubset failed for partition {i}: {e}")
+                url = self._fileserver_url(url)
+        return self._fetch_grib_file(url)
 
-            # Add metadata
-            ds.attrs["source_url"] = url
-            ds.attrs["access_method"] = "ncss"
-            ds.attrs["partition_index"] = partition_idx
+    def _partition_cache_key(self, i: int) -> Tuple[str, ...]:
+        """Key identifying the decoded content of a partition.
 
-            # Load data into memory
-            logger.info("Loading NetCDF data into memory")
-            ds = ds.load()
+        Partitions are shared across sources through ``cache.partitions``, so
+        the key covers everything that changes the decoded dataset.
+        """
+        return (
+            self._urls[i],
+            self.access_method,
+            json.dumps(self.cfgrib_filter_by_keys, sort_keys=True, default=str),
+            json.dumps(self.ncss_params, sort_keys=True, default=str),
+            json.dumps(
+                [
+                    self.bbox,
+                    self.horiz_stride,
+                    self.pressure_levels,
+                    self.variables,
+                    self.points,
+                    self.decode_dtype,
+                ]
+            ),
+        )
 
-            # Clean up temporary file
+    def _read_ncss_data(self, url: str, partition_idx: int) -> xr.Dataset:
+        """Read data from NetcdfSubset service."""
+        try:
+            logger.info(f"Downloading NetCDF data from NetcdfSubset: {url}")
+            body = self._fetch(url, suffix=".nc")
             try:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                    logger.debug(f"Removed temporary file: {tmp_path}")
-            except Exception as e:
-                logger.warning(f"Could not remove temporary file {tmp_path}: {e}")
-
-            return ds
+                return self._open_ncss_file(body, url, partition_idx)
+            finally:
+                self._release_file(body)
 
         except Exception as e:
             logger.warning(f"NetcdfSubset failed for partition {partition_idx}: {e}")
             if self.access_method == "auto":
                 logger.info("Falling back to fileServer method")
                 # Convert to fileServer URL and try GRIB approach
-                fallback_url = url.replace("/ncss/grid/", "/fileServer/").split("?")[0]
+                fallback_url = self._fileserver_url(url)
                 return self._read_grib_data(fallback_url, partition_idx)
             else:
                 raise
 
-    def _read_grib_data(self, url: str, partition_idx: int) -> xr.Dataset:
-        """Read data from GRIB2 file using HTTP fileServer."""
-        try:
-            # Create a temporary file to download the GRIB file
-            import os
-            import tempfile
-            import urllib.request
-
-            with tempfile.NamedTemporaryFile(suffix=".grib2", delete=False) as tmp_file:
-                tmp_path = tmp_file.name
-
-            # Download the file
-            logger.info(f"Downloading GRIB file to temporary location: {tmp_path}")
-            urllib.request.urlretrieve(url, tmp_path)
-
-            # Check if file was downloaded successfully
-            if not os.path.exists(tmp_path) or os.path.getsize(tmp_path) == 0:
-                raise IOError(f"Failed to download file from {url}")
-
-            # Open with cfgrib engine and specified filters
-            logger.info(f"Opening GRIB file with cfgrib: {tmp_path}")
-            backend_kwargs = {
-                "indexpath": "",
-                "errors": "raise",  # Change to 'raise' to see actual errors
-                "filter_by_keys": self.cfgrib_filter_by_keys,
-            }
+    @staticmethod
+    def _fileserver_url(url: str) -> str:
+        """Convert a NetcdfSubset URL to the equivalent fileServer URL."""
+        return url.replace("/ncss/grid/", "/fileServer/").split("?")[0]
 
-            logger.info(f"Using backend kwargs: {backend_kwargs}")
-            logger.info("Filter by keys details:")
-            for key, value in self.cfgrib_filter_by_keys.items():
-                logger.info(f"  {key}: {value}")
+    @staticmethod
+    def _open_netcdf(
+        body: Union[bytes, str], chunks: Optional[Dict[str, int]] = None
+    ) -> xr.Dataset:
+        """Open a NetCDF file, or a NetCDF file held in memory, lazily.
 
-            # Try to open the dataset
-            try:
-                ds = xr.open_dataset(
-                    tmp_path, engine="cfgrib", backend_kwargs=backend_kwargs
-                )
+        ``chunks`` is passed to ``xr.open_dataset`` for files on disk, giving
+        dask-backed variables.
+        """
+        with _netcdf_open_lock:
+            if isinstance(body, str):
+                return xr.open_dataset(body, engine="netcdf4", chunks=chunks)
+            import netCDF4
+            from xarray.backends.netCDF4_ import NETCDF4_PYTHON_LOCK
+
+            # The netCDF-C/HDF5 libraries are not thread-safe, so use the lock
+            # xarray holds around its own netCDF4 calls
+            with NETCDF4_PYTHON_LOCK:
+                nc = netCDF4.Dataset("gfs_ncss.nc", mode="r", memory=body)
+            return xr.open_dataset(xr.backends.NetCDF4DataStore(nc))
+
+    def _open_ncss_file(
+        self, body: Union[bytes, str], url: str, partition_idx: int
+    ) -> xr.Dataset:
+        """Decode a NetcdfSubset response, in memory or on disk, into memory.
+
+        In lazy mode the cached file is opened with dask-backed variables and
+        nothing is loaded.
+        """
+        # Open with xarray netcdf4 engine
+        lazy = self.lazy and isinstance(body, str)
+        ds = self._open_netcdf(body, chunks={} if lazy else None)
 
-                # Check if we got any data
-                if not ds.variables:
-                    logger.warning(f"No variables found in the dataset from {url}")
-                else:
-                    logger.info(
-                        f"Successfully read dataset with variables: {list(ds.variables.keys())}"
+        logger.info(
+            f"Successfully opened NetCDF dataset with variables: {list(ds.variables.keys())}"
+        )
+        logger.info(f"Dataset dimensions: {dict(ds.sizes)}")
+
+        # Add metadata
+        ds.attrs["source_url"] = url
+        ds.attrs["access_method"] = "ncss"
+        ds.attrs["partition_index"] = partition_idx
+        ds = self._cast_decoded(self._subset_decoded(ds, ncss=True))
+        if lazy:
+            logger.info(f"Keeping NetCDF data lazily opened from {body}")
+            return ds
+
+        # Load data into memory so the downloaded file can be removed
+        logger.info("Loading NetCDF data into memory")
+        ds = ds.load()
+        ds.close()
+        return ds
+
+    def _get_grib_inventory(self, url: str) -> Optional[List[grib_index.GribMessage]]:
+        """Return the message inventory of a remote GRIB file, if available.
+
+        Inventories are looked up in the process-wide inventory cache first and
+        then read from the wgrib2-style ``.idx`` sidecar next to the file.
+        """
+        messages = grib_index.inventories.get(url)
+        if messages is not None:
+            return messages
+
+        idx_url = f"{url}.idx"
+        try:
+            idx_path = self._download(idx_url, suffix=".idx")
+        except IOError as e:
+            logger.debug(f"No GRIB inventory at {idx_url}: {e}")
+            return None
+        try:
+            with open(idx_path) as f:
+                messages = grib_index.parse_idx(f.read())
+        finally:
+            self._release_file(idx_path)
+
+        if messages:
+            grib_index.inventories.put(url, messages)
+        return messages or None
+
+    def _grib_download_filter(self, filter_by_keys: Dict[str, Any]) -> Dict[str, Any]:
+        """Narrow cfgrib filter keys to the messages that need downloading."""
+        filter_by_keys = dict(filter_by_keys)
+        if (
+            self.pressure_levels
+            and filter_by_keys.get("typeOfLevel") == "isobaricInhPa"
+            and "level" not in filter_by_keys
+        ):
+            # Only the requested pressure levels need to be downloaded
+            filter_by_keys["level"] = [
+                int(level) if level.is_integer() else level
+                for level in self.pressure_levels
+            ]
+        return filter_by_keys
+
+    def _download_grib_messages(
+        self, url: str, filter_sets: Optional[List[Dict[str, Any]]] = None
+    ) -> Optional[str]:
+        """Download only the GRIB messages matching the filter keys.
+
+        ``filter_sets`` defaults to the source's ``cfgrib_filter_by_keys``.
+        With several filter sets, the messages matching any of them are
+        downloaded into one file.
+
+        Returns the path of a local GRIB file holding the selected messages,
+        or None if the whole file has to be downloaded instead.
+        """
+        if filter_sets is None:
+            filter_sets = [self.cfgrib_filter_by_keys]
+        if not (self.use_grib_index and all(filter_sets)):
+            return None
+
+        messages = self._get_grib_inventory(url)
+        if messages is None:
+            return None
+
+        selected_by_offset = {}
+        for filter_by_keys in filter_sets:
+            selected = grib_index.select_messages(
+                messages, self._grib_download_filter(filter_by_keys)
+            )
+            if not selected:
+                if selected is not None:
+                    logger.warning(
+                        f"No messages in the inventory of {url} match "
+                        f"{filter_by_keys}, downloading the whole file"
                     )
+                return None
+            selected_by_offset.update((m.offset, m) for m in selected)
+        selected = list(selected_by_offset.values())
+
+        ranges = grib_index.byte_ranges(selected)
+        logger.info(
+            f"Downloading {len(selected)}/{len(messages)} GRIB messages "
+            f"in {len(ranges)} byte ranges from {url}"
+        )
 
-                # Log detailed information about dimensions and coordinates
-                logger.info(f"Dataset dimensions: {dict(ds.sizes)}")
-                if "time" in ds.coords:
-                    logger.info(f"Time values: {ds.time.values}")
-                if "step" in ds.coords:
-                    logger.info(f"Step values: {ds.step.values}")
-
-                # Add URL as an attribute for reference
-                ds.attrs["source_url"] = url
-                ds.attrs["access_method"] = "fileServer"
-                ds.attrs["partition_index"] = partition_idx
-                # Extract lead time from URL or filename
-                if ".f" in url and ".grib2" in url:
-                    lead_time_part = url.split(".f")[-1].split(".grib2")[0]
-                    ds.attrs["lead_time"] = f"f{lead_time_part}"
-
-                # Actually load all data into memory to avoid file access issues
-                logger.info(f"Loading data into memory from {tmp_path}")
-                ds = ds.load()
-
-                # Now we can safely delete the temporary file since data is loaded
+        try:
+            return self._download(url, suffix=".grib2", ranges=ranges)
+        except Exception as e:
+            logger.warning(f"Byte-range download failed for {url}: {e}")
+            return None
+
+    def _fetch_grib_file(
+        self, url: str, filter_sets: Optional[List[Dict[str, Any]]] = None
+    ) -> str:
+        """Return a local GRIB file holding the messages of the filter sets.
+
+        A cached copy of the whole file is used if available, then a byte-range
+        download of the matching messages and finally a full download.
+        """
+        # A cached copy of the whole file is served without any request
+        path = self._cached_download(url, ".grib2")
+        if path is None:
+            path = self._download_grib_messages(url, filter_sets)
+        if path is None:
+            path = self._download(url, suffix=".grib2")
+            if self.use_grib_index and grib_index.inventories.get(url) is None:
+                # Remember the message layout for later partial reads
                 try:
-                    if os.path.exists(tmp_path):
-                        os.unlink(tmp_path)
-                        logger.debug(f"Removed temporary file: {tmp_path}")
+                    grib_index.inventories.put(url, grib_index.scan_grib_file(path))
                 except Exception as e:
-                    logger.warning(f"Could not remove temporary file {tmp_path}: {e}")
+                    logger.warning(f"Could not build GRIB inventory for {url}: {e}")
+        return path
+
+    def _read_grib_data(self, url: str, partition_idx: int) -> xr.Dataset:
+        """Read data from GRIB2 file using HTTP fileServer."""
+        try:
+            tmp_path = self._fetch_grib_file(url)
+            try:
+                return self._open_grib_file(tmp_path, url, partition_idx)
+            finally:
+                # Safe to delete the downloaded file since data is loaded
+                self._release_file(tmp_path)
+
+        except Exception as e:
+            logger.error(f"Error reading data from {url}: {e}")
+            logger.debug(f"Traceback: {traceback.format_exc()}")
+            raise
+
+    def _open_grib_file(
+        self,
+        path: str,
+        url: str,
+        partition_idx: int,
+        filter_by_keys: Optional[Dict[str, Any]] = None,
+        indexpath: Optional[str] = None,
+    ) -> xr.Dataset:
+        """Decode a downloaded GRIB2 file into memory using cfgrib.
+
+        In lazy mode the file is opened with dask-backed variables and
+        nothing is loaded.
+
+        ``filter_by_keys`` defaults to the source's ``cfgrib_filter_by_keys``
+        and ``indexpath`` to the result of ``_grib_indexpath()``. Several
+        filter sets can be decoded from one file with a shared ``indexpath``,
+        in which case the file is only scanned once.
+        """
+        if filter_by_keys is None:
+            filter_by_keys = self.cfgrib_filter_by_keys
+        if indexpath is None:
+            indexpath = self._grib_indexpath(path)
+
+        # Open with cfgrib engine and specified filters
+        logger.info(f"Opening GRIB file with cfgrib: {path}")
+        backend_kwargs = {
+            "indexpath": indexpath,
+            "errors": "raise",  # Change to 'raise' to see actual errors
+            "filter_by_keys": filter_by_keys,
+        }
 
+        logger.info(f"Using backend kwargs: {backend_kwargs}")
+        logger.info("Filter by keys details:")
+        for key, value in filter_by_keys.items():
+            logger.info(f"  {key}: {value}")
+
+        try:
+            if self.decode_processes:
+                logger.info(f"Decoding in a pool of {self.decode_processes} processes")
+                ds = decode.decode_grib_in_pool(
+                    self.decode_processes, path, backend_kwargs
+                )
+            else:
+                ds = xr.open_dataset(
+                    path,
+                    engine="cfgrib",
+                    backend_kwargs=backend_kwargs,
+                    chunks={} if self.lazy else None,
+                )
+
+            # Check if we got any data
+            if not ds.variables:
+                logger.warning(f"No variables found in the dataset from {url}")
+            else:
+                logger.info(
+                    f"Successfully read dataset with variables: {list(ds.variables.keys())}"
+                )
+
+            # Log detailed information about dimensions and coordinates
+            logger.info(f"Dataset dimensions: {dict(ds.sizes)}")
+            if "time" in ds.coords:
+                logger.info(f"Time values: {ds.time.values}")
+            if "step" in ds.coords:
+                logger.info(f"Step values: {ds.step.values}")
+
+            # Add URL as an attribute for reference
+            ds.attrs["source_url"] = url
+            ds.attrs["access_method"] = "fileServer"
+            ds.attrs["partition_index"] = partition_idx
+            # Extract lead time from URL or filename
+            if ".f" in url and ".grib2" in url:
+                lead_time_part = url.split(".f")[-1].split(".grib2")[0]
+                ds.attrs["lead_time"] = f"f{lead_time_part}"
+            ds = self._cast_decoded(self._subset_decoded(ds))
+            if self.lazy:
+                logger.info(f"Keeping GRIB data lazily opened from {path}")
                 return ds
 
-            except Exception as e:
-                logger.error(f"Error opening dataset with cfgrib: {e}")
-                logger.debug(f"Traceback: {traceback.format_exc()}")
-                # Clean up in case of error
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
-                raise
+            # Actually load all data into memory to avoid file access issues
+            logger.info(f"Loading data into memory from {path}")
+            return ds.load()
 
         except Exception as e:
-            logger.error(f"Error reading data from {url}: {e}")
+            logger.error(f"Error opening dataset with cfgrib: {e}")
             logger.debug(f"Traceback: {traceback.format_exc()}")
             raise
 
@@ -700,6 +1774,8 @@ class GFSForecastSource(DataSource):
         This method renames NetCDF variables from NetcdfSubset to match
         the expected GRIB variable names for consistency across access methods.
         It also standardizes time coordinate names to fix alignment issues.
+        The renames are worked out once per partition layout by
+        ``_standardization_plan()`` and applied in a single ``rename()`` call.
 
         Parameters
         ----------
@@ -711,98 +1787,268 @@ class GFSForecastSource(DataSource):
         xr.Dataset
             Dataset with standardized variable names and coordinates
         """
-        # Mapping from NetCDF names (NetcdfSubset) to GRIB-style names
-        name_mapping = {
-            "Temperature_height_above_ground": "t2m",  # 2m temperature
-            "u-component_of_wind_height_above_ground": "u10",  # 10m u-wind
-            "v-component_of_wind_height_above_ground": "v10",  # 10m v-wind
-            "Pressure_reduced_to_MSL_msl": "msl",  # Mean sea level pressure
-            "Surface_pressure_surface": "sp",  # Surface pressure
-            "Relative_humidity_height_above_ground": "r2",  # 2m relative humidity
-            "Specific_humidity_height_above_ground": "q2",  # 2m specific humidity
-            "Dewpoint_temperature_height_above_ground": "d2m",  # 2m dewpoint
-            "Total_precipitation_surface": "tp",  # Total precipitation
-            "Convective_precipitation_surface": "cp",  # Convective precipitation
-            "Snowfall_rate_water_equivalent_surface": "sf",  # Snowfall
-            "Geopotential_height_isobaric": "gh",  # Geopotential height
-            "Temperature_isobaric": "t",  # Temperature on pressure levels
-            "u-component_of_wind_isobaric": "u",  # U-wind on pressure levels
-            "v-component_of_wind_isobaric": "v",  # V-wind on pressure levels
-            "Relative_humidity_isobaric": "r",  # Relative humidity on pressure levels
-            "Ice_cover_surface": "ci",  # Sea ice concentration
-        }
+        key = (tuple(ds.data_vars), tuple(ds.coords))
+        plan = self._standardize_plans.get(key)
+        if plan is None:
+            plan = self._standardize_plans[key] = self._standardization_plan(ds)
+        renames, drop, inject_reftime, renamed_vars = plan
+
+        # One new Dataset per partition; later changes are made to it in place
+        ds_renamed = ds.rename(renames) if renames else ds.copy(deep=False)
+        if drop:
+            ds_renamed = ds_renamed.drop_vars(drop)
+
+        if inject_reftime:
+            # Inject 'reftime' as a scalar coordinate using model initialization
+            # time from the attributes, falling back to now
+            reftime_value = None
+            if "cycle" in ds_renamed.attrs:
+                try:
+                    reftime_value = np.datetime64(ds_renamed.attrs["cycle"])
+                except Exception:
+                    pass
+            if reftime_value is None:
+                # Fallback: use now (not ideal, but better than missing)
+                reftime_value = np.datetime64(datetime.now(timezone.utc))
+            ds_renamed.coords["reftime"] = ((), reftime_value)
 
-        # Create a copy to avoid modifying the original
-        ds_renamed = ds.copy()
+        if renamed_vars:
+            # Add metadata about the renaming (convert dict to string for NetCDF
+            # compatibility); a new dict, since rename() shares the attrs of ds
+            ds_renamed.attrs = {
+                **ds_renamed.attrs,
+                "variable_name_standardization": str(renamed_vars),
+            }
 
-        # Track which variables were renamed
-        renamed_vars = {}
+        return ds_renamed
 
-        # Rename data variables
-        for netcdf_name, grib_name in name_mapping.items():
-            if netcdf_name in ds_renamed.data_vars:
-                logger.debug(f"Renaming variable: {netcdf_name} → {grib_name}")
-                ds_renamed = ds_renamed.rename({netcdf_name: grib_name})
-                renamed_vars[netcdf_name] = grib_name
+    @staticmethod
+    def _standardization_plan(
+        ds: xr.Dataset,
+    ) -> Tuple[Dict[str, str], List[str], bool, Dict[str, str]]:
+        """Work out how to standardize partitions laid out like ``ds``.
+
+        Returns
+        -------
+        tuple
+            The renames to apply in one ``rename()`` call, the coordinates to
+            drop, whether a ``reftime`` coordinate has to be injected and the
+            renamed data variables.
+        """
+        renames = {}
+
+        # Rename data variables from NetCDF names (NetcdfSubset) to GRIB-style names
+        renamed_vars = {
+            netcdf_name: grib_name
+            for netcdf_name, grib_name in NCSS_VARIABLE_NAMES.items()
+            if netcdf_name in ds.data_vars
+        }
+        renames.update(renamed_vars)
 
         # Standardize time coordinate names for consistency across partitions
         # NetcdfSubset sometimes returns 'time', 'time1', 'time2', etc.
-        time_coords_to_rename = {}
-        for coord_name in ds_renamed.coords:
-            if (
-                isinstance(coord_name, str)
-                and coord_name.startswith("time")
-                and coord_name != "time"
-            ):
-                time_coords_to_rename[coord_name] = "time"
-                logger.debug(f"Renaming time coordinate: {coord_name} → time")
-
-        if time_coords_to_rename:
-            ds_renamed = ds_renamed.rename(time_coords_to_rename)
-            logger.info(f"Standardized time coordinates: {time_coords_to_rename}")
+        time_coords_to_rename = {
+            coord_name: "time"
+            for coord_name in ds.coords
+            if isinstance(coord_name, str)
+            and coord_name.startswith("time")
+            and coord_name != "time"
+        }
+        renames.update(time_coords_to_rename)
 
         # --- Standardize reftime coordinate ---
         # 1. If 'reftime2' exists and 'reftime' does not, rename 'reftime2' to 'reftime'
         # 2. If both exist, drop 'reftime2' and keep 'reftime'
         # 3. If neither exist, inject 'reftime' as a scalar coordinate (model init time)
-        reftime_in_coords = "reftime" in ds_renamed.coords
-        reftime2_in_coords = "reftime2" in ds_renamed.coords
-
+        drop = []
+        reftime_in_coords = "reftime" in ds.coords
+        reftime2_in_coords = "reftime2" in ds.coords
         if reftime2_in_coords and not reftime_in_coords:
-            logger.debug("Renaming 'reftime2' coordinate to 'reftime'")
-            ds_renamed = ds_renamed.rename({"reftime2": "reftime"})
+            renames["reftime2"] = "reftime"
         elif reftime2_in_coords and reftime_in_coords:
-            logger.debug("Dropping duplicate 'reftime2' coordinate, keeping 'reftime'")
-            ds_renamed = ds_renamed.drop_vars("reftime2")
-        elif not reftime_in_coords and not reftime2_in_coords:
-            # Inject 'reftime' as a scalar coordinate using model initialization time
-            # Try to get from attributes, fallback to now
-            from datetime import datetime, timezone
-
-            import numpy as np
-
-            reftime_value = None
-            # Try to get from attrs
-            if "cycle" in ds_renamed.attrs:
-                try:
-                    reftime_value = np.datetime64(ds_renamed.attrs["cycle"])
-                except Exception:
-                    pass
-            if reftime_value is None:
-                # Fallback: use now (not ideal, but better than missing)
-                reftime_value = np.datetime64(datetime.now(timezone.utc))
-            logger.debug(f"Injecting missing 'reftime' coordinate: {reftime_value}")
-            ds_renamed = ds_renamed.assign_coords(reftime=((), reftime_value))
+            drop.append("reftime2")
+        inject_reftime = not reftime_in_coords and not reftime2_in_coords
 
-        # Log standardization results
+        # Log standardization plan
         if renamed_vars:
             logger.info(
-                f"Standardized {len(renamed_vars)} variable names: {renamed_vars}"
+                f"Standardizing {len(renamed_vars)} variable names: {renamed_vars}"
             )
-            # Add metadata about the renaming (convert dict to string for NetCDF compatibility)
-            ds_renamed.attrs["variable_name_standardization"] = str(renamed_vars)
+        if time_coords_to_rename:
+            logger.info(f"Standardizing time coordinates: {time_coords_to_rename}")
+        logger.debug(
+            f"Standardization plan: renames={renames}, drop={drop}, "
+            f"inject_reftime={inject_reftime}"
+        )
+        return renames, drop, inject_reftime, renamed_vars
 
-        return ds_renamed
+    def _load_partition(self, i: int) -> Optional[xr.Dataset]:
+        """Read and standardize one partition, returning None if it fails.
+
+        Failures are logged rather than raised so that a missing lead time does
+        not abort reading the remaining partitions.
+        """
+        try:
+            if self._urls is None:
+                self._build_urls()
+            n = len(self._urls)
+            logger.info(f"Reading partition {i+1}/{n} from {self._urls[i]}")
+            ds = self._get_partition(i)
+            if ds is not None and len(ds.variables) > 0:
+                logger.info(
+                    f"Successfully read partition {i+1} with variables: {list(ds.variables.keys())}"
+                )
+                # Standardize variable names for consistency
+                return self._standardize_variable_names(ds)
+            logger.warning(f"No data in partition {i+1}")
+        except Exception as e:
+            logger.error(f"Error reading partition {i+1}: {e}")
+            logger.debug(f"Traceback: {traceback.format_exc()}")
+        return None
+
+    def _read_partitions(
+        self, indices: Optional[List[int]] = None
+    ) -> List[Tuple[int, xr.Dataset]]:
+        """Read several partitions using a bounded thread pool.
+
+        Parameters
+        ----------
+        indices : list of int, optional
+            Partition indices to read. Defaults to all partitions.
+
+        Returns
+        -------
+        list of (int, xarray.Dataset)
+            Successfully read partitions, ordered by partition index (and
+            therefore by lead time). Failed partitions are skipped.
+        """
+        return sorted(self._iter_partitions(indices), key=lambda result: result[0])
+
+    def _iter_partitions(
+        self, indices: Optional[List[int]] = None
+    ) -> Iterator[Tuple[int, xr.Dataset]]:
+        """Read several partitions using a bounded thread pool.
+
+        Successfully read partitions are yielded with their index as soon as
+        they are decoded, in completion order. Failed partitions are skipped.
+        """
+        if self._urls is None:
+            self._build_urls()
+
+        if indices is None:
+            indices = list(range(len(self._urls)))
+
+        workers = min(self.max_workers, len(indices))
+        if workers <= 1:
+            for i in indices:
+                ds = self._load_partition(i)
+                if ds is not None:
+                    yield i, ds
+            return
+
+        logger.info(f"Fetching {len(indices)} partitions with {workers} workers")
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="gfs_partition"
+        ) as executor:
+            futures = {executor.submit(self._load_partition, i): i for i in indices}
+            for future in as_completed(futures):
+                # Drop the future so the partition is released once consumed
+                i = futures.pop(future)
+                ds = future.result()
+                if ds is not None:
+                    yield i, ds
+
+    def _combine_partitions(self, datasets: List[xr.Dataset]) -> xr.Dataset:
+        """Combine standardized partitions into a single dataset.
+
+        Partitions are concatenated along ``time`` if it is a dimension, or
+        along a new ``step`` dimension for GRIB partitions with a scalar step.
+        Auxiliary NetcdfSubset coordinates are dropped from the result.
+        """
+        logger.info(f"Combining {len(datasets)} partitions...")
+        # Combine datasets along the time dimension if it exists
+        try:
+            if len(datasets) > 1:
+                if "time" in datasets[0].dims:
+                    logger.info("Concatenating datasets along time dimension")
+                    combined = xr.concat(datasets, dim="time")
+                elif "step" in datasets[0].coords:
+                    # If no time dimension but step coordinate exists, try to create a new dimension
+                    logger.info("Trying to combine datasets along step coordinate")
+                    try:
+                        # Log each dataset's step value for debugging
+                        for i, ds in enumerate(datasets):
+                            logger.info(f"Dataset {i} step value: {ds.step.values}")
+
+                        # Create a new dataset that includes step as a dimension
+                        # First, ensure the step coordinate values are all different
+                        step_values = [ds.step.values.item() for ds in datasets]
+                        if len(set(step_values)) != len(step_values):
+                            logger.warning(
+                                "Duplicate step values found, cannot combine"
+                            )
+                            combined = datasets[0]
+                        else:
+                            # Convert step from coordinate to dimension
+                            new_datasets = []
+                            for ds in datasets:
+                                # Expand step from scalar coordinate to 1-element dimension
+                                ds = ds.expand_dims("step")
+                                new_datasets.append(ds)
+
+                            # Now concat these datasets along the step dimension
+                            combined = xr.concat(new_datasets, dim="step")
+                            logger.info(
+                                f"Successfully combined datasets along step dimension: {combined.step.values}"
+                            )
+                            combined = combined
+                    except Exception as e:
+                        logger.error(f"Error combining along step: {e}")
+                        logger.debug(f"Traceback: {traceback.format_exc()}")
+                        logger.info(
+                            "Using only the first dataset due to combination error"
+                        )
+                        combined = datasets[0]
+                else:
+                    logger.info(
+                        "Using single dataset (no time or step concatenation possible)"
+                    )
+                    combined = datasets[0]
+            else:
+                logger.info("Using single dataset (only one available)")
+                combined = datasets[0]
+
+            # Log some basic info about the combined dataset
+            if hasattr(combined, "variables") and combined.variables:
+                logger.info(
+                    f"Combined dataset has {len(combined.variables)} " f"variables"
+                )
+                logger.info(f"Dataset dimensions: {dict(combined.sizes)}")
+
+                # Log time range if time dimension exists
+                if (
+                    "time" in combined.sizes
+                    and hasattr(combined, "time")
+                    and len(combined.time) > 0
+                ):
+                    logger.info(
+                        f"Time range: {combined.time.values.min()} to {combined.time.values.max()}"
+                    )
+
+            combined = combined.squeeze()
+            combined = combined.drop("height_above_ground4", errors="ignore")
+            combined = combined.drop("reftime", errors="ignore")
+            combined = combined.drop("reftime2", errors="ignore")
+            return combined
+
+        except Exception as e:
+            logger.error(f"Error combining datasets: {e}")
+            logger.debug(f"Traceback: {traceback.format_exc()}")
+            # Return the first dataset if concatenation fails
+            if datasets:
+                logger.info("Returning first dataset due to concatenation error")
+                return datasets[0]
+            return xr.Dataset()
 
     def read(self) -> xr.Dataset:
         """Load entire dataset into memory and return as xarray.Dataset"""
@@ -817,137 +2063,763 @@ class GFSForecastSource(DataSource):
             return xr.Dataset()
 
         try:
-            logger.info(f"Reading {len(self._urls)} partitions...")
-            # Read all partitions and combine
-            datasets = []
-            for i, url in enumerate(self._urls):
-                try:
-                    logger.info(f"Reading partition {i+1}/{len(self._urls)} from {url}")
-                    ds = self._get_partition(i)
-                    if ds is not None and len(ds.variables) > 0:
-                        logger.info(
-                            f"Successfully read partition {i+1} with variables: {list(ds.variables.keys())}"
-                        )
-                        # Standardize variable names for consistency
-                        ds = self._standardize_variable_names(ds)
-                        datasets.append(ds)
-                    else:
-                        logger.warning(f"No data in partition {i+1}")
-                except Exception as e:
-                    logger.error(f"Error reading partition {i+1}: {e}")
-                    logger.debug(f"Traceback: {traceback.format_exc()}")
-                    # Continue with other partitions even if one fails
-                    continue
+            logger.info(
+                f"Reading {len(self._urls)} partitions "
+                f"(max_workers={self.max_workers})..."
+            )
+            # Read all partitions (concurrently if enabled), copying each into
+            # preallocated arrays as soon as it is decoded. Lazy partitions
+            # are concatenated without computing their values.
+            assembler, leftovers = None, []
+            for i, ds in self._iter_partitions():
+                if assembler is None and not leftovers and not self.lazy:
+                    try:
+                        assembler = assemble.PartitionAssembler(ds, len(self._urls))
+                    except ValueError as e:
+                        logger.info(f"{e}, concatenating partitions instead")
+                if assembler is None or not assembler.add(i, ds):
+                    leftovers.append((i, ds))
 
-            if not datasets:
+            if assembler is None and not leftovers:
                 logger.warning("No data was read from any partition")
                 return xr.Dataset()
 
-            logger.info(f"Combining {len(datasets)} partitions...")
-            # Combine datasets along the time dimension if it exists
-            try:
-                if len(datasets) > 1:
-                    if "time" in datasets[0].dims:
-                        logger.info("Concatenating datasets along time dimension")
-                        self._ds = xr.concat(datasets, dim="time")
-                    elif "step" in datasets[0].coords:
-                        # If no time dimension but step coordinate exists, try to create a new dimension
-                        logger.info("Trying to combine datasets along step coordinate")
-                        try:
-                            # Log each dataset's step value for debugging
-                            for i, ds in enumerate(datasets):
-                                logger.info(f"Dataset {i} step value: {ds.step.values}")
-
-                            # Create a new dataset that includes step as a dimension
-                            # First, ensure the step coordinate values are all different
-                            step_values = [ds.step.values.item() for ds in datasets]
-                            if len(set(step_values)) != len(step_values):
-                                logger.warning(
-                                    "Duplicate step values found, cannot combine"
-                                )
-                                self._ds = datasets[0]
-                            else:
-                                # Convert step from coordinate to dimension
-                                new_datasets = []
-                                for ds in datasets:
-                                    # Expand step from scalar coordinate to 1-element dimension
-                                    ds = ds.expand_dims("step")
-                                    new_datasets.append(ds)
-
-                                # Now concat these datasets along the step dimension
-                                combined = xr.concat(new_datasets, dim="step")
-                                logger.info(
-                                    f"Successfully combined datasets along step dimension: {combined.step.values}"
-                                )
-                                self._ds = combined
-                        except Exception as e:
-                            logger.error(f"Error combining along step: {e}")
-                            logger.debug(f"Traceback: {traceback.format_exc()}")
-                            logger.info(
-                                "Using only the first dataset due to combination error"
-                            )
-                            self._ds = datasets[0]
-                    else:
-                        logger.info(
-                            "Using single dataset (no time or step concatenation possible)"
-                        )
-                        self._ds = datasets[0]
+            if not leftovers:
+                logger.info(f"Assembled {len(assembler.filled)} partitions")
+                self._assembler = assembler
+                self._ds = self._assembled()
+            else:
+                if self.lazy:
+                    logger.info(f"Concatenating {len(leftovers)} lazy partitions")
                 else:
-                    logger.info("Using single dataset (only one available)")
-                    self._ds = datasets[0]
+                    logger.info(f"{len(leftovers)} partitions differ, concatenating")
+                if assembler is not None:
+                    leftovers.extend(assembler.partitions())
+                leftovers.sort(key=lambda result: result[0])
+                self._ds = self._combine_partitions([ds for _, ds in leftovers])
+            # A single partition may still share arrays with the cache
+            self._ds = cache.writeable(self._ds)
+            self._loaded = {i for i, _ in leftovers}
+            if assembler is not None:
+                self._loaded |= assembler.filled
+            return self._ds
 
-                # Log some basic info about the combined dataset
-                if hasattr(self._ds, "variables") and self._ds.variables:
-                    logger.info(
-                        f"Combined dataset has {len(self._ds.variables)} " f"variables"
-                    )
-                    logger.info(f"Dataset dimensions: {dict(self._ds.sizes)}")
-
-                    # Log time range if time dimension exists
-                    if (
-                        "time" in self._ds.sizes
-                        and hasattr(self._ds, "time")
-                        and len(self._ds.time) > 0
-                    ):
-                        logger.info(
-                            f"Time range: {self._ds.time.values.min()} to {self._ds.time.values.max()}"
+        except Exception as e:
+            logger.error(f"Error reading dataset: {e}")
+            logger.debug(f"Traceback: {traceback.format_exc()}")
+            raise
+
+    def _assembled(self) -> xr.Dataset:
+        """The dataset of the partitions held by ``self._assembler``."""
+        return (
+            self._assembler.result()
+            .squeeze()
+            .drop_vars(["height_above_ground4", "reftime", "reftime2"], errors="ignore")
+        )
+
+    def refresh(self) -> xr.Dataset:
+        """Read the partitions that are not loaded yet and append them.
+
+        Only lead times missing from the dataset returned by ``read()`` or an
+        earlier ``refresh()`` are requested, so polling a cycle while it is
+        being published only downloads the newly available files. New
+        partitions are appended to the loaded dataset along ``time`` (or
+        ``step``) in lead time order. They are copied into the arrays
+        preallocated by ``read()`` or the first ``refresh()``, so each call
+        only copies the new lead times.
+
+        Returns
+        -------
+        xarray.Dataset
+            The dataset with every partition available so far.
+        """
+        if self._urls is None:
+            self._build_urls()
+
+        missing = [i for i in range(len(self._urls)) if i not in self._loaded]
+        if missing:
+            logger.info(f"Checking {len(missing)} partitions not loaded yet")
+            results = self._read_partitions(missing)
+            if results:
+                logger.info(f"Appending {len(results)} new partitions")
+                if self._ds is None and not self.lazy:
+                    try:
+                        self._assembler = assemble.PartitionAssembler(
+                            results[0][1], len(self._urls)
                         )
+                    except ValueError as e:
+                        logger.info(f"{e}, concatenating partitions instead")
+                leftovers = [
+                    (i, ds)
+                    for i, ds in results
+                    if self._assembler is None or not self._assembler.add(i, ds)
+                ]
+                if self._assembler is not None:
+                    self._ds = self._assembled()
+                if leftovers:
+                    # Partitions of another layout are concatenated instead
+                    self._assembler = None
+                    new = self._combine_partitions([ds for _, ds in leftovers])
+                    self._ds = (
+                        new
+                        if self._ds is None
+                        else self._append_partitions(self._ds, new)
+                    )
+                self._ds = cache.writeable(self._ds)
+                self._loaded.update(i for i, _ in results)
+            else:
+                logger.info("No new partitions available")
+
+        return self._ds if self._ds is not None else xr.Dataset()
+
+    @staticmethod
+    def _append_partitions(ds: xr.Dataset, new: xr.Dataset) -> xr.Dataset:
+        """Append combined partitions to a combined dataset.
+
+        Both datasets come from ``_combine_partitions()``, which squeezes the
+        concatenation dimension of a single partition, so it is restored
+        before concatenating.
+        """
+        # GRIB partitions are stacked along step, NetcdfSubset ones along time
+        dim = "step" if "step" in ds.coords and "time" not in ds.dims else "time"
+        parts = [d if dim in d.dims else d.expand_dims(dim) for d in (ds, new)]
+        return xr.concat(parts, dim=dim).sortby(dim)
+
+    def follow(
+        self, poll_interval: float = 600, timeout: Optional[float] = None
+    ) -> Iterator[xr.Dataset]:
+        """Poll for newly published lead times until the cycle is complete.
+
+        Calls ``refresh()`` every ``poll_interval`` seconds and yields the
+        dataset whenever new lead times were added. Stops once every selected
+        lead time is loaded, or after ``timeout`` seconds.
+
+        Parameters
+        ----------
+        poll_interval : float, optional
+            Seconds between polls. Default: 600
+        timeout : float, optional
+            Stop polling after this many seconds. Default: no limit
 
-                self._ds = self._ds.squeeze()
-                self._ds = self._ds.drop("height_above_ground4", errors="ignore")
-                self._ds = self._ds.drop("reftime", errors="ignore")
-                self._ds = self._ds.drop("reftime2", errors="ignore")
-                return self._ds
+        Yields
+        ------
+        xarray.Dataset
+            The dataset with every partition available so far.
+        """
+        if self._urls is None:
+            self._build_urls()
+        deadline = None if timeout is None else monotonic() + timeout
+
+        while True:
+            n_loaded = len(self._loaded)
+            ds = self.refresh()
+            if len(self._loaded) > n_loaded:
+                yield ds
+            if len(self._loaded) == len(self._urls):
+                logger.info("All partitions loaded, stopping")
+                return
+            if deadline is not None and monotonic() + poll_interval > deadline:
+                logger.info(
+                    f"Stopping after timeout with {len(self._loaded)}/"
+                    f"{len(self._urls)} partitions loaded"
+                )
+                return
+            logger.info(
+                f"{len(self._loaded)}/{len(self._urls)} partitions loaded, "
+                f"polling again in {poll_interval} s"
+            )
+            sleep(poll_interval)
+
+    def partition_index(self, lead_time: int) -> int:
+        """Return the index of the partition holding a forecast lead time.
+
+        Parameters
+        ----------
+        lead_time : int
+            Forecast lead time in hours.
+
+        Raises
+        ------
+        KeyError
+            If the lead time is not read by this source.
+        """
+        self._build_urls()
+        lead_time = int(lead_time)
+        for i, lead_times in enumerate(self._partition_lead_times):
+            if lead_time in lead_times:
+                return i
+        raise KeyError(
+            f"Lead time {lead_time} is not one of the lead times of this "
+            f"source: {self._lead_times}"
+        )
+
+    def read_lead_time(self, lead_time: int) -> xr.Dataset:
+        """Read the data of a single forecast lead time.
+
+        Only the file (or in 'ncss_collection' mode the batch) holding the lead
+        time is fetched. The partition is standardized like the partitions
+        combined by ``read()``.
+
+        Parameters
+        ----------
+        lead_time : int
+            Forecast lead time in hours, e.g. 24 for the f024 file.
 
+        Returns
+        -------
+        xarray.Dataset
+            The dataset for the lead time.
+        """
+        i = self.partition_index(lead_time)
+        logger.info(f"Reading lead time f{int(lead_time):03d} from partition {i}")
+        ds = self._standardize_variable_names(self._get_partition(i))
+        if self.access_method == "ncss_collection" and "time" in ds.dims:
+            # Collection partitions hold a batch of lead times
+            valid_time = np.datetime64(self.metadata["cycle"]) + np.timedelta64(
+                int(lead_time), "h"
+            )
+            ds = ds.sel(time=[valid_time.astype(ds.time.dtype)])
+        return cache.writeable(ds)
+
+    def __getstate__(self):
+        """Pickle the init arguments together with the resolved URLs and cycle.
+
+        intake restores a source by calling ``__init__`` again with its
+        original arguments, which would leave the URLs unbuilt and resolve a
+        'latest' cycle anew, possibly to a different cycle. Sources pickled
+        into the tasks of ``to_dask()`` must read the same files, so this
+        state is added. Nothing that has been read is pickled.
+        """
+        state = super().__getstate__()
+        state["resolved"] = {
+            "date": self.date,
+            "model_run_time": self.model_run_time,
+            "latest": self._latest,
+            "urls": self._urls,
+            "lead_times": self._lead_times,
+            "partition_lead_times": self._partition_lead_times,
+            "memory_cache": self.memory_cache,
+            "metadata": dict(self.metadata),
+        }
+        return state
+
+    def __setstate__(self, state):
+        resolved = state.pop("resolved", None)
+        super().__setstate__(state)
+        if resolved is not None:
+            self.date = resolved["date"]
+            self.model_run_time = resolved["model_run_time"]
+            self._latest = resolved["latest"]
+            self._urls = resolved["urls"]
+            self._lead_times = resolved["lead_times"]
+            self._partition_lead_times = resolved["partition_lead_times"]
+            self.memory_cache = resolved["memory_cache"]
+            self.metadata = resolved["metadata"]
+
+    def _copy(self) -> "GFSForecastSource":
+        """Return a copy of this source sharing its URLs and resolved cycle.
+
+        The URLs and the resolved cycle are part of the pickled state, which
+        ``copy.copy()`` goes through. Nothing that has been read is copied.
+        """
+        return copy.copy(self)
+
+    def _with_filter(self, filter_by_keys: Dict[str, Any]) -> "GFSForecastSource":
+        """Return a copy of this source decoding a different filter set."""
+        source = self._copy()
+        source.cfgrib_filter_by_keys = dict(filter_by_keys)
+        source.metadata["cfgrib_filter_by_keys"] = filter_by_keys
+        return source
+
+    def _load_partition_many(
+        self, i: int, sources: Dict[str, "GFSForecastSource"]
+    ) -> Dict[str, xr.Dataset]:
+        """Decode one GRIB2 partition for several sources from one download.
+
+        Partitions found in the in-memory cache are reused; the others are
+        decoded from a single file holding the messages of all their filter
+        sets. Failures are logged and the affected names left out.
+        """
+        url = self._urls[i]
+        results = {}
+        pending = {}
+        for name, source in sources.items():
+            ds = None
+            if source.memory_cache:
+                ds = cache.partitions.get(source._partition_cache_key(i))
+            if ds is not None:
+                logger.info(f"Using in-memory cached partition {i} of {name}")
+                results[name] = ds
+            else:
+                pending[name] = source
+
+        if pending:
+            try:
+                path = self._fetch_grib_file(
+                    url, [s.cfgrib_filter_by_keys for s in pending.values()]
+                )
             except Exception as e:
-                logger.error(f"Error combining datasets: {e}")
-                logger.debug(f"Traceback: {traceback.format_exc()}")
-                # Return the first dataset if concatenation fails
-                if datasets:
-                    logger.info("Returning first dataset due to concatenation error")
-                    return datasets[0]
-                return xr.Dataset()
+                logger.error(f"Error reading partition {i+1} from {url}: {e}")
+                pending = {}
+            else:
+                # Share one cfgrib index between the filter sets so that a
+                # temporary file is only scanned once; it is removed with it
+                indexpath = self._grib_indexpath(path) or path + ".{short_hash}.idx"
+                try:
+                    for name, source in pending.items():
+                        try:
+                            ds = source._open_grib_file(
+                                path, url, i, indexpath=indexpath
+                            )
+                        except Exception as e:
+                            logger.error(f"Error decoding {name} from {url}: {e}")
+                            continue
+                        if source.memory_cache:
+                            cache.partitions.put(source._partition_cache_key(i), ds)
+                        results[name] = ds
+                finally:
+                    self._release_file(path)
+
+        return {
+            name: sources[name]._standardize_variable_names(ds)
+            for name, ds in results.items()
+            if len(ds.variables) > 0
+        }
 
-        except Exception as e:
-            logger.error(f"Error reading dataset: {e}")
-            logger.debug(f"Traceback: {traceback.format_exc()}")
-            raise
+    def read_many(self, filters: Dict[str, Dict[str, Any]]) -> Dict[str, xr.Dataset]:
+        """Read several GRIB filter sets, downloading each forecast file once.
 
-    def to_dask(self):
-        """Return the dataset with dask arrays."""
-        ds = self.read()
+        This is the batch equivalent of calling ``read()`` on one source per
+        filter set, e.g. the ``gfs_surface_winds`` and ``gfs_ice_concentration``
+        catalog entries, which read from the same GRIB2 files. In
+        ``fileServer`` mode every lead time is downloaded once (only the
+        messages matching any of the filter sets if an inventory is available)
+        and each filter set is decoded from it. Other access methods make one
+        request per filter set and lead time.
 
-        # If the dataset already uses dask arrays, return it as-is
-        if any(hasattr(var.data, "chunks") for var in ds.data_vars.values()):
-            return ds
+        Parameters
+        ----------
+        filters : dict
+            Mapping of names to ``cfgrib_filter_by_keys`` dictionaries. All
+            other settings are taken from this source.
+
+        Returns
+        -------
+        dict
+            Mapping of the same names to xarray Datasets.
+        """
+        # Build the URLs (and resolve a 'latest' cycle) once, before the copies
+        if self._urls is None:
+            self._build_urls()
+
+        sources = {name: self._with_filter(fbk) for name, fbk in filters.items()}
+        if self.access_method != "fileServer":
+            return {name: source.read() for name, source in sources.items()}
+
+        logger.info(
+            f"Reading {len(filters)} filter sets from {len(self._urls)} partitions "
+            f"(max_workers={self.max_workers})..."
+        )
+
+        def load(i: int) -> Dict[str, xr.Dataset]:
+            return self._load_partition_many(i, sources)
+
+        indices = list(range(len(self._urls)))
+        workers = min(self.max_workers, len(indices))
+        if workers <= 1:
+            results = [load(i) for i in indices]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="gfs_partition"
+            ) as executor:
+                results = list(executor.map(load, indices))
+
+        datasets = {}
+        for name, source in sources.items():
+            partitions = [result[name] for result in results if name in result]
+            if not partitions:
+                logger.warning(f"No data was read for {name}")
+                datasets[name] = xr.Dataset()
+                continue
+            source._ds = cache.writeable(source._combine_partitions(partitions))
+            datasets[name] = source._ds
+        return datasets
+
+    async def _download_async(self, client, url: str, suffix: str) -> str:
+        """Download a URL to a local file using an aiohttp client.
+
+        Uses the download cache in the same way as ``_download()``.
+        """
+        cached = self._cached_download(url, suffix)
+        if cached is not None:
+            return cached
 
-        # Otherwise, chunk the dataset to use dask arrays
+        tmp_path = self._download_target(url, suffix)
+        logger.info(f"Downloading {url} to {tmp_path}")
         try:
-            return ds.chunk()
+            nbytes = await http_session.download_async(
+                client, url, tmp_path, retries=self.http_retries
+            )
         except Exception:
-            # If chunking fails, return the dataset as-is
+            self._remove_file(tmp_path)
+            raise
+
+        return self._finish_download(url, suffix, None, tmp_path, nbytes)
+
+    async def _get_partition_async(
+        self, client, i: int, semaphore: Optional[asyncio.Semaphore] = None
+    ) -> xr.Dataset:
+        """Download one partition asynchronously and decode it in an executor.
+
+        Only the download holds ``semaphore``, so decoding of one partition
+        overlaps with the downloads of the following ones.
+        """
+        semaphore = semaphore or asyncio.Semaphore(1)
+        url = self._urls[i]
+
+        if i == 0 and self._schema_partition is not None:
+            logger.info(f"Using partition 0 read by discover() for {url}")
+            ds, self._schema_partition = self._schema_partition, None
             return ds
 
+        key = self._partition_cache_key(i)
+        if self.memory_cache:
+            ds = cache.partitions.get(key)
+            if ds is not None:
+                logger.info(f"Using in-memory cached partition {i} for {url}")
+                return ds
+
+        ds = await self._fetch_partition_async(client, i, semaphore)
+        if self.memory_cache:
+            cache.partitions.put(key, ds)
+        return ds
+
+    async def _fetch_partition_async(
+        self, client, i: int, semaphore: asyncio.Semaphore
+    ) -> xr.Dataset:
+        """Download and decode one partition, falling back to fileServer."""
+        loop = asyncio.get_running_loop()
+        url = self._urls[i]
+
+        if "/ncss/" in url:
+            try:
+                async with semaphore:
+                    path = await self._download_async(client, url, ".nc")
+                try:
+                    return await loop.run_in_executor(
+                        None, self._open_ncss_file, path, url, i
+                    )
+                finally:
+                    self._release_file(path)
+            except Exception as e:
+                logger.warning(f"NetcdfSubset failed for partition {i}: {e}")
+                if self.access_method != "auto":
+                    raise
+                logger.info("Falling back to fileServer method")
+                url = self._fileserver_url(url)
+
+        async with semaphore:
+            if self.use_grib_index and self.cfgrib_filter_by_keys:
+                # Inventory lookup and byte-range download of the matching
+                # messages, as in read()
+                path = await loop.run_in_executor(None, self._fetch_grib_file, url)
+            else:
+                path = await self._download_async(client, url, ".grib2")
+        try:
+            return await loop.run_in_executor(None, self._open_grib_file, path, url, i)
+        finally:
+            self._release_file(path)
+
+    async def iter_partitions_async(self) -> AsyncIterator[xr.Dataset]:
+        """Asynchronously iterate over standardized partitions.
+
+        Up to ``max_workers`` downloads run concurrently on the event loop
+        while decoding happens in the loop's default executor. Partitions are
+        yielded in lead time order; failed partitions are logged and skipped.
+        At most ``max_workers`` partitions are being read or waiting to be
+        yielded at any time, so a slow consumer does not pile up decoded
+        partitions in memory.
+
+        Examples
+        --------
+        >>> async for ds in source.iter_partitions_async():  # doctest: +SKIP
+        ...     process(ds)
+        """
+        async for _, ds in self._iter_indexed_partitions_async():
+            yield cache.writeable(ds)
+
+    async def _iter_indexed_partitions_async(
+        self,
+    ) -> AsyncIterator[Tuple[int, xr.Dataset]]:
+        """Like ``iter_partitions_async()``, yielding ``(index, dataset)``."""
+        if self._urls is None:
+            self._build_urls()
+
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_workers)
+        n = len(self._urls)
+
+        async with http_session.create_async_client(
+            pool_size=self.http_pool_size, timeout=self.http_timeout
+        ) as client:
+
+            async def load(i: int) -> Optional[xr.Dataset]:
+                try:
+                    ds = await self._get_partition_async(client, i, semaphore)
+                except Exception as e:
+                    logger.error(f"Error reading partition {i+1}/{n}: {e}")
+                    logger.debug(f"Traceback: {traceback.format_exc()}")
+                    return None
+                if ds is None or len(ds.variables) == 0:
+                    logger.warning(f"No data in partition {i+1}")
+                    return None
+                return await loop.run_in_executor(
+                    None, self._standardize_variable_names, ds
+                )
+
+            # Look ahead by max_workers partitions, in lead time order
+            tasks = deque()
+            indices = iter(range(n))
+
+            def schedule() -> None:
+                while len(tasks) < self.max_workers:
+                    i = next(indices, None)
+                    if i is None:
+                        return
+                    tasks.append((i, asyncio.ensure_future(load(i))))
+
+            schedule()
+            try:
+                while tasks:
+                    i, task = tasks[0]
+                    ds = await task
+                    tasks.popleft()
+                    schedule()
+                    if ds is not None:
+                        yield i, ds
+            finally:
+                for _, task in tasks:
+                    task.cancel()
+
+    async def read_async(self) -> xr.Dataset:
+        """Asynchronous counterpart of ``read()`` for use inside an event loop."""
+        if self._ds is not None:
+            return self._ds
+
+        results = [result async for result in self._iter_indexed_partitions_async()]
+        if not results:
+            logger.warning("No data was read from any partition")
+            return xr.Dataset()
+
+        loop = asyncio.get_running_loop()
+        ds = await loop.run_in_executor(
+            None, self._combine_partitions, [ds for _, ds in results]
+        )
+        self._ds = cache.writeable(ds)
+        self._loaded = {i for i, _ in results}
+        return self._ds
+
+    def _load_partition_or_missing(
+        self, i: int, template: xr.Dataset, concat_dim: str
+    ) -> xr.Dataset:
+        """Load a partition for a lazy graph, laid out like ``template``.
+
+        A dask task cannot be skipped once the graph is built, so a failed
+        partition is represented by missing values instead. Lazy partitions
+        are computed, as the task has to return their values.
+        """
+        ds = self._load_partition(i)
+        if ds is None:
+            logger.warning(f"Partition {i} unavailable, filling with missing values")
+            ds = xr.full_like(template, np.nan)
+        elif concat_dim not in ds.dims:
+            ds = ds.expand_dims(concat_dim)
+        return ds.load() if self.lazy else ds
+
+    def to_dask(self) -> xr.Dataset:
+        """Return a lazily evaluated, dask-backed dataset.
+
+        The first readable partition is loaded to determine variables, shapes
+        and dtypes. Every other lead time becomes one ``dask.delayed`` task, so
+        nothing else is downloaded until values are computed, and only the
+        lead times that are actually selected are fetched.
+        """
+        if self._ds is not None:
+            return self._ds.chunk()
+
+        import dask
+        import dask.array as da
+
+        self._build_urls()
+        if not self._urls:
+            logger.warning("No URLs available to read data from")
+            return xr.Dataset()
+
+        # Use the first partition that can be read as the template
+        template_index, template = None, None
+        for i in range(len(self._urls)):
+            template = self._load_partition(i)
+            if template is not None:
+                template_index = i
+                break
+        if template is None:
+            logger.warning("No data was read from any partition")
+            return xr.Dataset()
+
+        if "time" in template.dims:
+            concat_dim = "time"
+        elif "step" in template.coords and template.step.ndim == 0:
+            concat_dim = "step"
+            template = template.expand_dims("step")
+        else:
+            concat_dim = None
+        if concat_dim is None or template.sizes[concat_dim] != 1:
+            logger.info("Partitions cannot be stacked lazily, reading eagerly")
+            return self.read().chunk()
+
+        def lead_time_coords(lead_time: int) -> Dict[str, Any]:
+            """Concat-dimension coordinates of a partition of the template."""
+            step = np.timedelta64(lead_time, "h")
+            if concat_dim == "time":
+                cycle = np.datetime64(self.metadata["cycle"])
+                return {"time": (cycle + step).astype(template.time.dtype)}
+            coords = {"step": step.astype(template.step.dtype)}
+            if "valid_time" in template.coords:
+                coords["valid_time"] = (template.time.values + step).astype(
+                    template.valid_time.dtype
+                )
+            return coords
+
+        partitions = {}
+        for i in range(len(self._urls)):
+            if i == template_index:
+                partitions[i] = template
+                continue
+            name = "gfs-partition-" + dask.base.tokenize(self._partition_cache_key(i))
+            loader = dask.delayed(self._load_partition_or_missing, pure=True)
+            partitions[i] = loader(i, template, concat_dim, dask_key_name=name)
+
+        data_vars = {}
+        for var_name, var in template.data_vars.items():
+            if concat_dim not in var.dims:
+                data_vars[var_name] = var
+                continue
+            axis = var.dims.index(concat_dim)
+            blocks = []
+            for i, part in partitions.items():
+                if i == template_index:
+                    # Lazy templates are dask-backed already
+                    blocks.append(
+                        var.data
+                        if isinstance(var.data, da.Array)
+                        else da.from_array(var.data, chunks=var.shape)
+                    )
+                else:
+                    blocks.append(
+                        da.from_delayed(
+                            part[var_name].data, shape=var.shape, dtype=var.dtype
+                        )
+                    )
+            data_vars[var_name] = xr.Variable(
+                var.dims, da.concatenate(blocks, axis=axis), attrs=var.attrs
+            )
+
+        # Coordinates along the stacked dimension are derived from lead times
+        stacked = lead_time_coords(self._lead_times[0]).keys()
+        coords = {
+            name: coord.variable
+            for name, coord in template.coords.items()
+            if name not in stacked and concat_dim not in coord.dims
+        }
+        for name in stacked:
+            values = [lead_time_coords(lead)[name] for lead in self._lead_times]
+            coords[name] = xr.Variable(
+                (concat_dim,), np.asarray(values), template[name].attrs
+            )
+
+        ds = xr.Dataset(data_vars, coords=coords, attrs=template.attrs)
+        ds = ds.squeeze()
+        return ds.drop_vars(
+            ["height_above_ground4", "reftime", "reftime2"], errors="ignore"
+        )
+
+    def to_zarr(self, store: Any, mode: str = "w-", **kwargs) -> None:
+        """Write the dataset to a Zarr store one partition at a time.
+
+        The store is first created with the full shape of the forecast,
+        using the lazy dataset of ``to_dask()``, then every lead time is
+        written into its region of the arrays as soon as it is decoded. Up to
+        ``max_workers`` partitions are fetched and written concurrently, so
+        peak memory stays at a few partitions instead of the whole forecast.
+        Lead times that cannot be read are left as missing values.
+
+        Parameters
+        ----------
+        store : str or MutableMapping
+            Zarr store or path to write to.
+        mode : str, optional
+            Mode used to create the store: 'w-' (fail if it exists) or 'w'
+            (overwrite). Default: 'w-'
+        **kwargs
+            Further arguments to ``xarray.Dataset.to_zarr()`` (e.g.
+            ``encoding``, ``consolidated``, ``zarr_format`` or
+            ``storage_options``). All of them are used to create the store,
+            and all but ``encoding`` for the writes of the partitions.
+        """
+        if self._ds is not None:
+            # Already in memory, nothing to stream
+            self._ds.to_zarr(store, mode=mode, **kwargs)
+            return
+
+        # Stream through a copy that bypasses the in-memory partition cache,
+        # which would otherwise keep every written partition
+        source = self._copy()
+        source.memory_cache = False
+        ds = source.to_dask()
+        dim = next(
+            (
+                d
+                for d in ("time", "step")
+                if d in ds.dims
+                and source._urls
+                and ds.sizes[d] == len(source._urls)
+                and ds.chunksizes
+                and set(ds.chunksizes.get(d, ())) == {1}
+            ),
+            None,
+        )
+        if dim is None:
+            logger.info("Partitions cannot be written separately, writing at once")
+            ds.to_zarr(store, mode=mode, **kwargs)
+            return
+
+        # Create the arrays and write the coordinates without any data
+        logger.info(f"Creating Zarr store with dimensions {dict(ds.sizes)}")
+        ds.to_zarr(store, mode=mode, compute=False, **kwargs)
+        # Region writes must only hold variables along the stacked dimension
+        stacked = ds.drop_vars(
+            [name for name, var in ds.variables.items() if dim not in var.dims]
+        )
+        # Encodings are fixed when the arrays are created
+        region_kwargs = {
+            k: v
+            for k, v in kwargs.items()
+            if k not in ("encoding", "compute", "append_dim", "region")
+        }
+
+        def write(i: int) -> None:
+            region = {dim: slice(i, i + 1)}
+            # Computing one region only loads the partition of that lead time
+            part = stacked.isel(region).load(scheduler="synchronous")
+            part.to_zarr(store, region=region, **region_kwargs)
+            logger.info(f"Wrote partition {i + 1}/{len(source._urls)} to Zarr store")
+
+        workers = min(source.max_workers, len(source._urls))
+        with ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="gfs_zarr"
+        ) as executor:
+            list(executor.map(write, range(len(source._urls))))
+
     def close(self):
         """Close any open files or resources."""
         if self._ds is not None:
@@ -955,7 +2827,12 @@ class GFSForecastSource(DataSource):
                 self._ds.close()
             self._ds = None
         self._urls = None
+        self._lead_times = None
+        self._partition_lead_times = None
+        self._loaded = set()
+        self._assembler = None
         self._schema = None
+        self._schema_partition = None
 
 
 # Driver registration is now handled in __init__.py to avoid duplicate registrations
@@ -0,0 +1,262 @@
+"""GRIB2 message inventories for byte-range downloads.
+
+A GFS 0.25 degree GRIB2 file holds several hundred messages, while most
+catalog entries only need a handful of them. This module reads message
+inventories, either wgrib2-style ``.idx`` sidecar files or inventories built by
+scanning a local GRIB file with ecCodes, and maps ``cfgrib_filter_by_keys`` onto
+the byte ranges of the matching messages so that only those bytes need to be
+requested with HTTP Range requests.
+
+Matching is deliberately permissive: filter keys that cannot be checked against
+an inventory are ignored, so the selected messages are always a superset of
+what cfgrib will keep when it applies the full filter after download.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# cfgrib/ecCodes short names mapped to wgrib2 variable abbreviations
+SHORT_NAME_TO_WGRIB2 = {
+    "10u": "UGRD",
+    "10v": "VGRD",
+    "100u": "UGRD",
+    "100v": "VGRD",
+    "u": "UGRD",
+    "v": "VGRD",
+    "2t": "TMP",
+    "t2m": "TMP",
+    "t": "TMP",
+    "2d": "DPT",
+    "2r": "RH",
+    "r": "RH",
+    "2sh": "SPFH",
+    "q": "SPFH",
+    "gh": "HGT",
+    "orog": "HGT",
+    "w": "VVEL",
+    "absv": "ABSV",
+    "prmsl": "PRMSL",
+    "msl": "PRMSL",
+    "sp": "PRES",
+    "ci": "ICEC",
+    "tp": "APCP",
+    "prate": "PRATE",
+    "sde": "SNOD",
+    "sdwe": "WEASD",
+    "lsm": "LAND",
+    "gust": "GUST",
+    "pwat": "PWAT",
+    "cape": "CAPE",
+    "tcc": "TCDC",
+    "vis": "VIS",
+}
+
+# Short names that imply a fixed height above ground
+IMPLIED_HEIGHT_LEVELS = {
+    "10u": 10,
+    "10v": 10,
+    "100u": 100,
+    "100v": 100,
+    "2t": 2,
+    "t2m": 2,
+    "2d": 2,
+    "2r": 2,
+    "2sh": 2,
+}
+
+# ecCodes keys stored in inventories built from a local scan
+SCAN_KEYS = ("shortName", "typeOfLevel", "level")
+
+
+class GribMessage(NamedTuple):
+    """Location and description of one GRIB message within a file.
+
+    ``length`` is None for the last message of a wgrib2 inventory, whose end is
+    only known from the file size. ``fields`` holds either wgrib2 inventory
+    fields (``variable`` and ``level``) or the ecCodes ``SCAN_KEYS``.
+    """
+
+    offset: int
+    length: Optional[int]
+    fields: Dict[str, Any]
+
+
+def parse_idx(text: str) -> List[GribMessage]:
+    """Parse a wgrib2-style ``.idx`` inventory.
+
+    Each line has the form ``n:offset:d=YYYYMMDDHH:VAR:LEVEL:FORECAST:``.
+    Message lengths are derived from the offset of the following message.
+    """
+    records = []
+    for line in text.splitlines():
+        parts = line.strip().split(":")
+        if len(parts) < 5 or not parts[1].isdigit():
+            continue
+        records.append((int(parts[1]), parts[3], parts[4]))
+
+    messages = []
+    for n, (offset, variable, level) in enumerate(records):
+        length = records[n + 1][0] - offset if n + 1 < len(records) else None
+        messages.append(
+            GribMessage(offset, length, {"variable": variable, "level": level})
+        )
+    return messages
+
+
+def scan_grib_file(path: str) -> List[GribMessage]:
+    """Build an inventory of a local GRIB file by scanning it with ecCodes."""
+    import eccodes
+
+    messages = []
+    with open(path, "rb") as f:
+        while True:
+            handle = eccodes.codes_grib_new_from_file(f)
+            if handle is None:
+                break
+            try:
+                fields = {}
+                for key in SCAN_KEYS:
+                    try:
+                        fields[key] = eccodes.codes_get(handle, key)
+                    except eccodes.KeyValueNotFoundError:
+                        fields[key] = None
+                messages.append(
+                    GribMessage(
+                        int(eccodes.codes_get(handle, "offset")),
+                        int(eccodes.codes_get(handle, "totalLength")),
+                        fields,
+                    )
+                )
+            finally:
+                eccodes.codes_release(handle)
+    return messages
+
+
+def _as_list(value: Any) -> List[Any]:
+    return list(value) if isinstance(value, (list, tuple, set)) else [value]
+
+
+def _wgrib2_level_matcher(filter_by_keys: Dict[str, Any]):
+    """Return a predicate on wgrib2 level strings, or None if unconstrained."""
+    type_of_level = filter_by_keys.get("typeOfLevel")
+    levels = _as_list(filter_by_keys["level"]) if "level" in filter_by_keys else None
+
+    if type_of_level == "surface":
+        return lambda text: text == "surface"
+    if type_of_level == "meanSea":
+        return lambda text: text == "mean sea level"
+    if type_of_level == "heightAboveGround":
+        if levels is not None:
+            wanted = {f"{level} m above ground" for level in levels}
+            return lambda text: text in wanted
+        return lambda text: text.endswith(" m above ground")
+    if type_of_level == "isobaricInhPa":
+        if levels is not None:
+            wanted = {f"{level} mb" for level in levels}
+            return lambda text: text in wanted
+        return lambda text: text.endswith(" mb")
+    return None
+
+
+def _match_wgrib2(message: GribMessage, filter_by_keys: Dict[str, Any]) -> bool:
+    short_names = _as_list(filter_by_keys.get("shortName", []))
+    if short_names:
+        variables = {SHORT_NAME_TO_WGRIB2[name] for name in short_names}
+        if message.fields["variable"] not in variables:
+            return False
+        # Short names such as '10u' only ever refer to one height
+        implied = {IMPLIED_HEIGHT_LEVELS.get(name) for name in short_names}
+        if None not in implied:
+            wanted = {f"{level} m above ground" for level in implied}
+            if message.fields["level"] not in wanted:
+                return False
+
+    level_matcher = _wgrib2_level_matcher(filter_by_keys)
+    if level_matcher is not None and not level_matcher(message.fields["level"]):
+        return False
+    return True
+
+
+def _match_scanned(message: GribMessage, filter_by_keys: Dict[str, Any]) -> bool:
+    for key in SCAN_KEYS:
+        if key in filter_by_keys and message.fields.get(key) is not None:
+            if message.fields[key] not in _as_list(filter_by_keys[key]):
+                return False
+    return True
+
+
+def select_messages(
+    messages: List[GribMessage], filter_by_keys: Dict[str, Any]
+) -> Optional[List[GribMessage]]:
+    """Select the messages that may match cfgrib filter keys.
+
+    Returns
+    -------
+    list of GribMessage or None
+        The candidate messages, or None if the filter keys cannot narrow down
+        the inventory (in which case the whole file should be downloaded).
+    """
+    if not messages or not filter_by_keys:
+        return None
+
+    if "variable" in messages[0].fields:
+        short_names = _as_list(filter_by_keys.get("shortName", []))
+        if any(name not in SHORT_NAME_TO_WGRIB2 for name in short_names):
+            return None
+        if not short_names and _wgrib2_level_matcher(filter_by_keys) is None:
+            return None
+        matcher = _match_wgrib2
+    else:
+        if not any(key in filter_by_keys for key in SCAN_KEYS):
+            return None
+        matcher = _match_scanned
+
+    return [m for m in messages if matcher(m, filter_by_keys)]
+
+
+def byte_ranges(messages: List[GribMessage]) -> List[Tuple[int, Optional[int]]]:
+    """Merge messages into inclusive ``(start, end)`` byte ranges.
+
+    Adjacent messages are merged into a single range. ``end`` is None when the
+    range extends to the end of the file.
+    """
+    ranges: List[Tuple[int, Optional[int]]] = []
+    for message in sorted(messages, key=lambda m: m.offset):
+        end = None if message.length is None else message.offset + message.length - 1
+        if ranges and ranges[-1][1] is not None and ranges[-1][1] + 1 == message.offset:
+            ranges[-1] = (ranges[-1][0], end)
+        else:
+            ranges.append((message.offset, end))
+    return ranges
+
+
+class InventoryCache:
+    """Thread-safe, bounded in-memory store of inventories keyed by URL."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._inventories: "OrderedDict[str, List[GribMessage]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[List[GribMessage]]:
+        with self._lock:
+            messages = self._inventories.get(url)
+            if messages is not None:
+                self._inventories.move_to_end(url)
+            return messages
+
+    def put(self, url: str, messages: List[GribMessage]) -> None:
+        with self._lock:
+            self._inventories[url] = messages
+            self._inventories.move_to_end(url)
+            while len(self._inventories) > self.max_entries:
+                self._inventories.popitem(last=False)
+
+
+# Inventories read from sidecars or built from full downloads, shared by all
+# sources in the process
+inventories = InventoryCache()
@@ -0,0 +1,350 @@
+"""Shared HTTP sessions for requests to the NCAR THREDDS server.
+
+Opening a new connection for every forecast file means paying a TCP and TLS
+handshake per partition, which dominates the cost of small NetcdfSubset
+requests. This module keeps a process-wide registry of pooled, keep-alive
+``requests`` sessions so that every source with the same HTTP settings (for
+example all entries of a catalog) reuses the same connections.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Default number of pooled connections per host
+DEFAULT_POOL_SIZE = 10
+
+# Default request timeout in seconds
+DEFAULT_TIMEOUT = 30
+
+# Default number of retries for transient failures
+DEFAULT_RETRIES = 3
+
+# Default exponential backoff factor between retries (seconds)
+DEFAULT_BACKOFF_FACTOR = 0.5
+
+# HTTP status codes worth retrying (throttling and transient server errors)
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Size of the chunks streamed from the server to disk
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+_sessions: Dict[Tuple[int, int, float], requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+) -> requests.Session:
+    """Return a shared, pooled HTTP session for the given settings.
+
+    Sessions are cached per ``(pool_size, retries, backoff_factor)`` so that
+    sources configured identically share one connection pool.
+
+    Parameters
+    ----------
+    pool_size : int, optional
+        Maximum number of keep-alive connections kept per host.
+    retries : int, optional
+        Number of retries for connection errors and transient HTTP errors.
+    backoff_factor : float, optional
+        Exponential backoff factor applied between retries.
+
+    Returns
+    -------
+    requests.Session
+        A session with connection pooling and the retry policy mounted for
+        both http and https.
+    """
+    key = (int(pool_size), int(retries), float(backoff_factor))
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            retry = Retry(
+                total=key[1],
+                backoff_factor=key[2],
+                status_forcelist=RETRY_STATUS_CODES,
+                allowed_methods=frozenset(["GET", "HEAD"]),
+                raise_on_status=False,
+            )
+            adapter = HTTPAdapter(
+                pool_connections=key[0], pool_maxsize=key[0], max_retries=retry
+            )
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[key] = session
+            logger.debug(
+                f"Created HTTP session (pool_size={key[0]}, retries={key[1]}, "
+                f"backoff_factor={key[2]})"
+            )
+        return session
+
+
+def close_sessions() -> None:
+    """Close all shared sessions and release their pooled connections."""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def raise_for_status(response: requests.Response, url: str) -> None:
+    """Raise an IOError with a helpful message for unsuccessful responses."""
+    check_status(response.status_code, response.reason, url)
+
+
+def check_status(code: int, reason: Optional[str], url: str) -> None:
+    """Raise an IOError with a helpful message for an HTTP error status code."""
+    if code < 400:
+        return
+    if code == 404:
+        raise IOError(
+            f"Data not found (HTTP 404): {url}. This forecast time may not be available yet or may have been archived."
+        )
+    elif code == 400:
+        raise IOError(
+            f"Bad request (HTTP 400): {url}. Check variable names and query parameters."
+        )
+    else:
+        raise IOError(f"HTTP Error {code}: {reason} for URL: {url}")
+
+
+def exists(
+    session: requests.Session, url: str, timeout: Optional[float] = DEFAULT_TIMEOUT
+) -> bool:
+    """Check with a HEAD request whether a URL is available.
+
+    Returns False for HTTP 404 and raises an IOError for other HTTP errors
+    and network failures.
+    """
+    try:
+        r = session.head(url, timeout=timeout, allow_redirects=True)
+    except requests.RequestException as e:
+        raise IOError(f"Network error accessing {url}: {e}") from e
+    if r.status_code == 404:
+        return False
+    raise_for_status(r, url)
+    return True
+
+
+def download(
+    session: requests.Session,
+    url: str,
+    path: str,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    headers: Optional[Dict[str, str]] = None,
+) -> int:
+    """Stream a URL to a local file using a pooled session.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session used to issue the request.
+    url : str
+        URL to download.
+    path : str
+        Destination file path.
+    timeout : float, optional
+        Connect and read timeout in seconds.
+    headers : dict, optional
+        Extra request headers (e.g. ``Range``).
+
+    Returns
+    -------
+    int
+        Number of bytes written.
+    """
+    try:
+        with session.get(url, stream=True, timeout=timeout, headers=headers) as r:
+            raise_for_status(r, url)
+            nbytes = 0
+            with open(path, "wb") as f:
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    f.write(chunk)
+                    nbytes += len(chunk)
+    except requests.RequestException as e:
+        raise IOError(f"Network error accessing {url}: {e}") from e
+    return nbytes
+
+
+def download_to_memory(
+    session: requests.Session,
+    url: str,
+    max_bytes: int,
+    spill_path: Callable[[], str],
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> Tuple[Optional[bytes], Optional[str], int]:
+    """Stream a URL into memory, spilling to a local file above a size limit.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session used to issue the request.
+    url : str
+        URL to download.
+    max_bytes : int
+        Largest response kept in memory. Larger responses, detected from the
+        ``Content-Length`` header or while streaming, are written to a file.
+    spill_path : callable
+        Called without arguments to get the destination path when the
+        response has to be written to disk.
+    timeout : float, optional
+        Connect and read timeout in seconds.
+
+    Returns
+    -------
+    tuple of (bytes or None, str or None, int)
+        The response body if it was kept in memory, otherwise the path of
+        the file it was written to, and the number of bytes downloaded.
+    """
+    try:
+        with session.get(url, stream=True, timeout=timeout) as r:
+            raise_for_status(r, url)
+            length = r.headers.get("Content-Length")
+            buffer = bytearray()
+            f, path = None, None
+            if length is not None and int(length) > max_bytes:
+                path = spill_path()
+                f = open(path, "wb")
+            try:
+                for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if f is None and len(buffer) + len(chunk) > max_bytes:
+                        path = spill_path()
+                        logger.debug(f"Response of {url} exceeds memory limit")
+                        f = open(path, "wb")
+                        f.write(buffer)
+                        buffer = bytearray()
+                    if f is None:
+                        buffer += chunk
+                    else:
+                        f.write(chunk)
+                nbytes = (f.tell() if f is not None else 0) + len(buffer)
+            except Exception:
+                if f is not None:
+                    f.close()
+                    os.unlink(path)
+                raise
+            if f is not None:
+                f.close()
+    except requests.RequestException as e:
+        raise IOError(f"Network error accessing {url}: {e}") from e
+    if path is not None:
+        return None, path, nbytes
+    return bytes(buffer), None, nbytes
+
+
+def download_ranges(
+    session: requests.Session,
+    url: str,
+    path: str,
+    ranges: List[Tuple[int, Optional[int]]],
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+) -> int:
+    """Download byte ranges of a URL and concatenate them into a local file.
+
+    Parameters
+    ----------
+    session : requests.Session
+        Session used to issue the requests.
+    url : str
+        URL to read from.
+    path : str
+        Destination file path.
+    ranges : list of (int, int or None)
+        Inclusive byte ranges to fetch. An end of None reads to the end of
+        the file.
+    timeout : float, optional
+        Connect and read timeout in seconds.
+
+    Returns
+    -------
+    int
+        Number of bytes written.
+    """
+    nbytes = 0
+    with open(path, "wb") as f:
+        for start, end in ranges:
+            headers = {"Range": f"bytes={start}-{'' if end is None else end}"}
+            try:
+                with session.get(
+                    url, stream=True, timeout=timeout, headers=headers
+                ) as r:
+                    raise_for_status(r, url)
+                    if r.status_code != 206:
+                        raise IOError(f"Server ignored Range request for {url}")
+                    for chunk in r.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        nbytes += len(chunk)
+            except requests.RequestException as e:
+                raise IOError(f"Network error accessing {url}: {e}") from e
+    return nbytes
+
+
+def create_async_client(
+    pool_size: int = DEFAULT_POOL_SIZE, timeout: Optional[float] = DEFAULT_TIMEOUT
+) -> aiohttp.ClientSession:
+    """Create a pooled aiohttp client for use inside an event loop.
+
+    Unlike the synchronous sessions, aiohttp clients are bound to the running
+    event loop and must be created (and closed) by the caller.
+    """
+    connector = aiohttp.TCPConnector(limit_per_host=pool_size)
+    client_timeout = aiohttp.ClientTimeout(
+        total=None, sock_connect=timeout, sock_read=timeout
+    )
+    return aiohttp.ClientSession(connector=connector, timeout=client_timeout)
+
+
+async def download_async(
+    client: aiohttp.ClientSession,
+    url: str,
+    path: str,
+    headers: Optional[Dict[str, str]] = None,
+    retries: int = DEFAULT_RETRIES,
+    backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+) -> int:
+    """Stream a URL to a local file with aiohttp.
+
+    Connection errors and the status codes in ``RETRY_STATUS_CODES`` are
+    retried with the same exponential backoff policy as the synchronous
+    sessions.
+
+    Returns
+    -------
+    int
+        Number of bytes written.
+    """
+    attempt = 0
+    while True:
+        try:
+            async with client.get(url, headers=headers) as r:
+                if r.status in RETRY_STATUS_CODES and attempt < retries:
+                    raise aiohttp.ClientResponseError(
+                        r.request_info, r.history, status=r.status
+                    )
+                check_status(r.status, r.reason, url)
+                nbytes = 0
+                with open(path, "wb") as f:
+                    async for chunk in r.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        f.write(chunk)
+                        nbytes += len(chunk)
+                return nbytes
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt >= retries:
+                raise IOError(f"Network error accessing {url}: {e}") from e
+            delay = backoff_factor * (2**attempt)
+            attempt += 1
+            logger.debug(f"Retrying {url} in {delay:.1f}s ({attempt}/{retries}): {e}")
+            await asyncio.sleep(delay)
@@ -0,0 +1,235 @@
+"""Warm the download cache with the forecast files of a catalog entry.
+
+Consumer jobs reading a cycle shortly after it is published spend most of
+their time downloading. This module downloads the files of a source ahead of
+them, without decoding them, into the persistent download cache, where every
+source configured with the same cache directory reuses them without contacting
+the server. Files already in the cache are not downloaded again, so an
+interrupted prefetch resumes where it left off when run again.
+
+Usage:
+    gfs-ncar-prefetch --entry gfs_surface_winds --cycle latest \\
+        --max-lead-time 240 --workers 16 --cache-dir /data/gfs-cache
+"""
+
+import argparse
+import copy
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, NamedTuple, Optional
+
+from . import cache
+from .gfs_intake_driver import GFSForecastSource
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG = os.path.join(os.path.dirname(__file__), "gfs_catalog.yaml")
+
+
+class PrefetchResult(NamedTuple):
+    """Outcome of prefetching one partition.
+
+    ``nbytes`` is the number of bytes downloaded from the server, which is 0
+    for partitions served entirely from the cache.
+    """
+
+    index: int
+    url: str
+    nbytes: int
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def cached(self) -> bool:
+        return self.error is None and self.nbytes == 0
+
+
+def prefetch(
+    source: GFSForecastSource,
+    workers: Optional[int] = None,
+    report: Optional[Callable[[PrefetchResult], None]] = None,
+) -> List[PrefetchResult]:
+    """Download every partition of a source into its download cache.
+
+    Parameters
+    ----------
+    source : GFSForecastSource
+        Source to prefetch. It must have a download cache (``cache_dir``).
+    workers : int, optional
+        Number of partitions fetched concurrently. Defaults to the source's
+        ``max_workers``.
+    report : callable, optional
+        Called with each ``PrefetchResult`` as soon as its partition is done.
+
+    Returns
+    -------
+    list of PrefetchResult
+        One result per partition, in partition order. Failed partitions are
+        reported rather than raised.
+    """
+    if source.cache is None:
+        raise ValueError("Prefetching requires a download cache (cache_dir)")
+
+    # The download hook is installed on a copy to leave the caller's source
+    # untouched
+    source = copy.copy(source)
+    urls = source._build_urls()
+
+    # Each partition is fetched by a single thread, so downloads are attributed
+    # to the partition through a thread-local byte count
+    transferred = threading.local()
+
+    def on_download(url: str, nbytes: int) -> None:
+        transferred.nbytes += nbytes
+
+    def fetch(i: int) -> PrefetchResult:
+        transferred.nbytes = 0
+        start = time.perf_counter()
+        error = None
+        try:
+            source._release_file(source._download_partition(i))
+        except Exception as e:
+            logger.debug(f"Failed to prefetch {urls[i]}: {e}")
+            error = str(e)
+        result = PrefetchResult(
+            i, urls[i], transferred.nbytes, time.perf_counter() - start, error
+        )
+        if report is not None:
+            report(result)
+        return result
+
+    source._on_download = on_download
+    workers = min(workers or source.max_workers, len(urls)) or 1
+    logger.info(f"Prefetching {len(urls)} partitions with {workers} workers")
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="gfs_prefetch"
+    ) as executor:
+        return list(executor.map(fetch, range(len(urls))))
+
+
+def _megabytes(nbytes: float) -> str:
+    return f"{nbytes / 1024**2:.1f} MB"
+
+
+def format_result(result: PrefetchResult, total: int) -> str:
+    """Format the report line of one partition."""
+    name = os.path.basename(result.url.split("?")[0])
+    line = f"[{result.index + 1}/{total}] {name}: "
+    if result.error is not None:
+        return line + f"FAILED after {result.seconds:.2f} s ({result.error})"
+    if result.cached:
+        return line + f"cached ({result.seconds:.2f} s)"
+    rate = result.nbytes / result.seconds if result.seconds > 0 else 0.0
+    return line + (
+        f"{_megabytes(result.nbytes)} in {result.seconds:.2f} s "
+        f"({_megabytes(rate)}/s)"
+    )
+
+
+def format_summary(results: List[PrefetchResult], seconds: float) -> str:
+    """Format the totals of a prefetch run."""
+    nbytes = sum(r.nbytes for r in results)
+    failed = sum(r.error is not None for r in results)
+    cached = sum(r.cached for r in results)
+    downloaded = [r.seconds for r in results if r.error is None and not r.cached]
+    summary = (
+        f"Prefetched {len(results) - failed}/{len(results)} partitions "
+        f"({cached} already cached, {failed} failed): {_megabytes(nbytes)} in "
+        f"{seconds:.1f} s ({_megabytes(nbytes / seconds if seconds > 0 else 0)}/s)"
+    )
+    if downloaded:
+        summary += (
+            f", per-file latency mean {sum(downloaded) / len(downloaded):.2f} s, "
+            f"max {max(downloaded):.2f} s"
+        )
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line interface of ``gfs-ncar-prefetch``."""
+    parser = argparse.ArgumentParser(
+        prog="gfs-ncar-prefetch",
+        description="Download the forecast files of a catalog entry into the "
+        "local download cache ahead of consumer jobs",
+    )
+    parser.add_argument(
+        "--catalog",
+        default=DEFAULT_CATALOG,
+        help="Path of the intake catalog. Default: the packaged gfs_catalog.yaml",
+    )
+    parser.add_argument(
+        "--entry", default="gfs_forecast", help="Catalog entry. Default: gfs_forecast"
+    )
+    parser.add_argument(
+        "--cycle", default="latest", help="Forecast cycle (ISO format) or 'latest'"
+    )
+    parser.add_argument(
+        "--max-lead-time",
+        type=int,
+        default=24,
+        help="Maximum lead time in hours. Default: 24",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Number of files downloaded concurrently. Default: 4",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get(cache.CACHE_DIR_ENV),
+        help=f"Download cache directory. Default: ${cache.CACHE_DIR_ENV}",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        help="Maximum size of the download cache in bytes",
+    )
+    parser.add_argument(
+        "--verbose", "-v", action="store_true", help="Enable verbose logging"
+    )
+    args = parser.parse_args(argv)
+
+    if not args.cache_dir:
+        parser.error(f"--cache-dir or ${cache.CACHE_DIR_ENV} is required")
+    if args.workers <= 0:
+        parser.error("--workers must be a positive integer")
+
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    import intake
+
+    catalog = intake.open_catalog(args.catalog)
+    source = catalog[args.entry](
+        cycle=args.cycle,
+        max_lead_time=args.max_lead_time,
+        max_workers=args.workers,
+        cache_dir=args.cache_dir,
+        cache_max_size=args.cache_max_size,
+        memory_cache=False,
+    )
+    total = len(source._build_urls())
+    print(
+        f"Prefetching {args.entry} for cycle {source.metadata['cycle']} "
+        f"({total} partitions) into {source.cache.cache_dir}"
+    )
+
+    start = time.perf_counter()
+    results = prefetch(
+        source,
+        workers=args.workers,
+        report=lambda result: print(format_result(result, total), flush=True),
+    )
+    print(format_summary(results, time.perf_counter() - start))
+    return 1 if any(r.error is not None for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
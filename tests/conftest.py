@@ -0,0 +1,311 @@
+"""Shared fixtures for the GFS intake driver tests."""
+
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+# Messages written by the ``write_grib`` fixture: (shortName, typeOfLevel, level)
+GRIB_MESSAGES = [
+    ("prmsl", "meanSea", None),
+    ("10u", "heightAboveGround", 10),
+    ("10v", "heightAboveGround", 10),
+    ("t", "isobaricInhPa", 500),
+    ("t", "isobaricInhPa", 850),
+    ("ci", "surface", None),
+]
+
+# wgrib2 inventory names of the ``GRIB_MESSAGES``: shortName -> (variable, level)
+IDX_LEVELS = {
+    "prmsl": ("PRMSL", "mean sea level"),
+    "10u": ("UGRD", "10 m above ground"),
+    "10v": ("VGRD", "10 m above ground"),
+    "t": ("TMP", None),
+    "ci": ("ICEC", "surface"),
+}
+
+# Cycle of the synthetic NetcdfSubset responses and GRIB2 files
+NCSS_CYCLE = "2024-01-15T12:00:00"
+
+
+@pytest.fixture(autouse=True)
+def empty_partition_cache():
+    """Start every test with an empty process-wide partition cache."""
+    from intake_gfs_ncar import cache
+
+    cache.partitions.clear()
+    yield
+    cache.partitions.clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_schema_cache(monkeypatch, tmp_path_factory):
+    """Persist schemas to a per-test directory instead of the user cache."""
+    from intake_gfs_ncar import cache
+
+    path = tmp_path_factory.mktemp("schemas")
+    monkeypatch.setenv(cache.SCHEMA_CACHE_DIR_ENV, str(path))
+    return path
+
+
+class _RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Static file handler with HTTP Range support and request logging."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_head(self):
+        self.server.requests.append((self.command, self.path, self.headers))
+        path = self.translate_path(self.path.split("?")[0])
+        if not os.path.isfile(path):
+            self.send_error(404, "File not found")
+            return None
+
+        f = open(path, "rb")
+        size = os.fstat(f.fileno()).st_size
+        range_header = self.headers.get("Range")
+        if range_header and range_header.startswith("bytes="):
+            start, end = range_header[len("bytes=") :].split(",")[0].split("-")
+            start = int(start)
+            end = min(int(end), size - 1) if end else size - 1
+            f.seek(start)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.end_headers()
+            return _LimitedReader(f, end - start + 1)
+
+        self.send_response(200)
+        self.send_header("Content-Length", str(size))
+        self.end_headers()
+        return f
+
+
+class _LimitedReader:
+    """File wrapper that only returns the requested byte range."""
+
+    def __init__(self, f, length):
+        self.f = f
+        self.remaining = length
+
+    def read(self, n=-1):
+        if self.remaining <= 0:
+            return b""
+        n = self.remaining if n < 0 else min(n, self.remaining)
+        data = self.f.read(n)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+@pytest.fixture
+def http_server(tmp_path):
+    """Serve ``tmp_path`` over HTTP on localhost.
+
+    The server object exposes ``root`` (the served directory), ``url`` (the
+    base URL), ``requests`` (a list of ``(method, path, headers)`` tuples) and
+    ``range_requests()`` (the Range header of each request, or None).
+    """
+
+    def handler(*args, **kwargs):
+        return _RangeRequestHandler(*args, directory=str(tmp_path), **kwargs)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.requests = []
+    server.range_requests = lambda: [h.get("Range") for _, _, h in server.requests]
+    server.root = tmp_path
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def write_grib():
+    """Return a function writing a small synthetic GFS-like GRIB2 file.
+
+    The function takes a path and a lead time in hours and writes one 3x4
+    message per entry of ``GRIB_MESSAGES`` whose values equal the lead time.
+    It returns the list of ``(offset, length)`` of the written messages. The
+    default message list is available as ``write_grib.messages``.
+    """
+    eccodes = pytest.importorskip("eccodes")
+
+    def write(path, lead_time, cycle=(20240115, 1200), messages=GRIB_MESSAGES):
+        layout = []
+        with open(path, "wb") as f:
+            for short_name, type_of_level, level in messages:
+                handle = eccodes.codes_grib_new_from_samples("regular_ll_sfc_grib2")
+                eccodes.codes_set(handle, "centre", "kwbc")
+                eccodes.codes_set(handle, "dataDate", cycle[0])
+                eccodes.codes_set(handle, "dataTime", cycle[1])
+                eccodes.codes_set_key_vals(
+                    handle,
+                    {
+                        "Ni": 4,
+                        "Nj": 3,
+                        "latitudeOfFirstGridPointInDegrees": 10,
+                        "latitudeOfLastGridPointInDegrees": -10,
+                        "longitudeOfFirstGridPointInDegrees": 0,
+                        "longitudeOfLastGridPointInDegrees": 30,
+                        "iDirectionIncrementInDegrees": 10,
+                        "jDirectionIncrementInDegrees": 10,
+                    },
+                )
+                eccodes.codes_set(handle, "typeOfLevel", type_of_level)
+                if level is not None:
+                    eccodes.codes_set(handle, "level", level)
+                eccodes.codes_set(handle, "shortName", short_name)
+                eccodes.codes_set(handle, "stepRange", str(lead_time))
+                eccodes.codes_set_values(handle, np.full(12, float(lead_time)))
+                start = f.tell()
+                eccodes.codes_write(handle, f)
+                layout.append((start, f.tell() - start))
+                eccodes.codes_release(handle)
+        return layout
+
+    write.messages = GRIB_MESSAGES
+    return write
+
+
+@pytest.fixture
+def make_partition():
+    """Return a function creating a small NCSS-like partition.
+
+    The function takes a lead time in hours (and optionally the grid size) and
+    returns a ``(time, latitude, longitude)`` dataset of the 10 m u-wind whose
+    values equal the lead time.
+    """
+
+    def make(lead_time, nlat=3, nlon=4):
+        valid_time = pd.Timestamp(NCSS_CYCLE) + pd.Timedelta(hours=lead_time)
+        data = np.full((1, nlat, nlon), float(lead_time), dtype="float32")
+        return xr.Dataset(
+            {
+                "u-component_of_wind_height_above_ground": (
+                    ("time", "latitude", "longitude"),
+                    data,
+                )
+            },
+            coords={
+                "time": [valid_time.to_datetime64()],
+                "latitude": np.linspace(10, -10, nlat),
+                "longitude": np.linspace(0, 30, nlon),
+            },
+        )
+
+    return make
+
+
+@pytest.fixture
+def publish_ncss_partitions(http_server, make_partition):
+    """Return a function publishing NCSS-like responses on ``http_server``.
+
+    The function takes a list of lead times and writes a NetCDF partition for
+    each of them where the NetcdfSubset URLs of the 2024-01-15 12Z cycle point.
+    """
+
+    def publish(lead_times):
+        for lead_time in lead_times:
+            path = (
+                http_server.root
+                / "ncss/grid/files/g/d084001/2024/20240115"
+                / f"gfs.0p25.2024011512.f{lead_time:03d}.grib2"
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            make_partition(lead_time).to_netcdf(path)
+
+    return publish
+
+
+@pytest.fixture
+def publish_ncss_collection(http_server, make_partition):
+    """Return a function publishing a forecast collection on ``http_server``.
+
+    The function takes a list of lead times and writes one NetCDF response
+    holding all of them where the collection (``ncss_collection``) URLs point.
+    """
+
+    def publish(lead_times):
+        path = http_server.root / "ncss/grid/aggregations/g/d084001/1/TwoD"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        ds = xr.concat([make_partition(lt) for lt in lead_times], dim="time")
+        ds.to_netcdf(path)
+
+    return publish
+
+
+@pytest.fixture
+def publish_grib(http_server, write_grib):
+    """Return a function publishing GRIB2 files on ``http_server``.
+
+    The function takes a lead time, writes the ``write_grib`` file where the
+    fileServer URL of the 2024-01-15 12Z cycle points and, with ``idx=True``,
+    a wgrib2-style ``.idx`` inventory next to it. It returns the
+    ``(offset, length)`` of the written messages.
+    """
+
+    def publish(lead_time, idx=False):
+        path = (
+            http_server.root
+            / "fileServer/files/g/d084001/2024/20240115"
+            / f"gfs.0p25.2024011512.f{lead_time:03d}.grib2"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        layout = write_grib(path, lead_time)
+        if idx:
+            lines = []
+            for n, ((short_name, _, level), (offset, _)) in enumerate(
+                zip(write_grib.messages, layout), start=1
+            ):
+                variable, level_text = IDX_LEVELS[short_name]
+                level_text = level_text or f"{level} mb"
+                lines.append(
+                    f"{n}:{offset}:d=2024011512:{variable}:{level_text}:3 hour fcst:"
+                )
+            path.with_name(path.name + ".idx").write_text("\n".join(lines) + "\n")
+        return layout
+
+    return publish
+
+
+@pytest.fixture
+def source_kwargs():
+    """Default arguments of ``make_source``, overridden by test classes."""
+    return {}
+
+
+@pytest.fixture
+def make_source(http_server, source_kwargs):
+    """Return a function creating a source that reads from ``http_server``.
+
+    Sources read the 2024-01-15 12Z cycle up to f009 with NetcdfSubset. The
+    ``source_kwargs`` fixture and the keyword arguments of the function
+    override these settings, in that order.
+    """
+    from intake_gfs_ncar.gfs_intake_driver import GFSForecastSource
+
+    def make(**kwargs):
+        kwargs = {
+            "cycle": NCSS_CYCLE,
+            "max_lead_time": 9,
+            "base_url": http_server.url,
+            "access_method": "ncss",
+            **source_kwargs,
+            **kwargs,
+        }
+        if kwargs.get("cache_dir") is not None:
+            kwargs["cache_dir"] = str(kwargs["cache_dir"])
+        return GFSForecastSource(**kwargs)
+
+    return make
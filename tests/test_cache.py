@@ -0,0 +1,286 @@
+"""Tests for the download, partition and schema caches."""
+
+import glob
+import os
+import time
+
+import pytest
+
+from intake_gfs_ncar import cache
+from intake_gfs_ncar.gfs_intake_driver import GFSForecastSource
+
+CYCLE = "2024-01-15T12:00:00"
+
+
+@pytest.fixture(autouse=True)
+def no_cache_env(monkeypatch):
+    """Ignore cache settings from the environment of the test run."""
+    monkeypatch.delenv(cache.CACHE_DIR_ENV, raising=False)
+    monkeypatch.delenv(cache.CACHE_MAX_AGE_ENV, raising=False)
+
+
+def add_entry(download_cache, url, nbytes, age=0):
+    """Commit an entry of ``nbytes`` bytes last used ``age`` seconds ago."""
+    key = cache.cache_key(url)
+    tmp_path = download_cache.temp_path(key, ".nc")
+    with open(tmp_path, "wb") as f:
+        f.write(b"x" * nbytes)
+    path = download_cache.commit(tmp_path, key, ".nc")
+    atime = time.time() - age
+    os.utime(path, (atime, atime))
+    return path
+
+
+class TestDownloadCache:
+    """Test the content-addressed download cache."""
+
+    def test_cache_key_normalizes_url(self):
+        """Test that equivalent URLs share a key and byte ranges do not."""
+        url = (
+            "https://THREDDS.rda.ucar.edu/thredds/ncss/grid/f.grib2?var=a&accept=netcdf"
+        )
+        same = (
+            "https://thredds.rda.ucar.edu/thredds/ncss/grid/f.grib2?accept=netcdf&var=a"
+        )
+
+        assert cache.cache_key(url) == cache.cache_key(same)
+        assert cache.cache_key(url) != cache.cache_key(url, [(0, 99)])
+
+    def test_commit_and_get(self, tmp_path):
+        """Test that committed entries are found and partial files are not."""
+        download_cache = cache.DownloadCache(str(tmp_path))
+        key = cache.cache_key("http://example.com/a.grib2")
+
+        tmp_file = download_cache.temp_path(key, ".grib2")
+        assert download_cache.get(key, ".grib2") is None
+        with open(tmp_file, "wb") as f:
+            f.write(b"GRIB")
+        assert download_cache.get(key, ".grib2") is None
+
+        path = download_cache.commit(tmp_file, key, ".grib2")
+        assert download_cache.get(key, ".grib2") == path
+        assert not os.path.exists(tmp_file)
+
+    def test_lru_eviction_by_size(self, tmp_path):
+        """Test that least recently used entries are evicted beyond max_size."""
+        download_cache = cache.DownloadCache(str(tmp_path), max_size=250)
+        oldest = add_entry(download_cache, "http://example.com/1", 100, age=30)
+        used = add_entry(download_cache, "http://example.com/2", 100, age=20)
+        download_cache.get(cache.cache_key("http://example.com/2"), ".nc")
+
+        newest = add_entry(download_cache, "http://example.com/3", 100)
+
+        assert not os.path.exists(oldest)
+        assert os.path.exists(used)
+        assert os.path.exists(newest)
+        assert download_cache.size() == 200
+
+    def test_eviction_by_age(self, tmp_path):
+        """Test that entries unused for longer than max_age are evicted."""
+        download_cache = cache.DownloadCache(str(tmp_path), max_age=60)
+        stale = add_entry(download_cache, "http://example.com/1", 10, age=120)
+        fresh = add_entry(download_cache, "http://example.com/2", 10)
+
+        assert not os.path.exists(stale)
+        assert os.path.exists(fresh)
+
+
+class TestCachedRead:
+    """Test reading partitions through the download cache."""
+
+    def test_cache_hit_skips_network(
+        self, http_server, tmp_path, make_source, publish_ncss_partitions
+    ):
+        """Test that a second source reads cached partitions without requests."""
+        publish_ncss_partitions([0, 3])
+
+        first = make_source(max_lead_time=3, cache_dir=tmp_path).read()
+        assert len(http_server.requests) == 2
+
+        second = make_source(max_lead_time=3, cache_dir=tmp_path).read()
+        assert len(http_server.requests) == 2
+        assert first.identical(second)
+
+    def test_cache_dir_from_environment(self, monkeypatch, tmp_path):
+        """Test that the cache directory defaults to the environment variable."""
+        monkeypatch.setenv(cache.CACHE_DIR_ENV, str(tmp_path))
+
+        source = GFSForecastSource(cycle=CYCLE)
+
+        assert source.cache.cache_dir == str(tmp_path)
+
+    def test_cache_disabled_by_default(self):
+        """Test that no cache is used unless configured."""
+        assert GFSForecastSource(cycle=CYCLE).cache is None
+
+
+class TestPartitionCache:
+    """Test the process-wide cache of decoded partitions."""
+
+    def test_lru_memory_budget(self, make_partition):
+        """Test that least recently used partitions are evicted over budget."""
+        partitions = cache.PartitionCache(max_bytes=3 * make_partition(0).nbytes)
+        for lead_time in (0, 3, 6):
+            partitions.put(lead_time, make_partition(lead_time))
+        partitions.get(0)
+        partitions.put(9, make_partition(9))
+
+        assert partitions.get(3) is None
+        assert partitions.get(0) is not None
+        assert len(partitions) == 3
+
+    def test_cached_arrays_are_read_only(self, make_partition):
+        """Test that cached arrays cannot be modified through a shared view."""
+        partitions = cache.PartitionCache()
+        partitions.put(0, make_partition(0))
+
+        ds = partitions.get(0)
+
+        with pytest.raises(ValueError, match="read-only"):
+            ds["u-component_of_wind_height_above_ground"].values[...] = 1
+        assert cache.writeable(ds) is not ds
+        assert cache.writeable(cache.writeable(ds)).identical(ds)
+
+    def test_modified_result_leaves_cache_intact(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that modifying a returned dataset does not change a re-read."""
+        publish_ncss_partitions([0, 3])
+
+        single = make_source(max_lead_time=3).read_lead_time(3)
+        single["u10"] += 100
+        single["u10"].values[...] = -1
+        ds = make_source(max_lead_time=3).read()
+        ds["u10"].values[...] = -1
+        first = make_source(max_lead_time=3, lead_times=[0]).read()
+        first["u10"].values[...] = -1
+
+        assert len(http_server.requests) == 2
+        for lead_time in (0, 3):
+            again = make_source(max_lead_time=3).read_lead_time(lead_time)
+            assert float(again.u10.max()) == lead_time
+        assert len(http_server.requests) == 2
+
+    def test_new_source_only_fetches_new_lead_times(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that a longer forecast reuses partitions read by another source."""
+        publish_ncss_partitions([0, 3, 6, 9])
+
+        make_source(max_lead_time=3).read()
+        assert len(http_server.requests) == 2
+
+        ds = make_source(max_lead_time=9).read()
+        assert len(http_server.requests) == 4
+        assert ds.sizes["time"] == 4
+
+    def test_memory_cache_disabled(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that memory_cache=False always reads from the server."""
+        publish_ncss_partitions([0])
+
+        make_source(max_lead_time=1, memory_cache=False).read()
+        make_source(max_lead_time=1, memory_cache=False).read()
+
+        assert len(http_server.requests) == 2
+
+
+class TestSchemaCache:
+    """Test the persistent schema cache."""
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(memory_cache=False)
+
+    def test_schema_reused_across_cycles(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that a source for another cycle discovers without any request."""
+        publish_ncss_partitions([0])
+        first = make_source(max_lead_time=3).discover()
+        assert len(http_server.requests) == 1
+
+        second = make_source(cycle="2024-01-16T00:00:00").discover()
+
+        assert len(http_server.requests) == 1
+        assert second["metadata"]["variables"] == first["metadata"]["variables"]
+        assert second["shape"] == first["shape"]
+        assert second["npartitions"] == 4
+
+    def test_expired_schema_is_rediscovered(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that schemas older than the TTL are discovered again."""
+        publish_ncss_partitions([0])
+        source = make_source(schema_cache_ttl=60)
+        source.discover()
+        path = source.schema_cache.path(source._schema_cache_key())
+        os.utime(path, (time.time() - 120, time.time() - 120))
+
+        make_source(schema_cache_ttl=60).discover()
+
+        assert len(http_server.requests) == 2
+
+    def test_schema_cache_disabled(
+        self, http_server, isolated_schema_cache, make_source, publish_ncss_partitions
+    ):
+        """Test that schema_cache_ttl=0 neither reads nor writes the cache."""
+        publish_ncss_partitions([0])
+        make_source(schema_cache_ttl=0).discover()
+        make_source(schema_cache_ttl=0).discover()
+
+        assert len(http_server.requests) == 2
+        assert os.listdir(isolated_schema_cache) == []
+
+    def test_filter_keys_change_the_key(self):
+        """Test that entries with different filters do not share a schema."""
+        winds = GFSForecastSource(
+            cycle=CYCLE, cfgrib_filter_by_keys={"shortName": "10u"}
+        )
+        ice = GFSForecastSource(cycle=CYCLE, cfgrib_filter_by_keys={"shortName": "ci"})
+        winds._build_urls()
+        ice._build_urls()
+
+        assert winds._schema_cache_key() != ice._schema_cache_key()
+
+
+class TestGribIndexFiles:
+    """Test persistent cfgrib indexes for cached GRIB2 files."""
+
+    def test_index_reused_for_cached_files(
+        self, http_server, publish_grib, make_source, tmp_path
+    ):
+        """Test that decodes of a cached file with other filters skip the scan."""
+        from cfgrib.messages import FileIndex
+
+        publish_grib(3)
+        kwargs = dict(
+            max_lead_time=3,
+            access_method="fileServer",
+            cfgrib_filter_by_keys={"typeOfLevel": "heightAboveGround"},
+            use_grib_index=False,
+            memory_cache=False,
+            cache_dir=tmp_path / "cache",
+        )
+        first = make_source(**kwargs)._get_partition(1)
+        index_files = glob.glob(str(tmp_path / "cache" / "*" / "*.grib2.*.idx"))
+        assert len(index_files) == 1
+
+        scans = []
+        from_fieldset = FileIndex.from_fieldset.__func__
+
+        def counting_from_fieldset(cls, *args, **kwargs):
+            scans.append(args)
+            return from_fieldset(cls, *args, **kwargs)
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(FileIndex, "from_fieldset", classmethod(counting_from_fieldset))
+            time.sleep(0.01)
+            kwargs["cfgrib_filter_by_keys"] = {"typeOfLevel": "isobaricInhPa"}
+            second = make_source(**kwargs)._get_partition(1)
+
+        assert scans == []
+        assert len(http_server.requests) == 1
+        assert set(first.data_vars) == {"u10", "v10"}
+        assert list(second.data_vars) == ["t"]
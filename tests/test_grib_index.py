@@ -0,0 +1,272 @@
+"""Tests for GRIB inventories and byte-range message downloads."""
+
+import asyncio
+import os
+import signal
+
+import pytest
+import xarray as xr
+
+from intake_gfs_ncar import decode, grib_index
+from intake_gfs_ncar.gfs_intake_driver import GFSForecastSource
+
+CYCLE = "2024-01-15T12:00:00"
+
+WIND_FILTER = {
+    "typeOfLevel": "heightAboveGround",
+    "level": 10,
+    "shortName": ["10u", "10v"],
+}
+
+
+class TestInventoryParsing:
+    """Test parsing and matching of GRIB inventories."""
+
+    IDX = (
+        "1:0:d=2024011512:PRMSL:mean sea level:3 hour fcst:\n"
+        "2:100:d=2024011512:UGRD:10 m above ground:3 hour fcst:\n"
+        "3:250:d=2024011512:VGRD:10 m above ground:3 hour fcst:\n"
+        "4:400:d=2024011512:UGRD:500 mb:3 hour fcst:\n"
+        "5:480:d=2024011512:ICEC:surface:3 hour fcst:\n"
+    )
+
+    def test_parse_idx(self):
+        """Test that offsets and lengths are read from an .idx inventory."""
+        messages = grib_index.parse_idx(self.IDX)
+
+        assert [(m.offset, m.length) for m in messages] == [
+            (0, 100),
+            (100, 150),
+            (250, 150),
+            (400, 80),
+            (480, None),
+        ]
+        assert messages[1].fields == {"variable": "UGRD", "level": "10 m above ground"}
+
+    def test_select_and_merge_ranges(self):
+        """Test that matching messages are merged into contiguous ranges."""
+        messages = grib_index.parse_idx(self.IDX)
+
+        winds = grib_index.select_messages(messages, WIND_FILTER)
+        assert grib_index.byte_ranges(winds) == [(100, 399)]
+
+        ice = grib_index.select_messages(
+            messages, {"typeOfLevel": "surface", "shortName": "ci"}
+        )
+        assert grib_index.byte_ranges(ice) == [(480, None)]
+
+    def test_unknown_short_name_downloads_everything(self):
+        """Test that untranslatable filters fall back to a full download."""
+        messages = grib_index.parse_idx(self.IDX)
+
+        assert grib_index.select_messages(messages, {"shortName": "xyz"}) is None
+        assert grib_index.select_messages(messages, {}) is None
+
+
+class TestByteRangeRead:
+    """Test reading GRIB partitions with HTTP Range requests."""
+
+    @pytest.fixture(autouse=True)
+    def clear_inventories(self, monkeypatch):
+        monkeypatch.setattr(grib_index, "inventories", grib_index.InventoryCache())
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(
+            max_lead_time=3,
+            access_method="fileServer",
+            cfgrib_filter_by_keys=WIND_FILTER,
+        )
+
+    def test_read_with_idx_sidecar(self, http_server, publish_grib, make_source):
+        """Test that only the wind messages are requested when an .idx exists."""
+        layout = publish_grib(3, idx=True)
+
+        ds = make_source()._get_partition(1)
+
+        assert set(ds.data_vars) == {"u10", "v10"}
+        start = layout[1][0]
+        end = layout[3][0] - 1
+        assert http_server.range_requests()[-1] == f"bytes={start}-{end}"
+
+    def test_read_async_with_idx_sidecar(self, http_server, publish_grib, make_source):
+        """Test that read_async() also requests only the wind messages."""
+        layouts = {lead_time: publish_grib(lead_time, idx=True) for lead_time in (0, 3)}
+
+        ds = asyncio.run(make_source(memory_cache=False).read_async())
+
+        assert ds.sizes["step"] == 2
+        ranges = [r for r in http_server.range_requests() if r is not None]
+        start, end = layouts[3][1][0], layouts[3][3][0] - 1
+        assert ranges == [f"bytes={start}-{end}"] * 2
+        assert len(http_server.requests) == 4
+
+    def test_inventory_built_from_first_scan(
+        self, http_server, publish_grib, make_source
+    ):
+        """Test that a full download is scanned and reused for range reads."""
+        publish_grib(3)
+
+        first = make_source(memory_cache=False)._get_partition(1)
+        assert http_server.range_requests() == [None, None]
+
+        second = make_source(memory_cache=False)._get_partition(1)
+        assert http_server.range_requests()[-1].startswith("bytes=")
+        assert first.u10.equals(second.u10)
+
+    def test_disabled_grib_index(self, http_server, publish_grib, make_source):
+        """Test that use_grib_index=False always downloads the whole file."""
+        publish_grib(3, idx=True)
+
+        make_source(use_grib_index=False)._get_partition(1)
+
+        assert http_server.range_requests() == [None]
+
+    def test_schema_reads_only_matching_messages(
+        self, http_server, publish_grib, make_source
+    ):
+        """Test that discover() fetches byte ranges and read() reuses them."""
+        publish_grib(0, idx=True)
+        publish_grib(3)
+        source = make_source()
+
+        schema = source.discover()
+
+        assert set(schema["metadata"]["variables"]) == {"u10", "v10"}
+        assert schema["metadata"]["access_method"] == "fileServer"
+        assert http_server.range_requests()[-1].startswith("bytes=")
+        n_requests = len(http_server.requests)
+
+        ds = source.read()
+        assert ds.sizes["step"] == 2
+        # Only the second lead time (and its missing .idx) is requested
+        assert len(http_server.requests) == n_requests + 2
+
+    def test_refresh_appends_steps(self, publish_grib, make_source):
+        """Test that refresh() stacks a new GRIB lead time along step."""
+        publish_grib(0)
+        source = make_source(memory_cache=False)
+        assert "step" not in source.read().dims
+
+        publish_grib(3)
+        ds = source.refresh()
+
+        assert ds.sizes["step"] == 2
+        xr.testing.assert_equal(ds, make_source(memory_cache=False).read())
+
+
+class TestReadMany:
+    """Test decoding several filter sets from one download per lead time."""
+
+    FILTERS = {
+        "winds": WIND_FILTER,
+        "ice": {"typeOfLevel": "surface", "shortName": "ci"},
+    }
+
+    @pytest.fixture(autouse=True)
+    def clear_inventories(self, monkeypatch):
+        monkeypatch.setattr(grib_index, "inventories", grib_index.InventoryCache())
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(max_lead_time=3, access_method="fileServer", memory_cache=False)
+
+    def grib_requests(self, server):
+        return [path for _, path, _ in server.requests if path.endswith(".grib2")]
+
+    def test_one_range_request_per_file(self, http_server, publish_grib, make_source):
+        """Test that the messages of all filter sets are fetched together."""
+        layouts = {lead_time: publish_grib(lead_time, idx=True) for lead_time in (0, 3)}
+
+        datasets = make_source().read_many(self.FILTERS)
+
+        assert set(datasets["winds"].data_vars) == {"u10", "v10"}
+        assert set(datasets["ice"].data_vars) == {"siconc"}
+        assert list(datasets["ice"].siconc.isel(latitude=0, longitude=0).values) == [
+            0,
+            3,
+        ]
+        # One request per merged byte range, none repeated per filter set
+        layout = layouts[3]
+        assert len(self.grib_requests(http_server)) == 4
+        assert [
+            headers.get("Range")
+            for _, path, headers in http_server.requests
+            if path.endswith("f003.grib2")
+        ] == [
+            f"bytes={layout[1][0]}-{layout[3][0] - 1}",
+            f"bytes={layout[5][0]}-",
+        ]
+
+    def test_matches_separate_reads(self, http_server, publish_grib, make_source):
+        """Test that a full download is decoded once per filter set."""
+        for lead_time in (0, 3):
+            publish_grib(lead_time)
+
+        datasets = make_source(use_grib_index=False).read_many(self.FILTERS)
+        assert len(self.grib_requests(http_server)) == 2
+
+        for name, filter_by_keys in self.FILTERS.items():
+            expected = make_source(cfgrib_filter_by_keys=filter_by_keys).read()
+            xr.testing.assert_equal(datasets[name], expected)
+        assert not list(http_server.root.glob("**/*.idx"))
+
+    def test_memory_cache(self, http_server, publish_grib, make_source):
+        """Test that decoded partitions are shared through the memory cache."""
+        for lead_time in (0, 3):
+            publish_grib(lead_time)
+
+        first = make_source(memory_cache=True).read_many(self.FILTERS)
+        n_requests = len(http_server.requests)
+        second = make_source(memory_cache=True).read_many(self.FILTERS)
+
+        assert len(http_server.requests) == n_requests
+        for name in self.FILTERS:
+            xr.testing.assert_equal(first[name], second[name])
+
+
+class TestProcessDecode:
+    """Test decoding GRIB2 files in a process pool."""
+
+    @pytest.fixture(autouse=True)
+    def shutdown_pools(self):
+        yield
+        decode.shutdown_pools()
+
+    def test_decode_processes_validation(self):
+        """Test that decode_processes must be a non-negative integer."""
+        with pytest.raises(ValueError, match="Invalid decode_processes"):
+            GFSForecastSource(cycle=CYCLE, decode_processes=-1)
+
+    def test_matches_thread_decode(self, publish_grib, make_source):
+        """Test that process-pool decoding gives the same dataset."""
+        for lead_time in (0, 3):
+            publish_grib(lead_time)
+        kwargs = dict(
+            max_lead_time=3,
+            access_method="fileServer",
+            cfgrib_filter_by_keys=WIND_FILTER,
+            memory_cache=False,
+        )
+
+        ds = make_source(decode_processes=2, **kwargs).read()
+
+        assert list(decode._pools) == [2]
+        xr.testing.assert_equal(ds, make_source(**kwargs).read())
+
+    def test_broken_pool_is_replaced(self, tmp_path, write_grib):
+        """Test that decoding recovers after a worker process died."""
+        path = str(tmp_path / "gfs.grib2")
+        write_grib(path, 3)
+        backend_kwargs = {"filter_by_keys": WIND_FILTER, "indexpath": ""}
+        pool = decode.get_pool(1)
+        os.kill(pool.submit(os.getpid).result(), signal.SIGKILL)
+
+        ds = decode.decode_grib_in_pool(1, path, backend_kwargs)
+
+        assert decode._pools[1] is not pool
+        assert set(ds.data_vars) == {"u10", "v10"}
+        with xr.open_dataset(
+            path, engine="cfgrib", backend_kwargs=backend_kwargs
+        ) as expected:
+            xr.testing.assert_identical(ds, expected.load())
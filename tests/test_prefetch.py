@@ -0,0 +1,91 @@
+"""Tests for the download cache prefetcher."""
+
+import pytest
+
+from intake_gfs_ncar import prefetch
+from intake_gfs_ncar.gfs_intake_driver import GFSForecastSource
+
+
+class TestPrefetch:
+    """Test warming the download cache."""
+
+    @pytest.fixture
+    def source_kwargs(self, tmp_path):
+        return dict(cache_dir=tmp_path)
+
+    def test_prefetch_and_resume(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that a second run only downloads the missing partitions."""
+        publish_ncss_partitions([0, 3, 6])
+        reported = []
+
+        first = prefetch.prefetch(make_source(), workers=2, report=reported.append)
+
+        assert sorted(r.index for r in reported) == [0, 1, 2, 3]
+        assert [r.error is None for r in first] == [True, True, True, False]
+        assert all(r.nbytes > 0 for r in first[:3])
+        assert len(http_server.requests) == 4
+
+        publish_ncss_partitions([9])
+        second = prefetch.prefetch(make_source(), workers=2)
+
+        assert [r.cached for r in second] == [True, True, True, False]
+        assert second[3].nbytes > 0
+        assert len(http_server.requests) == 5
+        assert prefetch.format_summary(second, 1.0).startswith(
+            "Prefetched 4/4 partitions (3 already cached, 0 failed)"
+        )
+
+    def test_consumers_read_from_cache(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that a source sharing the cache reads without any request."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        prefetch.prefetch(make_source())
+        n_requests = len(http_server.requests)
+
+        ds = make_source(memory_cache=False).read()
+
+        assert ds.sizes["time"] == 4
+        assert len(http_server.requests) == n_requests
+
+    def test_grib_files_are_not_decoded(
+        self, http_server, make_source, publish_grib, monkeypatch
+    ):
+        """Test that only the matching GRIB messages are downloaded, undecoded."""
+        for lead_time in (0, 3):
+            publish_grib(lead_time, idx=True)
+        kwargs = dict(
+            max_lead_time=3,
+            access_method="fileServer",
+            cfgrib_filter_by_keys={"typeOfLevel": "heightAboveGround", "level": 10},
+        )
+
+        def fail_decode(self, *args, **kwargs):
+            raise AssertionError("prefetch must not decode files")
+
+        with monkeypatch.context() as m:
+            m.setattr(GFSForecastSource, "_open_grib_file", fail_decode)
+            results = prefetch.prefetch(make_source(**kwargs))
+
+        assert [r.error for r in results] == [None, None]
+        ranges = [r for r in http_server.range_requests() if r is not None]
+        assert len(ranges) == 2 and all(r.startswith("bytes=") for r in ranges)
+        n_requests = len(http_server.requests)
+
+        ds = make_source(**kwargs).read()
+        assert set(ds.data_vars) == {"u10", "v10"}
+        assert len(http_server.requests) == n_requests
+
+    def test_requires_cache(self, make_source):
+        """Test that prefetching without a download cache is rejected."""
+        source = make_source(cache_dir=None)
+        with pytest.raises(ValueError, match="requires a download cache"):
+            prefetch.prefetch(source)
+
+    def test_cli_requires_cache_dir(self, monkeypatch):
+        """Test that the command line refuses to run without a cache."""
+        monkeypatch.delenv("INTAKE_GFS_NCAR_CACHE_DIR", raising=False)
+        with pytest.raises(SystemExit):
+            prefetch.main(["--entry", "gfs_surface_winds"])
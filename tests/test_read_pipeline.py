@@ -0,0 +1,870 @@
+"""Offline tests for the partition read pipeline of the GFS intake driver.
+
+These tests replace the network-facing partition readers with synthetic
+datasets so that they can run without access to the NCAR THREDDS server.
+"""
+
+import asyncio
+import os
+import pickle
+import threading
+import time
+from datetime import datetime
+from datetime import time as dt_time
+from datetime import timedelta
+
+import dask
+import numpy as np
+import pandas as pd
+import pytest
+import xarray as xr
+
+from intake_gfs_ncar import assemble, cache, gfs_intake_driver
+from intake_gfs_ncar.gfs_intake_driver import GFSForecastSource
+
+CYCLE = "2024-01-15T12:00:00"
+
+
+class TestConcurrentRead:
+    """Test concurrent partition fetching in read()."""
+
+    def test_max_workers_validation(self):
+        """Test that max_workers must be a positive integer."""
+        assert GFSForecastSource(cycle=CYCLE, max_workers=8).max_workers == 8
+        with pytest.raises(ValueError, match="Invalid max_workers"):
+            GFSForecastSource(cycle=CYCLE, max_workers=0)
+
+    def test_read_is_concurrent_and_ordered(self, monkeypatch, make_partition):
+        """Test that partitions are fetched in parallel but combined in order."""
+        source = GFSForecastSource(cycle=CYCLE, max_lead_time=12, max_workers=4)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_get_partition(i):
+            with lock:
+                active.append(i)
+                peak.append(len(active))
+            # Later lead times finish first to check ordering is preserved
+            time.sleep(0.05 * (len(source._urls) - i))
+            with lock:
+                active.remove(i)
+            return make_partition(3 * i)
+
+        monkeypatch.setattr(source, "_get_partition", fake_get_partition)
+        ds = source.read()
+
+        assert max(peak) > 1
+        assert max(peak) <= 4
+        assert ds.sizes["time"] == 5
+        assert list(ds["u10"].isel(latitude=0, longitude=0).values) == [
+            0,
+            3,
+            6,
+            9,
+            12,
+        ]
+
+    def test_read_skips_failed_partitions(self, monkeypatch, make_partition):
+        """Test that a failing partition is skipped and the rest are combined."""
+        source = GFSForecastSource(cycle=CYCLE, max_lead_time=12, max_workers=3)
+
+        def fake_get_partition(i):
+            if i == 2:
+                raise IOError("Data not found (HTTP 404)")
+            return make_partition(3 * i)
+
+        monkeypatch.setattr(source, "_get_partition", fake_get_partition)
+        ds = source.read()
+
+        assert ds.sizes["time"] == 4
+        assert 6 not in ds["u10"].isel(latitude=0, longitude=0).values
+
+
+class TestHTTPSession:
+    """Test the pooled HTTP session used for THREDDS requests."""
+
+    def test_sources_share_session(self):
+        """Test that identically configured sources share one session."""
+        source1 = GFSForecastSource(cycle=CYCLE, max_workers=2)
+        source2 = GFSForecastSource(cycle=CYCLE, max_workers=2)
+        source3 = GFSForecastSource(cycle=CYCLE, http_retries=0)
+
+        assert source1.session is source2.session
+        assert source1.session is not source3.session
+        adapter = source1.session.get_adapter("https://thredds.rda.ucar.edu")
+        assert adapter.max_retries.total == 3
+
+    def test_read_through_session(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that read() downloads every partition through the session."""
+        publish_ncss_partitions([0, 3, 6])
+        source = make_source(max_lead_time=6)
+
+        ds = source.read()
+
+        assert ds.sizes["time"] == 3
+        assert len(http_server.requests) == 3
+
+    def test_missing_partition_raises_ioerror(self, make_source):
+        """Test that a 404 is reported as an IOError with context."""
+        source = make_source(max_lead_time=3)
+
+        with pytest.raises(IOError, match="HTTP 404"):
+            source._get_partition(0)
+
+
+class TestAsyncRead:
+    """Test the asyncio read API."""
+
+    def test_read_async(self, make_source, publish_ncss_partitions):
+        """Test that read_async() matches the blocking read()."""
+        publish_ncss_partitions([0, 3, 6])
+
+        ds_async = asyncio.run(make_source(max_lead_time=6).read_async())
+        ds_sync = make_source(max_lead_time=6).read()
+
+        xr.testing.assert_identical(ds_async, ds_sync)
+
+    def test_iter_partitions_async_skips_missing(
+        self, make_source, publish_ncss_partitions
+    ):
+        """Test that the async iterator yields partitions in order, skipping gaps."""
+        publish_ncss_partitions([0, 6, 9])
+        source = make_source()
+
+        async def collect():
+            return [ds async for ds in source.iter_partitions_async()]
+
+        datasets = asyncio.run(collect())
+
+        assert [float(ds.u10.values[0, 0, 0]) for ds in datasets] == [0, 6, 9]
+
+    def test_iter_partitions_async_bounds_look_ahead(
+        self, monkeypatch, make_source, publish_ncss_partitions
+    ):
+        """Test that a slow consumer limits how many partitions are read ahead."""
+        publish_ncss_partitions([0, 3, 6, 9, 12, 15])
+        source = make_source(max_lead_time=15, max_workers=2)
+        started = []
+        get_partition_async = source._get_partition_async
+
+        async def tracked(client, i, semaphore=None):
+            started.append(i)
+            return await get_partition_async(client, i, semaphore)
+
+        monkeypatch.setattr(source, "_get_partition_async", tracked)
+
+        async def consume():
+            outstanding = []
+            consumed = 0
+            async for _ in source.iter_partitions_async():
+                consumed += 1
+                # Give every scheduled task time to finish while consuming
+                await asyncio.sleep(0.2)
+                outstanding.append(len(started) - consumed)
+            return outstanding
+
+        outstanding = asyncio.run(consume())
+
+        assert len(outstanding) == 6
+        assert max(outstanding) <= 2
+        assert sorted(started) == list(range(6))
+
+
+class TestLazyDask:
+    """Test the lazy dask graph returned by to_dask()."""
+
+    def test_to_dask_downloads_lazily(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that only the template and selected lead times are fetched."""
+        publish_ncss_partitions([0, 3, 6, 9])
+
+        ds = make_source().to_dask()
+        assert ds.sizes["time"] == 4
+        assert ds.u10.chunks is not None
+        assert len(http_server.requests) == 1
+
+        value = ds.u10.sel(time="2024-01-15T18:00").isel(latitude=0, longitude=0)
+        assert float(value.compute()) == 6
+        assert len(http_server.requests) == 2
+
+    def test_to_dask_matches_read(self, make_source, publish_ncss_partitions):
+        """Test that computing the lazy dataset gives the same data as read()."""
+        publish_ncss_partitions([0, 3, 6, 9])
+
+        lazy = make_source().to_dask()
+        eager = make_source(memory_cache=False).read()
+
+        xr.testing.assert_allclose(lazy.compute(), eager)
+
+    def test_to_dask_fills_missing_partitions(
+        self, make_source, publish_ncss_partitions
+    ):
+        """Test that a partition missing at compute time becomes NaN."""
+        publish_ncss_partitions([0, 3, 9])
+
+        ds = make_source().to_dask().compute()
+
+        assert np.isnan(ds.u10.isel(time=2)).all()
+        assert float(ds.u10.isel(time=3, latitude=0, longitude=0)) == 9
+
+    def test_to_dask_in_processes(self, make_source, publish_ncss_partitions):
+        """Test that the graph can be computed by other processes."""
+        publish_ncss_partitions([0, 3, 6, 9])
+
+        lazy = make_source().to_dask()
+        with dask.config.set(scheduler="processes", num_workers=2):
+            ds = lazy.compute()
+
+        eager = make_source(memory_cache=False).read()
+        xr.testing.assert_allclose(ds, eager)
+
+
+class TestCollectionRead:
+    """Test reading many lead times per request from the forecast collection."""
+
+    def test_collection_urls_are_batched(self):
+        """Test that lead times are split into batches of time ranges."""
+        source = GFSForecastSource(
+            cycle=CYCLE,
+            max_lead_time=24,
+            access_method="ncss_collection",
+            collection_batch_size=4,
+        )
+        urls = source._build_urls()
+
+        assert len(urls) == 3
+        assert "/ncss/grid/aggregations/g/d084001/1/TwoD?" in urls[0]
+        assert "reftime=2024-01-15T12:00:00Z" in urls[0]
+        assert "time_start=2024-01-15T12:00:00Z" in urls[0]
+        assert "time_end=2024-01-15T21:00:00Z" in urls[0]
+        assert "time_start=2024-01-16T00:00:00Z" in urls[1]
+        assert "time_end=2024-01-16T09:00:00Z" in urls[1]
+        assert "time_start=2024-01-16T12:00:00Z" in urls[2]
+        assert "time_end=2024-01-16T12:00:00Z" in urls[2]
+
+    def test_collection_batch_size_validation(self):
+        """Test that collection_batch_size must be a positive integer."""
+        with pytest.raises(ValueError, match="Invalid collection_batch_size"):
+            GFSForecastSource(cycle=CYCLE, collection_batch_size=0)
+
+    def test_read_collection_in_one_request(
+        self,
+        http_server,
+        make_source,
+        publish_ncss_collection,
+        publish_ncss_partitions,
+    ):
+        """Test that one request returns the same data as per-file reads."""
+        publish_ncss_collection([0, 3, 6, 9])
+        publish_ncss_partitions([0, 3, 6, 9])
+
+        ds = make_source(access_method="ncss_collection").read()
+        assert len(http_server.requests) == 1
+
+        expected = make_source(memory_cache=False).read()
+        xr.testing.assert_allclose(ds.drop_attrs(), expected.drop_attrs())
+
+
+class TestInMemoryDownload:
+    """Test decoding NetcdfSubset responses without a temporary file."""
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(max_lead_time=6)
+
+    def track_targets(self, monkeypatch, source):
+        targets = []
+        download_target = source._download_target
+
+        def tracked(*args, **kwargs):
+            targets.append(download_target(*args, **kwargs))
+            return targets[-1]
+
+        monkeypatch.setattr(source, "_download_target", tracked)
+        return targets
+
+    def test_small_responses_stay_in_memory(
+        self, make_source, monkeypatch, publish_ncss_partitions
+    ):
+        """Test that responses below the threshold never touch the disk."""
+        publish_ncss_partitions([0, 3, 6])
+        source = make_source()
+        targets = self.track_targets(monkeypatch, source)
+
+        ds = source.read()
+
+        assert targets == []
+        assert list(ds.u10.isel(latitude=0, longitude=0).values) == [0, 3, 6]
+
+    def test_large_responses_spill_to_disk(
+        self, make_source, monkeypatch, publish_ncss_partitions
+    ):
+        """Test that responses above the threshold are written to a file."""
+        publish_ncss_partitions([0, 3, 6])
+        source = make_source(ncss_memory_threshold=100)
+        targets = self.track_targets(monkeypatch, source)
+
+        ds = source.read()
+
+        assert len(targets) == 3
+        assert not any(os.path.exists(path) for path in targets)
+        assert list(ds.u10.isel(latitude=0, longitude=0).values) == [0, 3, 6]
+
+
+class TestSchema:
+    """Test schema discovery."""
+
+    def test_read_after_discover(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that read() after discover() returns every lead time."""
+        publish_ncss_partitions([0, 3, 6])
+        source = make_source(max_lead_time=6)
+
+        schema = source.discover()
+        assert schema["npartitions"] == 3
+        assert schema["metadata"]["variables"] == ["u10"]
+
+        ds = source.read()
+        assert ds.sizes["time"] == 3
+        assert len(http_server.requests) == 3
+
+    def test_read_after_discover_without_memory_cache(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that the partition read by discover() is reused only once."""
+        publish_ncss_partitions([0, 3, 6])
+        source = make_source(max_lead_time=6, memory_cache=False)
+
+        source.discover()
+        ds = source.read()
+
+        assert ds.sizes["time"] == 3
+        assert len(http_server.requests) == 3
+        assert source._schema_partition is None
+
+
+class TestLatestCycle:
+    """Test resolving cycle='latest' to the newest published cycle."""
+
+    @pytest.fixture(autouse=True)
+    def clear_resolved_cycles(self, monkeypatch):
+        monkeypatch.setattr(gfs_intake_driver, "_latest_cycles", {})
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(cycle="latest", max_lead_time=6, access_method="auto")
+
+    def publish(self, server, cycle, lead_times):
+        for lead_time in lead_times:
+            path = server.root / (
+                f"fileServer/files/g/d084001/{cycle:%Y}/{cycle:%Y%m%d}/"
+                f"gfs.0p25.{cycle:%Y%m%d%H}.f{lead_time:03d}.grib2"
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b"GRIB")
+
+    def newest(self, source):
+        return datetime.combine(source.date, dt_time(hour=source.model_run_time))
+
+    def test_steps_back_to_complete_cycle(self, http_server, make_source):
+        """Test that unpublished cycles are skipped and the result is reused."""
+        source = make_source()
+        cycle = self.newest(source) - timedelta(hours=12)
+        self.publish(http_server, cycle, [0, 3, 6])
+
+        urls = source._build_urls()
+
+        assert f"gfs.0p25.{cycle:%Y%m%d%H}.f000" in urls[0]
+        assert source.metadata["cycle"] == cycle.isoformat()
+        assert all(method == "HEAD" for method, _, _ in http_server.requests)
+        n_requests = len(http_server.requests)
+
+        make_source()._build_urls()
+        assert len(http_server.requests) == n_requests
+
+    def test_resolved_cycle_is_pickled(self, http_server, make_source):
+        """Test that an unpickled source keeps the resolved cycle and URLs."""
+        source = make_source()
+        cycle = self.newest(source) - timedelta(hours=6)
+        self.publish(http_server, cycle, [0, 3, 6])
+        urls = source._build_urls()
+        n_requests = len(http_server.requests)
+
+        restored = pickle.loads(pickle.dumps(source))
+
+        assert restored._urls == urls
+        assert restored.metadata["cycle"] == cycle.isoformat()
+        assert restored._latest is False
+        assert len(http_server.requests) == n_requests
+
+    def test_partial_cycle(self, http_server, make_source):
+        """Test that a cycle with only its first lead times is used."""
+        source = make_source()
+        cycle = self.newest(source) - timedelta(hours=6)
+        self.publish(http_server, cycle - timedelta(hours=6), [0, 3, 6])
+        self.publish(http_server, cycle, [0])
+
+        source._build_urls()
+
+        assert source.metadata["cycle"] == cycle.isoformat()
+
+    def test_discover_uses_cached_schema(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that a schema cache hit does not probe for the latest cycle."""
+        publish_ncss_partitions([0])
+        make_source(cycle=CYCLE, access_method="ncss").discover()
+        n_requests = len(http_server.requests)
+
+        schema = make_source(access_method="ncss").discover()
+
+        assert schema["npartitions"] == 3
+        assert len(http_server.requests) == n_requests
+
+    def test_discover_without_cycle(self, make_source):
+        """Test that discover() returns an error schema if no cycle is found."""
+        schema = make_source().discover()
+
+        assert "No GFS cycle available" in schema["metadata"]["error"]
+        assert schema["npartitions"] == 3
+
+    def test_no_cycle_available(self, http_server, make_source):
+        """Test that a server without any recent cycle raises an IOError."""
+        source = make_source()
+        with pytest.raises(IOError, match="No GFS cycle available"):
+            source._build_urls()
+        # The cycle stays unresolved rather than falling back to the newest one
+        with pytest.raises(IOError, match="No GFS cycle available"):
+            source.read()
+
+        cycle = self.newest(source) - timedelta(hours=6)
+        self.publish(http_server, cycle, [0, 3, 6])
+        source._build_urls()
+        assert source.metadata["cycle"] == cycle.isoformat()
+
+
+class TestIncrementalRead:
+    """Test refresh() and follow() while a cycle is being published."""
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(memory_cache=False)
+
+    def test_refresh_fetches_only_new_lead_times(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that refresh() appends new partitions in lead time order."""
+        publish_ncss_partitions([0])
+        source = make_source()
+        assert source.read().sizes.get("time", 1) == 1
+        n_requests = len(http_server.requests)
+
+        publish_ncss_partitions([3, 9])
+        ds = source.refresh()
+        assert len(http_server.requests) == n_requests + 3
+        assert list(ds.u10.isel(latitude=0, longitude=0).values) == [0, 3, 9]
+
+        publish_ncss_partitions([6])
+        ds = source.refresh()
+        assert len(http_server.requests) == n_requests + 4
+
+        xr.testing.assert_equal(ds, make_source().read())
+
+    def test_refresh_does_not_copy_loaded_lead_times(
+        self, make_source, publish_ncss_partitions
+    ):
+        """Test that new lead times are written next to the loaded ones."""
+        publish_ncss_partitions([0, 3])
+        source = make_source()
+        first = source.refresh()
+
+        publish_ncss_partitions([6])
+        second = source.refresh()
+        publish_ncss_partitions([9])
+        third = source.refresh()
+
+        assert [ds.sizes["time"] for ds in (first, second, third)] == [2, 3, 4]
+        assert np.shares_memory(first.u10.values, third.u10.values)
+        assert np.shares_memory(second.u10.values, third.u10.values)
+        xr.testing.assert_equal(third, make_source().read())
+
+    def test_refresh_after_read_async(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that refresh() after read_async() only fetches new lead times."""
+        publish_ncss_partitions([0, 3])
+        source = make_source()
+        assert asyncio.run(source.read_async()).sizes["time"] == 2
+        n_requests = len(http_server.requests)
+
+        publish_ncss_partitions([6, 9])
+        ds = source.refresh()
+
+        assert len(http_server.requests) == n_requests + 2
+        assert list(ds.u10.isel(latitude=0, longitude=0).values) == [0, 3, 6, 9]
+
+    def test_follow_until_complete(self, make_source, publish_ncss_partitions):
+        """Test that follow() yields on new lead times and stops when done."""
+        publish_ncss_partitions([0, 3])
+        updates = make_source().follow(poll_interval=0)
+
+        assert next(updates).sizes["time"] == 2
+        publish_ncss_partitions([6, 9])
+        assert next(updates).sizes["time"] == 4
+        with pytest.raises(StopIteration):
+            next(updates)
+
+    def test_follow_timeout(self, make_source, publish_ncss_partitions):
+        """Test that follow() gives up after the timeout."""
+        publish_ncss_partitions([0])
+        updates = list(make_source().follow(poll_interval=0, timeout=0))
+        assert len(updates) == 1
+
+
+class TestZarrWrite:
+    """Test streaming partitions to a Zarr store."""
+
+    @pytest.fixture(autouse=True)
+    def require_zarr(self):
+        pytest.importorskip("zarr")
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(memory_cache=False)
+
+    def test_to_zarr_matches_read(
+        self, make_source, tmp_path, monkeypatch, publish_ncss_partitions
+    ):
+        """Test that each partition is loaded once and written to its region."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        source = make_source()
+        loaded = []
+        load_partition = GFSForecastSource._load_partition
+
+        def tracked(self, i):
+            loaded.append(i)
+            return load_partition(self, i)
+
+        # Partitions are read by a copy of the source
+        monkeypatch.setattr(GFSForecastSource, "_load_partition", tracked)
+        source.to_zarr(tmp_path / "gfs.zarr")
+
+        assert sorted(loaded) == [0, 1, 2, 3]
+        ds = xr.open_zarr(tmp_path / "gfs.zarr")
+        xr.testing.assert_allclose(
+            ds.drop_attrs().compute(), make_source().read().drop_attrs()
+        )
+
+    def test_store_arguments_reach_region_writes(
+        self, make_source, tmp_path, monkeypatch, publish_ncss_partitions
+    ):
+        """Test that zarr_format and consolidated apply to every write."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        writes = []
+        to_zarr = xr.Dataset.to_zarr
+
+        def tracked(ds, store, **kwargs):
+            writes.append(kwargs)
+            return to_zarr(ds, store, **kwargs)
+
+        monkeypatch.setattr(xr.Dataset, "to_zarr", tracked)
+        make_source().to_zarr(tmp_path / "gfs.zarr", zarr_format=2, consolidated=False)
+
+        regions = [kwargs for kwargs in writes if "region" in kwargs]
+        assert len(regions) == 4
+        assert all(kwargs["zarr_format"] == 2 for kwargs in regions)
+        assert all(kwargs["consolidated"] is False for kwargs in regions)
+        assert (tmp_path / "gfs.zarr" / ".zgroup").exists()
+        ds = xr.open_zarr(tmp_path / "gfs.zarr", zarr_format=2, consolidated=False)
+        xr.testing.assert_allclose(
+            ds.drop_attrs().compute(), make_source().read().drop_attrs()
+        )
+
+    def test_partition_cache_is_bypassed(
+        self, make_source, tmp_path, publish_ncss_partitions
+    ):
+        """Test that streamed partitions are not kept in the partition cache."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        source = make_source(memory_cache=True)
+
+        source.to_zarr(tmp_path / "gfs.zarr")
+
+        assert len(cache.partitions) == 0
+        assert xr.open_zarr(tmp_path / "gfs.zarr").sizes["time"] == 4
+
+    def test_missing_partition_is_nan(
+        self, make_source, tmp_path, publish_ncss_partitions
+    ):
+        """Test that an unavailable lead time is written as missing values."""
+        publish_ncss_partitions([0, 3, 9])
+
+        make_source().to_zarr(tmp_path / "gfs.zarr")
+
+        ds = xr.open_zarr(tmp_path / "gfs.zarr")
+        assert ds.sizes["time"] == 4
+        assert np.isnan(ds.u10.isel(time=2)).all()
+        assert float(ds.u10.isel(time=3, latitude=0, longitude=0)) == 9
+
+
+class TestPartitionAssembler:
+    """Test assembling partitions into preallocated arrays."""
+
+    def grib_partition(self, lead_time, variables=("u10", "v10")):
+        """Create a cfgrib-like partition with scalar step and valid_time."""
+        step = pd.Timedelta(hours=lead_time).to_timedelta64()
+        cycle = pd.Timestamp(CYCLE).to_datetime64()
+        return xr.Dataset(
+            {
+                name: (("latitude", "longitude"), np.full((3, 4), float(lead_time)))
+                for name in variables
+            },
+            coords={
+                "time": cycle,
+                "step": step,
+                "valid_time": cycle + step,
+                "latitude": np.linspace(10, -10, 3),
+                "longitude": np.linspace(0, 30, 4),
+            },
+        )
+
+    def test_matches_concat(self, make_partition):
+        """Test that assembled GRIB and NCSS partitions match xr.concat."""
+        source = GFSForecastSource(cycle=CYCLE)
+        for make in (self.grib_partition, make_partition):
+            partitions = [make(lead_time) for lead_time in (0, 3, 6)]
+            assembler = assemble.PartitionAssembler(partitions[1], 3)
+            for slot in (1, 2, 0):
+                assert assembler.add(slot, partitions[slot])
+
+            xr.testing.assert_identical(
+                assembler.result().squeeze(), source._combine_partitions(partitions)
+            )
+
+    def test_missing_slots_and_variables(self):
+        """Test that unread slots are dropped and missing variables are NaN."""
+        assembler = assemble.PartitionAssembler(self.grib_partition(3), 4)
+        assert assembler.add(0, self.grib_partition(0, variables=["u10"]))
+        assert assembler.add(3, self.grib_partition(9))
+
+        ds = assembler.result()
+
+        assert list(ds.step.values.astype("timedelta64[h]").astype(int)) == [0, 9]
+        assert np.isnan(ds.v10.isel(step=0)).all()
+        assert float(ds.u10.isel(step=1, latitude=0, longitude=0)) == 9
+
+    def test_mismatched_partition_is_concatenated(self, monkeypatch, make_partition):
+        """Test that read() falls back to concatenation for other layouts."""
+        source = GFSForecastSource(cycle=CYCLE, max_lead_time=6, max_workers=1)
+
+        def fake_get_partition(i):
+            return make_partition(3 * i, nlon=5 if i == 2 else 4)
+
+        monkeypatch.setattr(source, "_get_partition", fake_get_partition)
+        ds = source.read()
+
+        expected = source._combine_partitions(
+            [
+                source._standardize_variable_names(fake_get_partition(i))
+                for i in range(3)
+            ]
+        )
+        xr.testing.assert_identical(ds, expected)
+
+
+class TestStandardization:
+    """Test the cached variable standardization plans."""
+
+    def test_plan_is_reused(self, make_partition):
+        """Test that partitions with one layout share a plan and are renamed."""
+        source = GFSForecastSource(cycle=CYCLE)
+        partitions = [
+            make_partition(lead_time)
+            .rename(time="time1")
+            .assign_coords(reftime2=pd.Timestamp(CYCLE).to_datetime64())
+            for lead_time in (0, 3)
+        ]
+
+        results = [source._standardize_variable_names(ds) for ds in partitions]
+
+        assert len(source._standardize_plans) == 1
+        for ds, original in zip(results, partitions):
+            assert list(ds.data_vars) == ["u10"]
+            assert "time" in ds.dims
+            assert "reftime" in ds.coords and "reftime2" not in ds.coords
+            assert "variable_name_standardization" in ds.attrs
+            assert "variable_name_standardization" not in original.attrs
+
+
+class TestLazyMode:
+    """Test reading lazily opened, file-backed partitions."""
+
+    @pytest.fixture
+    def source_kwargs(self, tmp_path):
+        return dict(cache_dir=tmp_path / "cache")
+
+    def test_requires_cache(self, monkeypatch):
+        """Test that lazy mode is rejected without a download cache."""
+        monkeypatch.delenv("INTAKE_GFS_NCAR_CACHE_DIR", raising=False)
+        with pytest.raises(ValueError, match="requires a download cache"):
+            GFSForecastSource(cycle=CYCLE, lazy=True)
+
+    def test_lazy_read_matches_eager(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that lazy partitions are dask-backed and decode the same data."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        source = make_source(lazy=True)
+
+        ds = source.read()
+
+        assert source.memory_cache is False
+        assert ds.sizes["time"] == 4
+        assert ds.u10.chunks is not None
+        assert len(http_server.requests) == 4
+        value = ds.u10.sel(time="2024-01-15T18:00").isel(latitude=0, longitude=0)
+        assert float(value) == 6
+
+        eager = make_source(memory_cache=False).read()
+        xr.testing.assert_allclose(ds.compute(), eager)
+        assert len(http_server.requests) == 4
+
+    def test_lazy_to_dask_matches_read(self, make_source, publish_ncss_partitions):
+        """Test that to_dask() builds its graph from lazy partitions."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        source = make_source(lazy=True)
+
+        ds = source.to_dask()
+
+        eager = make_source(memory_cache=False).read()
+        xr.testing.assert_allclose(ds.compute(), eager)
+
+    def test_lazy_to_zarr_matches_read(
+        self, make_source, tmp_path, publish_ncss_partitions
+    ):
+        """Test that to_zarr() writes lazy partitions to their regions."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        source = make_source(lazy=True)
+
+        source.to_zarr(tmp_path / "gfs.zarr")
+
+        ds = xr.open_zarr(tmp_path / "gfs.zarr")
+        eager = make_source(memory_cache=False).read()
+        xr.testing.assert_allclose(ds.drop_attrs().compute(), eager.drop_attrs())
+
+
+class TestDtype:
+    """Test casting data variables at decode time."""
+
+    def test_dtype_validation(self):
+        """Test that dtype must be a floating point type."""
+        assert GFSForecastSource(cycle=CYCLE, dtype="f4").decode_dtype == "float32"
+        with pytest.raises(ValueError, match="Invalid dtype"):
+            GFSForecastSource(cycle=CYCLE, dtype="int16")
+        with pytest.raises(ValueError, match="Invalid dtype"):
+            GFSForecastSource(cycle=CYCLE, dtype="not_a_type")
+
+    def test_partitions_are_cast(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that float64 responses are decoded as float32."""
+        publish_ncss_partitions([0, 3])
+        for path in (http_server.root / "ncss").rglob("*.grib2"):
+            with xr.open_dataset(path) as ds:
+                ds = ds.astype("float64").load()
+            ds.to_netcdf(path)
+
+        ds = make_source(max_lead_time=3, memory_cache=False, dtype="float32").read()
+        original = make_source(max_lead_time=3, memory_cache=False).read()
+
+        assert original.u10.dtype == "float64"
+        assert ds.u10.dtype == "float32"
+        assert ds.latitude.dtype == original.latitude.dtype
+        xr.testing.assert_allclose(ds, original)
+
+
+class TestLeadTimeSelection:
+    """Test selecting lead times by range, step or explicit list."""
+
+    def lead_times(self, **kwargs):
+        source = GFSForecastSource(cycle=CYCLE, **kwargs)
+        source._build_urls()
+        return source._lead_times
+
+    def test_lead_time_range_and_step(self):
+        """Test that the range and step select from the output schedule."""
+        assert self.lead_times(max_lead_time=9) == [0, 3, 6, 9]
+        twice_daily = self.lead_times(
+            min_lead_time=12, max_lead_time=48, lead_time_step=12
+        )
+        assert twice_daily == [12, 24, 36, 48]
+        # Beyond 240 hours files are 6-hourly, so a 3-hour step skips nothing
+        assert self.lead_times(
+            min_lead_time=234, max_lead_time=252, lead_time_step=3
+        ) == [234, 237, 240, 246, 252]
+
+    def test_explicit_lead_times(self):
+        """Test that explicit lead times override the range, also as strings."""
+        source = GFSForecastSource(cycle=CYCLE, lead_times=[72, 24, 48, 24])
+        urls = source._build_urls()
+
+        assert source._lead_times == [24, 48, 72]
+        assert (source.min_lead_time, source.max_lead_time) == (24, 72)
+        assert [url.split(".f")[-1][:3] for url in urls] == ["024", "048", "072"]
+        # Catalog templates render the parameters as strings
+        assert self.lead_times(lead_times="[24, 48]", lead_time_step="0") == [24, 48]
+        assert self.lead_times(lead_times="[]", max_lead_time="6") == [0, 3, 6]
+
+    def test_validation(self):
+        """Test that invalid lead time selections are rejected."""
+        with pytest.raises(ValueError, match="Invalid min_lead_time"):
+            GFSForecastSource(cycle=CYCLE, min_lead_time=30, max_lead_time=24)
+        with pytest.raises(ValueError, match="Invalid lead_time_step"):
+            GFSForecastSource(cycle=CYCLE, lead_time_step=-3)
+        with pytest.raises(ValueError, match="Invalid lead_times"):
+            GFSForecastSource(cycle=CYCLE, lead_times=[-3, 0])
+        with pytest.raises(ValueError, match="Invalid lead time range"):
+            GFSForecastSource(cycle=CYCLE, min_lead_time=1, max_lead_time=2)
+
+    def test_only_selected_files_are_read(
+        self, http_server, make_source, publish_ncss_partitions
+    ):
+        """Test that reading and addressing by forecast hour fetch one file each."""
+        publish_ncss_partitions([0, 3, 6, 9])
+        source = make_source(lead_times=[3, 9], memory_cache=False)
+
+        ds = source.read()
+        assert ds.sizes["time"] == 2
+        assert len(http_server.requests) == 2
+
+        assert source.partition_index(9) == 1
+        value = source.read_lead_time(9).u10.isel(time=0, latitude=0, longitude=0)
+        assert float(value) == 9
+        assert len(http_server.requests) == 3
+        with pytest.raises(KeyError):
+            source.read_lead_time(6)
+
+    def test_sparse_collection_batches(self, make_source, publish_ncss_collection):
+        """Test that collection requests do not span unselected lead times."""
+        source = GFSForecastSource(
+            cycle=CYCLE,
+            lead_times=[0, 3, 6, 24, 27, 48],
+            access_method="ncss_collection",
+            collection_batch_size=2,
+        )
+        urls = source._build_urls()
+
+        assert source._partition_lead_times == [[0, 3], [6], [24, 27], [48]]
+        assert "time_start=2024-01-16T12:00:00Z" in urls[2]
+        assert "time_end=2024-01-16T15:00:00Z" in urls[2]
+        assert source.partition_index(27) == 2
+
+        publish_ncss_collection([0, 3])
+        source = make_source(lead_times=[0, 3], access_method="ncss_collection")
+        ds = source.read_lead_time(3)
+        assert ds.sizes["time"] == 1
+        assert float(ds.u10.isel(time=0, latitude=0, longitude=0)) == 3
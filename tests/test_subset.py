@@ -0,0 +1,163 @@
+"""Tests for the typed subsetting arguments and point extraction."""
+
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pytest
+
+from intake_gfs_ncar import grib_index
+from intake_gfs_ncar.gfs_intake_driver import GFSForecastSource
+
+CYCLE = "2024-01-15T12:00:00"
+
+
+def query(url):
+    return {k: v[0] for k, v in parse_qs(urlsplit(url).query).items()}
+
+
+class TestNCSSQuery:
+    """Test the translation of subsetting arguments to NetcdfSubset queries."""
+
+    def test_subset_parameters(self):
+        """Test that bbox, stride, variables and one level become NCSS params."""
+        source = GFSForecastSource(
+            cycle=CYCLE,
+            access_method="ncss",
+            bbox=(150, -50, 180, -30),
+            horiz_stride=2,
+            pressure_levels=[500],
+            variables=["u10", "Temperature_isobaric"],
+        )
+        params = query(source._build_urls()[0])
+
+        assert params["west"] == "150.0"
+        assert params["south"] == "-50.0"
+        assert params["east"] == "180.0"
+        assert params["north"] == "-30.0"
+        assert params["horizStride"] == "2"
+        assert params["vertCoord"] == "50000"
+        assert params["var"] == (
+            "u-component_of_wind_height_above_ground,Temperature_isobaric"
+        )
+
+    def test_several_levels_are_not_sent(self):
+        """Test that several pressure levels are selected client-side."""
+        source = GFSForecastSource(
+            cycle=CYCLE, access_method="ncss", pressure_levels=[500, 850]
+        )
+        assert "vertCoord" not in query(source._build_urls()[0])
+
+    @pytest.mark.parametrize(
+        "kwargs, match",
+        [
+            ({"bbox": (0, 10, 20)}, "Invalid bbox"),
+            ({"bbox": (0, 10, 20, -10)}, "Invalid bbox"),
+            ({"horiz_stride": 0}, "Invalid horiz_stride"),
+        ],
+    )
+    def test_validation(self, kwargs, match):
+        """Test that malformed subsetting arguments are rejected."""
+        with pytest.raises(ValueError, match=match):
+            GFSForecastSource(cycle=CYCLE, **kwargs)
+
+
+class TestLongitudeIndex:
+    """Test longitude selection across grid conventions and seams."""
+
+    LON_360 = np.arange(0, 360, 30.0)
+
+    def test_negative_box_on_0_360_grid(self):
+        """Test that a box crossing 0 degrees wraps around the grid seam."""
+        index = GFSForecastSource._longitude_index(self.LON_360, -60, 30)
+        assert list(self.LON_360[index]) == [300, 330, 0, 30]
+
+    def test_full_circle(self):
+        """Test that a global box keeps every longitude."""
+        index = GFSForecastSource._longitude_index(self.LON_360, -180, 180)
+        assert len(index) == len(self.LON_360)
+
+
+class TestGribSubset:
+    """Test subsetting of decoded GRIB2 partitions."""
+
+    @pytest.fixture(autouse=True)
+    def clear_inventories(self, monkeypatch):
+        monkeypatch.setattr(grib_index, "inventories", grib_index.InventoryCache())
+
+    @pytest.fixture
+    def source_kwargs(self):
+        return dict(max_lead_time=3, access_method="fileServer")
+
+    def test_bbox_stride_and_variables(self, publish_grib, make_source):
+        """Test that the decoded grid and variables are subset before loading."""
+        publish_grib(3)
+
+        ds = make_source(
+            cfgrib_filter_by_keys={"typeOfLevel": "heightAboveGround", "level": 10},
+            bbox=(5, -5, 30, 10),
+            horiz_stride=2,
+            variables=["u10"],
+        )._get_partition(1)
+
+        assert list(ds.data_vars) == ["u10"]
+        assert list(ds.latitude.values) == [10]
+        assert list(ds.longitude.values) == [10, 30]
+
+    def test_pressure_levels(self, http_server, publish_grib, make_source):
+        """Test that only the requested pressure levels are downloaded."""
+        layout = publish_grib(3, idx=True)
+
+        ds = make_source(
+            cfgrib_filter_by_keys={"typeOfLevel": "isobaricInhPa", "shortName": "t"},
+            pressure_levels=[850],
+        )._get_partition(1)
+
+        assert float(ds.isobaricInhPa) == 850
+        start, length = layout[4]
+        assert http_server.range_requests()[-1] == (
+            f"bytes={start}-{start + length - 1}"
+        )
+
+
+class TestPointExtraction:
+    """Test extraction of station time series with the points argument."""
+
+    POINTS = {"buoy": (9, 1), "station": (-1, 29)}
+
+    def test_points_bbox(self):
+        """Test that the requested region encloses points near the antimeridian."""
+        source = GFSForecastSource(cycle=CYCLE, points=[(10, 170), (-10, -175)])
+        assert source.bbox == (169.5, -10.5, -174.5, 10.5)
+
+    def test_invalid_points(self):
+        """Test that malformed points are rejected."""
+        with pytest.raises(ValueError, match="Invalid points"):
+            GFSForecastSource(cycle=CYCLE, points=[(95, 0)])
+
+    def test_grib_points(self, publish_grib, make_source):
+        """Test nearest grid point extraction from a decoded GRIB2 file."""
+        publish_grib(3)
+
+        ds = make_source(
+            max_lead_time=3,
+            access_method="fileServer",
+            cfgrib_filter_by_keys={"typeOfLevel": "heightAboveGround", "level": 10},
+            points=self.POINTS,
+        )._get_partition(1)
+
+        assert ds.u10.dims == ("station",)
+        assert list(ds.station.values) == ["buoy", "station"]
+        assert list(ds.latitude.values) == [10, 0]
+        assert list(ds.longitude.values) == [0, 30]
+        assert list(ds.station_latitude.values) == [9, -1]
+
+    def test_ncss_points(self, http_server, make_source, publish_ncss_partitions):
+        """Test that NCSS reads give a (time, station) dataset."""
+        publish_ncss_partitions([0, 3, 6])
+
+        ds = make_source(max_lead_time=6, points=self.POINTS).read()
+
+        assert ds.u10.dims == ("time", "station")
+        assert len(http_server.requests) == 3
+        assert "north=9.5" in http_server.requests[0][1]
+        assert list(ds.u10.sel(station="station").values) == [0, 3, 6]